@@ -0,0 +1,934 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from typing import TYPE_CHECKING
+
+from .api import BalanceSnapshot, TastyTradeAPI
+from .metrics import metrics_for
+from .quote_tokens import QUOTE_TOKENS
+from .ratelimit import endpoint_class, scheduler_for
+from .sessions import SessionCache
+
+if TYPE_CHECKING:
+    from .candles import CandleBuffer, CompletionTracker
+
+
+def _aiohttp():
+    try:
+        import aiohttp
+    except ImportError as e:
+        raise ImportError("AsyncTastyTradeAPI requires aiohttp --> pip install aiohttp") from e
+    return aiohttp
+
+
+class AsyncResponse:
+    """Status code and decoded JSON body of a finished aiohttp request, shaped like requests.Response."""
+
+    def __init__(self, status_code: int, payload, headers=None):
+        self.status_code = status_code
+        self._payload = payload
+        self.headers = headers or {}
+
+    def json(self):
+        return self._payload
+
+
+class AsyncHTTPTransport:
+    """
+    EN: Pooled keep-alive aiohttp transport, the asyncio counterpart of HTTPTransport.
+    ES: Transporte aiohttp con pool de conexiones keep-alive, el equivalente asyncio de HTTPTransport.
+
+    The aiohttp session is created on the first request, inside the running event loop.
+
+    Args:
+        base_url: Root of the REST API (e.g. 'https://api.tastytrade.com')
+        auth_header: Callable turning a session token into the Authorization header value
+        pool_size: Maximum number of simultaneous connections per host
+        timeout: Default total timeout in seconds for every request
+        keep_alive: Reuse connections between requests
+        scheduler: RequestScheduler that paces and retries the requests (None sends them as they come)
+        metrics: Metrics that records the latency and outcome of every attempt
+        on_unauthorized: Coroutine function(session_token) returning a replacement token for a
+            401 (the request is sent once more with it), or None
+    """
+
+    def __init__(self, base_url: str, auth_header=None, pool_size: int = 10,
+                 timeout: float = 10.0, keep_alive: bool = True, scheduler=None, metrics=None,
+                 on_unauthorized=None):
+        self._aio = _aiohttp()
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.keep_alive = keep_alive
+        self.scheduler = scheduler
+        self.metrics = metrics
+        self._auth_header = auth_header
+        self._on_unauthorized = on_unauthorized
+        self._session = None
+
+    def _url(self, path: str) -> str:
+        if path.startswith('http://') or path.startswith('https://'):
+            return path
+        return f"{self.base_url}{path}"
+
+    def session(self):
+        """The shared aiohttp.ClientSession (also used for the DXLink websockets)."""
+        if self._session is None or self._session.closed:
+            aio = self._aio
+            connector = aio.TCPConnector(limit_per_host=self.pool_size, force_close=not self.keep_alive)
+            self._session = aio.ClientSession(connector=connector,
+                                              timeout=aio.ClientTimeout(total=self.timeout),
+                                              headers={'Accept': 'application/json'})
+        return self._session
+
+    async def request(self, method: str, path: str, session_token: str = None,
+                      headers: dict = None, **kwargs) -> AsyncResponse:
+        """
+        EN: Sends a request over the pooled session, injecting the Authorization header.
+        ES: Envía una petición por la sesión con pool, añadiendo la cabecera Authorization.
+        """
+        response = await self._request(method, path, session_token, headers, dict(kwargs))
+        if response.status_code == 401 and session_token is not None and self._on_unauthorized is not None:
+            new_token = await self._on_unauthorized(session_token)
+            if new_token is not None and new_token != session_token:
+                response = await self._request(method, path, new_token, headers, dict(kwargs))
+        return response
+
+    async def _request(self, method: str, path: str, session_token: str, headers: dict, kwargs: dict):
+        req_headers = dict(headers) if headers else {}
+        if session_token is not None:
+            if self._auth_header is not None:
+                req_headers['Authorization'] = self._auth_header(session_token)
+            else:
+                req_headers['Authorization'] = session_token
+
+        if 'timeout' in kwargs:
+            kwargs['timeout'] = self._aio.ClientTimeout(total=kwargs['timeout'])
+
+        url = self._url(path)
+        scheduler = self.scheduler
+        if scheduler is None:
+            return await self._send(method, path, url, req_headers, kwargs)
+
+        klass = endpoint_class(path)
+        attempt = 0
+        while True:
+            await scheduler.aacquire(method, klass)
+            try:
+                response = await self._send(method, path, url, req_headers, kwargs)
+            except (self._aio.ClientConnectionError, asyncio.TimeoutError) as e:
+                delay = scheduler.retry_delay(method, klass, attempt, error=e)
+                if delay is None:
+                    raise
+            else:
+                delay = scheduler.retry_delay(method, klass, attempt, response.status_code, response.headers)
+                if delay is None:
+                    return response
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _send(self, method: str, path: str, url: str, headers: dict, kwargs: dict) -> AsyncResponse:
+        metrics = self.metrics
+        if metrics is None or not metrics.enabled:
+            return await self._exchange(method, url, headers, kwargs)
+
+        started = time.perf_counter()
+        try:
+            response = await self._exchange(method, url, headers, kwargs)
+        except Exception as e:
+            metrics.request(method, path, time.perf_counter() - started, error=e)
+            raise
+        metrics.request(method, path, time.perf_counter() - started, response.status_code)
+        return response
+
+    async def _exchange(self, method: str, url: str, headers: dict, kwargs: dict) -> AsyncResponse:
+        async with self.session().request(method, url, headers=headers, **kwargs) as resp:
+            payload = None
+            if resp.status in (200, 201):
+                payload = await resp.json(content_type=None)
+            return AsyncResponse(resp.status, payload, resp.headers)
+
+    async def get(self, path: str, session_token: str = None, **kwargs) -> AsyncResponse:
+        return await self.request('GET', path, session_token, **kwargs)
+
+    async def post(self, path: str, session_token: str = None, **kwargs) -> AsyncResponse:
+        return await self.request('POST', path, session_token, **kwargs)
+
+    async def delete(self, path: str, session_token: str = None, **kwargs) -> AsyncResponse:
+        return await self.request('DELETE', path, session_token, **kwargs)
+
+    async def close(self):
+        """
+        EN: Closes every pooled connection.
+        ES: Cierra todas las conexiones del pool.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+
+class AsyncTastyTradeAPI:
+    """
+    EN: asyncio client with the same methods and return shapes as TastyTradeAPI.
+    ES: Cliente asyncio con los mismos métodos y resultados que TastyTradeAPI.
+
+    Only the I/O is different: request building and response parsing are the very same
+    methods of TastyTradeAPI, so both clients always return identical data.
+
+        async with AsyncTastyTradeAPI() as tt:
+            client = await tt.Client(USER, PASS)
+            positions, balance = await asyncio.gather(tt.all_positions(client), tt.balance(client))
+
+    Requires the optional dependency `aiohttp`.
+
+    Args:
+        pool_size: Maximum number of simultaneous connections to the API
+        timeout: Default timeout (seconds) applied to every REST request
+        keep_alive: Reuse connections between requests
+        balance_ttl: Seconds a balance snapshot is reused before fetching it again (0 disables the cache)
+        api_url: Root of the REST API (e.g. a local stand-in server)
+        session_cache: File (or SessionCache) where sessions are kept and shared between processes
+        rate_limits: Off by default; True (DEFAULT_RATE_LIMITS), limits over them or a shared RequestScheduler
+        metrics: True (or a shared Metrics) to record request, websocket and quote-age metrics
+    """
+
+    def __init__(self, pool_size: int = 10, timeout: float = 10.0, keep_alive: bool = True,
+                 balance_ttl: float = 5.0, api_url: str = 'https://api.tastytrade.com', session_cache=None,
+                 rate_limits=None, metrics=False):
+        self._API_URL = api_url
+        self.metrics = metrics_for(metrics)
+        self._http = AsyncHTTPTransport(self._API_URL, auth_header=self._get_auth_header,
+                                        pool_size=pool_size, timeout=timeout, keep_alive=keep_alive,
+                                        scheduler=scheduler_for(rate_limits), metrics=self.metrics,
+                                        on_unauthorized=self._session_rejected)
+
+        self.balance_ttl = balance_ttl
+        self._balances = {}
+        self._balances_locks = {}
+
+        self._quote_tokens = QUOTE_TOKENS
+        self.last_historical_status = {}
+
+        self._sessions = session_cache if isinstance(session_cache, SessionCache) else SessionCache(session_cache)
+        self._session_passwords = {}
+        self._session_clients = {}
+        self._session_timers = {}
+        self._cached_tokens = {}
+        self._replaced_tokens = {}
+        self._relogin_lock = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """
+        EN: Closes the pooled HTTP connections.
+        ES: Cierra las conexiones HTTP del pool.
+        """
+        for handle in self._session_timers.values():
+            handle.cancel()
+        self._session_timers.clear()
+        await self._http.close()
+
+    # -------------------   SHARED WITH TastyTradeAPI (no I/O)   -------------------
+
+    stats = TastyTradeAPI.stats
+    _get_auth_header = TastyTradeAPI._get_auth_header
+    _token_request = TastyTradeAPI._token_request
+    _session_result = TastyTradeAPI._session_result
+    _accounts_cache = TastyTradeAPI._accounts_cache
+    _accounts_result = TastyTradeAPI._accounts_result
+    _account_number_result = TastyTradeAPI._account_number_result
+    _client_info_result = TastyTradeAPI._client_info_result
+    _account_of = TastyTradeAPI._account_of
+    _balances_result = TastyTradeAPI._balances_result
+    _client_info_dict = TastyTradeAPI._client_info_dict
+    _total_fees_result = TastyTradeAPI._total_fees_result
+    _account_clients_result = TastyTradeAPI._account_clients_result
+    _balances_frame = TastyTradeAPI._balances_frame
+    _positions_frame = TastyTradeAPI._positions_frame
+    _fees_frame = TastyTradeAPI._fees_frame
+    _start_long = TastyTradeAPI._start_long
+    _end_long = TastyTradeAPI._end_long
+    _start_short = TastyTradeAPI._start_short
+    _end_short = TastyTradeAPI._end_short
+    _order_json = TastyTradeAPI._order_json
+    _order_result = TastyTradeAPI._order_result
+    _batch_orders = TastyTradeAPI._batch_orders
+    _batch_entry = TastyTradeAPI._batch_entry
+    _orders_path = TastyTradeAPI._orders_path
+    _position_result = TastyTradeAPI._position_result
+    _parse_position_data = TastyTradeAPI._parse_position_data
+    _positions_dict = TastyTradeAPI._positions_dict
+    _transaction_params = TastyTradeAPI._transaction_params
+    _transaction_page_result = TastyTradeAPI._transaction_page_result
+    _has_next_page = TastyTradeAPI._has_next_page
+    _parse_transaction = TastyTradeAPI._parse_transaction
+    _transaction_entry = TastyTradeAPI._transaction_entry
+    _transactions_dict = TastyTradeAPI._transactions_dict
+    _add_transactions = TastyTradeAPI._add_transactions
+    _DX_vals_result = TastyTradeAPI._DX_vals_result
+    _DX_session_messages = TastyTradeAPI._DX_session_messages
+    DX_messages = TastyTradeAPI.DX_messages
+    _DX_stream_messages = TastyTradeAPI._DX_stream_messages
+    _DX_subscription = TastyTradeAPI._DX_subscription
+    _get_hist_DX_messages = TastyTradeAPI._get_hist_DX_messages
+    _historical_replies = TastyTradeAPI._historical_replies
+    _historical_plan = TastyTradeAPI._historical_plan
+    _historical_result = TastyTradeAPI._historical_result
+    _merge_shard = TastyTradeAPI._merge_shard
+    _merged_frames = TastyTradeAPI._merged_frames
+    _store_candles = TastyTradeAPI._store_candles
+    _interval_ms = TastyTradeAPI._interval_ms
+    _historical_frames = TastyTradeAPI._historical_frames
+    values_from_data = TastyTradeAPI.values_from_data
+
+    # -------------------   CLIENT   -------------------
+
+    async def _get_token(self):
+        return (await self._login())['session_token']
+
+    async def _login(self, remember_token: str = None, login: str = None, password: str = None) -> dict:
+        if login is None:
+            login, password = self._USER, self._PASS
+        headers, payload = self._token_request(remember_token, login, password)
+        response = await self._http.post("/sessions", headers=headers, data=payload)
+        if response.status_code not in [200, 201] and remember_token and password:
+            return await self._login(None, login, password)
+        return self._session_result(response)
+
+    async def _get_accounts(self, session_token: str) -> list:
+        response = await self._http.get("/customers/me/accounts", session_token)
+        return self._accounts_result(response)
+
+    async def _account_number(self, session_token: str, num: int = 0) -> str:
+        data = await self._get_accounts(session_token)
+        return self._account_number_result(data, num)
+
+    async def _get_client_info(self, session_token: str) -> dict:
+        response = await self._http.get("/customers/me", session_token)
+        return self._client_info_result(response)
+
+    async def Client(self, USER: str, PASS: str, num: int = 0, fresh: bool = False) -> dict:
+        """
+        EN: Creates a TastyTrade client with USER and PASS, reusing a cached session if there is one.
+        ES: Crea un cliente de TastyTrade con USER y PASS, reutilizando una sesión cacheada si la hay.
+
+        A cached session the server rejects (401) is dropped and the login is repeated once.
+        """
+        self._USER = USER
+        self._PASS = PASS
+        self._session_passwords[USER] = PASS
+
+        entry = None if fresh else self._sessions.get(USER)
+        if entry is None or entry.get('accounts') is None:
+            session = await self._login(None, USER, PASS)
+            accounts = await self._get_accounts(session['session_token'])
+            entry = self._sessions.put(USER, session['session_token'], session['remember_token'],
+                                       session['expires_at'], self._accounts_cache(accounts))
+        elif self._sessions.needs_refresh(entry):
+            entry = await self._renew_session(USER, entry)
+        else:
+            self._cached_tokens[entry['session_token']] = USER
+
+        ac_num = self._account_number_result(entry['accounts'], num)
+
+        self._Client = {'session_token': entry['session_token'], 'account_number': ac_num}
+        self._follow_session(USER, self._Client, entry['expires_at'])
+
+        return self._Client
+
+    async def _renew_session(self, login: str, entry: dict) -> dict:
+        session = await self._login(entry.get('remember_token'), login, self._session_passwords.get(login))
+        return self._sessions.put(login, session['session_token'], session['remember_token'], session['expires_at'])
+
+    def _follow_session(self, login: str, Client: dict, expires_at: float):
+        clients = self._session_clients.setdefault(login, [])
+        if not any(c is Client for c in clients):
+            clients.append(Client)
+        old = self._session_timers.pop(login, None)
+        if old:
+            old.cancel()
+        delay = max(0.0, expires_at - self._sessions.refresh_margin - time.time())
+        self._session_timers[login] = asyncio.get_running_loop().call_later(
+            delay, lambda: asyncio.ensure_future(self._refresh_session(login)))
+
+    async def _refresh_session(self, login: str):
+        try:
+            entry = self._sessions.get(login)
+            if entry is None or self._sessions.needs_refresh(entry):
+                entry = await self._renew_session(login, entry or {})
+        except Exception as e:
+            print("Error refreshing the session -->", e)
+            return
+
+        self._adopt_session(login, entry)
+
+    def _adopt_session(self, login: str, entry: dict):
+        for Client in list(self._session_clients.get(login, [])):
+            old = Client['session_token']
+            if old != entry['session_token']:
+                self._quote_tokens.invalidate(old)
+            Client['session_token'] = entry['session_token']
+            self._follow_session(login, Client, entry['expires_at'])
+
+    async def _session_rejected(self, session_token: str) -> str:
+        """Logs in again when a session reused from the cache gets a 401; returns the new token or None."""
+        if self._relogin_lock is None:
+            self._relogin_lock = asyncio.Lock()
+        async with self._relogin_lock:
+            if session_token in self._replaced_tokens:
+                return self._replaced_tokens[session_token]
+            login = self._cached_tokens.pop(session_token, None)
+            password = self._session_passwords.get(login)
+            if login is None or password is None:
+                return None
+            old = self._sessions.get(login) or {}
+            self._sessions.drop(login)
+            try:
+                session = await self._login(None, login, password)
+            except Exception as e:
+                print("Error logging in again -->", e)
+                return None
+            entry = self._sessions.put(login, session['session_token'], session['remember_token'],
+                                       session['expires_at'], old.get('accounts'))
+            self._replaced_tokens[session_token] = entry['session_token']
+
+        self._adopt_session(login, entry)
+        return entry['session_token']
+
+    async def still_connected(self, Client) -> bool:
+        """Check if the client session is still valid (locally if its expiry is known)."""
+        expires_at = self._sessions.expires_at(Client['session_token'])
+        if expires_at is not None:
+            return expires_at > time.time()
+        try:
+            await self._get_client_info(Client['session_token'])
+            return True
+        except Exception:
+            return False
+
+    # -------------------   ACCOUNT METRICS   -------------------
+
+    async def _get__balances(self, Client: dict) -> dict:
+        account_number = self._account_of(Client)
+        response = await self._http.get(f"/accounts/{account_number}/balances", Client['session_token'])
+        return self._balances_result(response)
+
+    async def balance_snapshot(self, Client: dict, refresh: bool = False) -> BalanceSnapshot:
+        """
+        EN: Returns the cached balances of the account, fetching them again once the TTL expires.
+        ES: Devuelve los balances cacheados de la cuenta, pidiéndolos de nuevo al expirar el TTL.
+        """
+        account_number = Client['account_number']
+
+        snap = self._balances.get(account_number)
+        if not refresh and snap is not None and snap.age() < self.balance_ttl:
+            return snap
+
+        # Concurrent callers of the same account share one request; other accounts are not held up
+        async with self._balances_locks.setdefault(account_number, asyncio.Lock()):
+            snap = self._balances.get(account_number)
+            if not refresh and snap is not None and snap.age() < self.balance_ttl:
+                return snap
+
+            snap = BalanceSnapshot(account_number, await self._get__balances(Client))
+            if self.balance_ttl > 0:
+                self._balances[account_number] = snap
+        return snap
+
+    def invalidate_balances(self, Client: dict = None):
+        """
+        EN: Drops the cached balances of the account (or of every account if Client is None).
+        ES: Descarta los balances cacheados de la cuenta (o de todas si Client es None).
+        """
+        if Client is None:
+            self._balances.clear()
+        else:
+            self._balances.pop(Client['account_number'], None)
+
+    async def client_info(self, Client: dict) -> dict:
+        data = await self._get_client_info(Client['session_token'])
+        return self._client_info_dict(data)
+
+    async def balance(self, Client: dict) -> float:
+        return (await self.balance_snapshot(Client)).cash_balance
+
+    async def equity_BP(self, Client: dict) -> float:
+        return (await self.balance_snapshot(Client)).equity_buying_power
+
+    async def derivative_BP(self, Client: dict) -> float:
+        return (await self.balance_snapshot(Client)).derivative_buying_power
+
+    async def liquidity(self, Client: dict) -> float:
+        return (await self.balance_snapshot(Client)).net_liquidating_value
+
+    async def total_fees(self, Client: dict) -> float:
+        account_number = self._account_of(Client)
+        response = await self._http.get(f"/accounts/{account_number}/transactions/total-fees",
+                                        Client['session_token'])
+        return self._total_fees_result(response)
+
+    # -------------------   MULTIPLE ACCOUNTS   -------------------
+
+    async def account_clients(self, Client: dict) -> list:
+        accounts = await self._get_accounts(Client['session_token'])
+        return self._account_clients_result(Client, accounts)
+
+    async def _fan_out(self, Client: dict, fn, max_workers: int) -> list:
+        clients = await self.account_clients(Client)
+        slots = asyncio.Semaphore(max(1, max_workers))
+
+        async def run(c):
+            async with slots:
+                try:
+                    return c['account_number'], await fn(c), None
+                except Exception as e:
+                    return c['account_number'], None, str(e)
+
+        return list(await asyncio.gather(*(run(c) for c in clients)))
+
+    async def accounts_balances(self, Client: dict, max_workers: int = 8, refresh: bool = False):
+        return self._balances_frame(await self._fan_out(Client, lambda c: self.balance_snapshot(c, refresh),
+                                                        max_workers))
+
+    async def accounts_positions(self, Client: dict, max_workers: int = 8):
+        return self._positions_frame(await self._fan_out(Client, self.all_positions, max_workers))
+
+    async def accounts_fees(self, Client: dict, max_workers: int = 8):
+        return self._fees_frame(await self._fan_out(Client, self.total_fees, max_workers))
+
+    # -------------------   ORDERS   -------------------
+
+    async def order(self, Client: dict, ticker: str, val: int, order_type: str, action: str,
+                    time_force: str = 'Day', otype: str = 'Market', dry_run: bool = False) -> dict:
+        """
+        EN: Places a market order for the specified ticker and quantity (dry_run only checks and prices it).
+        ES: Realiza una orden de mercado para el ticker y cantidad especificados (dry_run solo la valida).
+        """
+        order = self._order_json(ticker, val, order_type, action, time_force, otype)
+
+        headers = {
+            'Content-Type': 'application/json'
+        }
+
+        response = await self._http.post(self._orders_path(Client, dry_run), Client['session_token'],
+                                         headers=headers, data=order)
+
+        result = self._order_result(response)
+        if not dry_run:
+            self.invalidate_balances(Client)
+        return result
+
+    async def order_batch(self, Client: dict, orders: list, dry_run: bool = False, max_workers: int = 8,
+                          time_force: str = 'Day', otype: str = 'Market') -> list:
+        """Async counterpart of TastyTradeAPI.order_batch (at most max_workers orders in flight)."""
+        built = self._batch_orders(orders, time_force, otype)
+        if not built:
+            return []
+
+        path = self._orders_path(Client, dry_run)
+        headers = {'Content-Type': 'application/json'}
+        slots = asyncio.Semaphore(max(1, max_workers))
+
+        async def send(index: int, ticker: str, body: str) -> dict:
+            async with slots:
+                started = time.perf_counter()
+                try:
+                    response = await self._http.post(path, Client['session_token'], headers=headers, data=body)
+                except Exception as e:
+                    return self._batch_entry(index, ticker, time.perf_counter() - started, error=str(e))
+                return self._batch_entry(index, ticker, time.perf_counter() - started, response=response)
+
+        results = await asyncio.gather(*(send(i, ticker, body) for i, (ticker, body) in enumerate(built)))
+
+        if not dry_run:
+            self.invalidate_balances(Client)
+        return list(results)
+
+    # -------------------   POSITIONS AND TRANSACTIONS   -------------------
+
+    async def _position(self, Client: dict) -> list:
+        account_number = self._account_of(Client)
+        response = await self._http.get(f"/accounts/{account_number}/positions", Client['session_token'])
+        return self._position_result(response)
+
+    async def all_positions(self, Client: dict) -> dict:
+        try:
+            positions = await self._position(Client)
+        except Exception as e:
+            raise Exception(f"Error parsing positions --->\n{e}")
+
+        return self._positions_dict(positions)
+
+    async def check_position(self, Client: dict, symbol: str) -> dict:
+        positions = await self.all_positions(Client)
+        return positions.get(symbol, None)
+
+    async def _transaction(self, Client: dict, params: list = None, page: int = 0) -> tuple:
+        account_number = self._account_of(Client)
+        params = list(params if params is not None else self._transaction_params()) + [('page-offset', page)]
+        response = await self._http.get(f"/accounts/{account_number}/transactions", Client['session_token'],
+                                        params=params)
+        return self._transaction_page_result(response)
+
+    async def _transaction_pages(self, Client: dict, params: list, prefetch: bool = True):
+        per_page = dict(params)['per-page']
+        pending = None
+        try:
+            page = 0
+            items, total_pages = await self._transaction(Client, params, page)
+            while True:
+                has_next = self._has_next_page(page, items, total_pages, per_page)
+                if has_next and prefetch:
+                    pending = asyncio.ensure_future(self._transaction(Client, params, page + 1))
+                yield items
+                if not has_next:
+                    return
+                page += 1
+                items, total_pages = await (pending if pending else self._transaction(Client, params, page))
+                pending = None
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def iter_transactions(self, Client: dict, symbol: str = None, start_date=None, end_date=None,
+                                types=None, per_page: int = 250, sort: str = 'Desc', prefetch: bool = True):
+        """Async generator counterpart of TastyTradeAPI.iter_transactions."""
+        params = self._transaction_params(symbol, start_date, end_date, types, per_page, sort)
+        async for items in self._transaction_pages(Client, params, prefetch):
+            for t in items:
+                yield self._transaction_entry(t)
+
+    async def all_transactions(self, Client: dict, start_date=None, end_date=None, types=None) -> dict:
+        params = self._transaction_params(start_date=start_date, end_date=end_date, types=types)
+        data = {}
+        async for items in self._transaction_pages(Client, params):
+            self._add_transactions(data, items)
+        return data
+
+    async def check_transaction(self, Client: dict, symbol: str) -> dict:
+        data = {}
+        async for items in self._transaction_pages(Client, self._transaction_params(symbol=symbol)):
+            self._add_transactions(data, items)
+        return data.get(symbol, None)
+
+    # -------------------   DX FEED   -------------------
+
+    async def _get_DX_vals(self, Client: dict) -> dict:
+        response = await self._http.get("/api-quote-tokens", Client['session_token'])
+        return self._DX_vals_result(response)
+
+    async def _quote_token(self, Client: dict, refresh: bool = False) -> dict:
+        """
+        EN: Returns the cached DX link and token of the session (shared with the sync client).
+        ES: Devuelve el link y token de DX cacheados de la sesión (compartidos con el cliente sync).
+        """
+        session_token = Client['session_token']
+        if refresh:
+            self._quote_tokens.invalidate(session_token)
+        return await self._quote_tokens.aget(session_token,
+                                             lambda: self._get_DX_vals({'session_token': session_token}))
+
+    async def DX_link(self, Client: dict) -> str:
+        return (await self._quote_token(Client))['dxlink-url']
+
+    async def DX_token(self, Client: dict) -> str:
+        return (await self._quote_token(Client))['token']
+
+    # -------------------   HISTORICAL DATA   -------------------
+
+    async def _websocket_historical(self, link: str, messages: dict, buffer: CandleBuffer,
+                                    tracker: CompletionTracker, timeout: int = 30,
+                                    connect_timeout: int = 10) -> CandleBuffer:
+        """
+        EN: Connects to DX websocket and decodes historical Candle data into the column buffer.
+        ES: Se conecta al websocket de DX y decodifica los datos históricos de Candle en el buffer.
+        """
+        aio = self._http._aio
+        metrics = self.metrics
+        opened = time.perf_counter()
+        async with self._http.session().ws_connect(link, timeout=aio.ClientWSTimeout(ws_close=2.0)) as ws:
+            await ws.send_str(json.dumps(messages['SETUP']))
+
+            subscribed = False
+            deadline = time.monotonic() + connect_timeout
+            while True:
+                now = time.monotonic()
+                if subscribed:
+                    if tracker.poll(deadline):
+                        break
+                    wait = max(0.0, min(tracker.quiet_period / 4, deadline - now))
+                elif now >= deadline:
+                    tracker.close()
+                    break
+                else:
+                    wait = deadline - now
+
+                try:
+                    msg = await asyncio.wait_for(ws.receive(), wait)
+                except asyncio.TimeoutError:
+                    continue
+
+                if msg.type != aio.WSMsgType.TEXT:
+                    if msg.type in (aio.WSMsgType.CLOSE, aio.WSMsgType.CLOSING,
+                                    aio.WSMsgType.CLOSED, aio.WSMsgType.ERROR):
+                        tracker.close()
+                        break
+                    continue
+
+                started = time.perf_counter() if metrics.enabled else None
+                rows = len(buffer)
+                try:
+                    message_data = json.loads(msg.data)
+                except json.JSONDecodeError:
+                    continue
+
+                for reply in self._historical_replies(message_data, messages, buffer, tracker):
+                    await ws.send_str(json.dumps(reply))
+                    if reply is messages['SUB']:
+                        subscribed = True
+                        deadline = tracker.started + timeout
+                        if started is not None:
+                            metrics.handshake('historical', time.perf_counter() - opened)
+                if started is not None:
+                    metrics.message('historical', len(buffer) - rows, time.perf_counter() - started)
+
+        return buffer
+
+    async def get_historical(self, Client: dict, tickers: list, interval: str,
+                             vars: list = None, max_data: int = 100, quiet_period: float = 1.0,
+                             store=None, shard_size: int = 25, concurrency: int = 4, retries: int = 2) -> dict:
+        """
+        EN: Obtains historical Candle data for specified tickers and interval (see TastyTradeAPI.get_historical).
+        ES: Obtiene datos históricos de Candle para los tickers e intervalo (ver TastyTradeAPI.get_historical).
+        """
+        dx_vals = await self._quote_token(Client)
+        link = dx_vals['dxlink-url']
+        token = dx_vals['token']
+
+        if len(tickers) == 0:
+            return {}
+
+        plan = self._historical_plan(tickers, interval, vars, max_data, store)
+
+        wait_time = 30
+        if plan['days'] > 30 or min(len(tickers), shard_size) > 5:
+            wait_time = 45
+
+        fetched, report = await self._fetch_sharded(link, token, tickers, plan['num'], plan['t_time'],
+                                                    plan['from_times'], plan['candle_fields'], quiet_period,
+                                                    wait_time, shard_size, concurrency, retries)
+
+        return self._historical_result(fetched, report, plan, store)
+
+    async def get_historical_multi(self, Client: dict, tickers: list, intervals: list, vars: list = None,
+                                   max_data: int = 100, session: tuple = ('09:30', '16:00'), **kwargs) -> dict:
+        """
+        EN: Candles of several intervals from one fetch of the finest (see TastyTradeAPI.get_historical_multi).
+        ES: Velas de varios intervalos con una sola descarga del más fino (ver TastyTradeAPI.get_historical_multi).
+        """
+        from .resample import base_rows, interval_ns, resample_frames
+
+        intervals = list(dict.fromkeys(intervals))
+        base = min(intervals, key=interval_ns)
+        frames = await self.get_historical(Client, tickers, base, vars,
+                                           base_rows(base, intervals, max_data, session), **kwargs)
+        result = resample_frames(frames, [i for i in intervals if i != base], max_rows=max_data, session=session)
+        result[base] = {ticker: df.head(max_data) for ticker, df in frames.items()}
+        return {interval: result[interval] for interval in intervals}
+
+    async def _fetch_candles(self, link: str, token: str, tickers: list, num: int, t_time: str,
+                             from_times, candle_fields: list, quiet_period: float, timeout: int):
+        from .candles import CandleBuffer, CompletionTracker
+
+        messages = self._get_hist_DX_messages(token, tickers, num, t_time, from_times, candle_fields)
+
+        symbols = [sub['symbol'] for sub in messages['SUB']['add']]
+        from_map = {sub['symbol']: sub['fromTime'] for sub in messages['SUB']['add']}
+        tracker = CompletionTracker(symbols, quiet_period=quiet_period, from_time=from_map,
+                                    bar_ms=self._interval_ms(num, t_time))
+        buffer = CandleBuffer(candle_fields)
+        try:
+            await self._websocket_historical(link, messages, buffer, tracker, timeout=timeout)
+        finally:
+            tracker.finish()
+        return buffer, tracker
+
+    async def _fetch_sharded(self, link: str, token: str, tickers: list, num: int, t_time: str, from_times,
+                             candle_fields: list, quiet_period: float, timeout: int, shard_size: int,
+                             concurrency: int, retries: int):
+        """
+        EN: Fetches the shards over concurrent connections (at most `concurrency` at a time) and merges them.
+        ES: Descarga los grupos por conexiones concurrentes (como mucho `concurrency`) y los une.
+        """
+        shard_size = max(1, int(shard_size))
+        pending = [tickers[i:i + shard_size] for i in range(0, len(tickers), shard_size)]
+        frames, report = {}, {}
+        slots = asyncio.Semaphore(max(1, concurrency))
+
+        async def run(shard):
+            async with slots:
+                try:
+                    return shard, await self._fetch_candles(link, token, shard, num, t_time, from_times,
+                                                            candle_fields, quiet_period, timeout)
+                except Exception as e:
+                    return shard, e
+
+        for attempt in range(retries + 1):
+            failed = []
+            results = await asyncio.gather(*(run(shard) for shard in pending))
+            for shard_id, (shard, result) in enumerate(results):
+                retry = self._merge_shard(shard, result, attempt, shard_id, num, t_time, frames, report)
+                if retry:
+                    failed.append(retry)
+
+            if not failed:
+                break
+            pending = failed
+
+        return self._merged_frames(frames), report
+
+    # -------------------   REAL TIME DATA   ---------------------
+
+    def RealTimeStreamer(self, client: dict, tickers: list, verbose: bool = False) -> 'AsyncRealTimeStreamer':
+        """
+        EN: Returns an AsyncRealTimeStreamer of this client (async iterator of quote updates).
+        ES: Devuelve un AsyncRealTimeStreamer de este cliente (iterador asíncrono de cotizaciones).
+        """
+        return AsyncRealTimeStreamer(self, client, tickers, verbose=verbose)
+
+
+class AsyncRealTimeStreamer:
+    """
+    EN: Quote streamer for asyncio. Iterating it yields {symbol: mid price} for every FEED_DATA batch.
+    ES: Streamer de cotizaciones para asyncio. Al iterarlo devuelve {símbolo: precio medio} por lote.
+
+    `board` is a QuoteBoard with the latest quote of every symbol and `data` its mid prices,
+    like RealTimeStreamer.
+
+        async with tt.RealTimeStreamer(client, ["AAPL", "MSFT"]) as stream:
+            async for quotes in stream:
+                print(quotes)
+
+    Args:
+        api: AsyncTastyTradeAPI instance
+        client: Authentication dict with session_token and account_number
+        tickers: Symbols to subscribe
+        keepalive_interval: Seconds between KEEPALIVE messages
+    """
+
+    def __init__(self, api: AsyncTastyTradeAPI, client: dict, tickers: list, verbose: bool = False,
+                 keepalive_interval: float = 30.0):
+        from .quotes import QuoteBoard
+
+        self.api = api
+        self.client = client
+        self.tickers = list(tickers)
+        self.verbose = verbose
+        self.keepalive_interval = keepalive_interval
+        self.board = QuoteBoard(tickers)
+        self.ws = None
+        self._keep_task = None
+        self._opening = None
+
+    @property
+    def data(self) -> dict:
+        return self.board.mids()
+
+    async def __aenter__(self):
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop()
+
+    async def start(self):
+        dx_vals = await self.api._quote_token(self.client)
+        self.dx_token = dx_vals['token']
+        self.messages = self.api._DX_stream_messages(self.dx_token, self.tickers)
+        self.link = dx_vals['dxlink-url']
+
+        self._opening = time.perf_counter()
+        self.ws = await self.api._http.session().ws_connect(self.link)
+        if self.verbose:
+            print("-->Connection opened")
+
+        for key in ("SETUP", "AUTH", "CHANNEL", "FEED", "SUB"):
+            await self.ws.send_str(json.dumps(self.messages[key]))
+        self._keep_task = asyncio.create_task(self._keepalive())
+        return self
+
+    async def _keepalive(self):
+        while True:
+            await asyncio.sleep(self.keepalive_interval)
+            try:
+                await self.ws.send_str(json.dumps(self.messages["KEEP"]))
+            except Exception:
+                return
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> dict:
+        aio = self.api._http._aio
+        while self.ws is not None:
+            msg = await self.ws.receive()
+            if msg.type != aio.WSMsgType.TEXT:
+                if msg.type in (aio.WSMsgType.CLOSE, aio.WSMsgType.CLOSING,
+                                aio.WSMsgType.CLOSED, aio.WSMsgType.ERROR):
+                    break
+                continue
+
+            if self.verbose:
+                print("Message received -->", msg.data)
+            metrics = self.api.metrics
+            started = time.perf_counter() if metrics.enabled else None
+            try:
+                message = json.loads(msg.data)
+            except Exception:
+                continue
+            if message.get("type") == "FEED_CONFIG":
+                fields = (message.get("eventFields") or {}).get("Quote")
+                if fields:
+                    self.board.set_fields(fields)
+                continue
+            if message.get("type") != "FEED_DATA":
+                if started is not None and self._opening is not None and message.get("state") == "AUTHORIZED":
+                    metrics.handshake('streamer', time.perf_counter() - self._opening)
+                    self._opening = None
+                continue
+
+            data_block = message.get("data", [])
+            if not (isinstance(data_block, list) and len(data_block) > 1 and data_block[0] == "Quote"):
+                continue
+            try:
+                events = self.board.add(data_block[1])
+                snap = self.board.snapshot(list(dict.fromkeys(self.board.symbols_in(data_block[1]))))
+            except Exception as e:
+                print("Error processing ws response -->", e)
+                continue
+            if started is not None:
+                metrics.message('streamer', events, time.perf_counter() - started)
+                metrics.quotes(self.board.fields, data_block[1])
+
+            update = {s: (b + a) / 2 for s, b, a in zip(snap['symbol'], snap['bid'].tolist(), snap['ask'].tolist())
+                      if b == b and a == a}
+            if update:
+                return update
+
+        raise StopAsyncIteration
+
+    async def stop(self):
+        if self._keep_task is not None:
+            self._keep_task.cancel()
+            self._keep_task = None
+        if self.ws is not None:
+            await self.ws.close()
+            self.ws = None
+
+        if self.verbose:
+            print("-->Streamer stopped")
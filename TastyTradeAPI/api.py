@@ -1,12 +1,68 @@
-import requests
+# pandas, numpy and websocket are imported by the methods that need them (historical data,
+# streaming), so REST-only users do not pay for them at import time
+from __future__ import annotations
+
 import json
-import websocket
-import pandas as pd
 from datetime import timedelta
 import datetime
 import math
+import random
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from .dispatch import DROP_OLDEST, EventDispatcher, Subscription
+from .dxlink import QUOTE_FIELDS, RUN_OPTIONS, close_websocket
+from .metrics import metrics_for
+from .quote_tokens import QUOTE_TOKENS
+from .ratelimit import scheduler_for
+from .sessions import SessionCache, session_expiry
+from .transport import HTTPTransport
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from .candles import CandleBuffer, CompletionTracker
+    from .historical import HistoricalSession
+
+
+class BalanceSnapshot:
+    """
+    EN: Balances of one account fetched in a single request, with the time it was taken.
+    ES: Balances de una cuenta obtenidos en una sola petición, junto al momento de la consulta.
+    """
+
+    def __init__(self, account_number: str, data: dict, fetched_at: float = None):
+        self.account_number = account_number
+        self.data = data
+        self.fetched_at = time.monotonic() if fetched_at is None else fetched_at
+
+    def age(self) -> float:
+        """Seconds elapsed since the snapshot was fetched."""
+        return time.monotonic() - self.fetched_at
+
+    def value(self, key: str, label: str) -> float:
+        try:
+            return float(self.data[key])
+        except Exception as e:
+            raise Exception(f"Error retrieving {label} --->\n{e}")
+
+    @property
+    def cash_balance(self) -> float:
+        return self.value('cash-balance', 'balances')
+
+    @property
+    def equity_buying_power(self) -> float:
+        return self.value('equity-buying-power', 'Equity Buying Power')
+
+    @property
+    def derivative_buying_power(self) -> float:
+        return self.value('derivative-buying-power', 'Derivative Buying Power')
+
+    @property
+    def net_liquidating_value(self) -> float:
+        return self.value('net-liquidating-value', 'Net Liquidating Value')
 
 
 class TastyTradeAPI:
@@ -14,9 +70,74 @@ class TastyTradeAPI:
     # ------- ES: GENERAL -----------------
     # ------- EN: GENERAL -----------------
 
-    def __init__(self):
+    def __init__(self, pool_size: int = 10, timeout: float = 10.0, keep_alive: bool = True,
+                 balance_ttl: float = 5.0, api_url: str = 'https://api.tastytrade.com', session_cache=None,
+                 rate_limits=None, metrics=False):
+        """
+        EN: Creates the API wrapper and its pooled HTTP transport.
+        ES: Crea el wrapper de la API y su transporte HTTP con pool de conexiones.
+
+        Args:
+            pool_size: Maximum number of warm connections kept open to the API
+            timeout: Default timeout (seconds) applied to every REST request
+            keep_alive: Reuse connections between requests
+            balance_ttl: Seconds a balance snapshot is reused before fetching it again (0 disables the cache)
+            api_url: Root of the REST API (e.g. a local stand-in server)
+            session_cache: File (or SessionCache) where sessions are kept and shared between
+                processes; by default they are only kept in memory
+            rate_limits: Off by default (requests unpaced, never retried). True paces them with
+                DEFAULT_RATE_LIMITS; also {endpoint class: (rate per second, burst)} over
+                DEFAULT_RATE_LIMITS or a RequestScheduler shared with other clients
+            metrics: True to record request, websocket and quote-age metrics (see stats()), or a
+                Metrics shared with other clients; tt.metrics.enable() turns them on later
+        """
         # FIX #1: Updated to current TastyTrade API domain (tastyworks.com is legacy)
-        self._API_URL = 'https://api.tastytrade.com'
+        self._API_URL = api_url
+        self.metrics = metrics_for(metrics)
+        self._http = HTTPTransport(self._API_URL, auth_header=self._get_auth_header,
+                                   pool_size=pool_size, timeout=timeout, keep_alive=keep_alive,
+                                   scheduler=scheduler_for(rate_limits), metrics=self.metrics,
+                                   on_unauthorized=self._session_rejected)
+
+        self.balance_ttl = balance_ttl
+        self._balances = {}
+        self._balances_lock = threading.Lock()
+
+        self._quote_tokens = QUOTE_TOKENS
+        self.last_historical_status = {}
+
+        self._sessions = session_cache if isinstance(session_cache, SessionCache) else SessionCache(session_cache)
+        # Credentials of every login, so each refresh timer logs in as its own user
+        self._session_passwords = {}
+        self._session_clients = {}
+        self._session_timers = {}
+        self._session_lock = threading.Lock()
+        # Tokens reused from the session cache ({token: login}) and the ones that replaced them
+        # after a 401, so concurrent requests rejected together log in only once
+        self._cached_tokens = {}
+        self._replaced_tokens = {}
+        self._relogin_lock = threading.Lock()
+
+    def close(self):
+        """
+        EN: Closes the pooled HTTP connections and stops the session refresh timers.
+        ES: Cierra las conexiones HTTP del pool y para los temporizadores de renovación de sesión.
+        """
+        with self._session_lock:
+            for timer in self._session_timers.values():
+                timer.cancel()
+            self._session_timers.clear()
+        self._http.close()
+
+    def stats(self) -> dict:
+        """
+        EN: Snapshot of the client metrics (see Metrics.stats) plus the rate limiter counters.
+        ES: Instantánea de las métricas del cliente (ver Metrics.stats) más los contadores del limitador.
+        """
+        stats = self.metrics.stats()
+        scheduler = self._http.scheduler
+        stats['rate_limiter'] = dict(scheduler.stats) if scheduler is not None else None
+        return stats
 
     def _get_auth_header(self, session_token: str) -> str:
         """
@@ -35,23 +156,52 @@ class TastyTradeAPI:
         EN: Obtains the session token using user credentials.
         ES: Obtiene el token de sesión utilizando las credenciales del usuario.
         """
-        url = f"{self._API_URL}/sessions"
+        return self._login()['session_token']
+
+    def _login(self, remember_token: str = None, login: str = None, password: str = None) -> dict:
+        """
+        EN: Opens a session with the password (or a remember token): {'session_token', 'remember_token', 'expires_at'}.
+        ES: Abre una sesión con la contraseña (o un remember token): {'session_token', 'remember_token', 'expires_at'}.
+
+        login/password default to those of the last Client() call; the refresh timers pass
+        the ones of their own login.
+        """
+        if login is None:
+            login, password = self._USER, self._PASS
+        headers, payload = self._token_request(remember_token, login, password)
+        response = self._http.post("/sessions", headers=headers, data=payload)
+        if response.status_code not in [200, 201] and remember_token and password:
+            # Remember tokens are single use: another process may have spent it
+            return self._login(None, login, password)
+        return self._session_result(response)
+
+    def _token_request(self, remember_token: str = None, login: str = None, password: str = None):
+        if login is None:
+            login, password = self._USER, self._PASS
+
         headers = {
             'Content-Type': 'application/json'
         }
 
         payload = {
-            "login": self._USER,
-            "password": self._PASS,
+            "login": login,
             "remember-me": True
         }
+        if remember_token:
+            payload["remember-token"] = remember_token
+        else:
+            payload["password"] = password
 
-        response = requests.post(url, headers=headers, data=json.dumps(payload))
+        return headers, json.dumps(payload)
 
+    def _session_result(self, response) -> dict:
         if response.status_code in [200, 201]:
-            data = response.json()
-            session_token = data['data']['session-token']
-            return session_token
+            data = response.json()['data']
+            return {
+                'session_token': data['session-token'],
+                'remember_token': data.get('remember-token'),
+                'expires_at': session_expiry(data, self._sessions.default_lifetime)
+            }
         else:
             raise Exception(f"Error obtaining session token | Status Code: {response.status_code}")
 
@@ -60,14 +210,10 @@ class TastyTradeAPI:
         EN: Obtains the list accounts associated with the client.
         ES: Obtiene la lista de cuentas asociadas al cliente.
         """
-        url = f"{self._API_URL}/customers/me/accounts"
-
-        headers = {
-            "Authorization": self._get_auth_header(session_token)
-        }
-
-        response = requests.get(url, headers=headers)
+        response = self._http.get("/customers/me/accounts", session_token)
+        return self._accounts_result(response)
 
+    def _accounts_result(self, response) -> list:
         if response.status_code in [200, 201]:
             data = response.json()
             data = data['data']['items']
@@ -81,7 +227,9 @@ class TastyTradeAPI:
         ES: Obtiene el número de cuenta basado en el indice proporcionado, por defecto 0.
         """
         data = self._get_accounts(session_token)
+        return self._account_number_result(data, num)
 
+    def _account_number_result(self, data: list, num: int) -> str:
         try:
             if len(data) == 0:
                 ac_num = 'No Account'
@@ -98,14 +246,10 @@ class TastyTradeAPI:
         EN: Obtains general information about the client (no account).
         ES: Obtiene información general sobre el cliente (no de la cuenta).
         """
-        url = f"{self._API_URL}/customers/me"
-
-        headers = {
-            "Authorization": self._get_auth_header(session_token)
-        }
-
-        response = requests.get(url, headers=headers)
+        response = self._http.get("/customers/me", session_token)
+        return self._client_info_result(response)
 
+    def _client_info_result(self, response) -> dict:
         if response.status_code in [200, 201]:
             data = response.json()
             data = data['data']
@@ -116,40 +260,133 @@ class TastyTradeAPI:
     # -------------------   ES: INICIALIZAR CLIENTE   -------------------
     # -------------------   EN: INITIALIZE CLIENT   ---------------------
 
-    def Client(self, USER: str, PASS: str, num: int = 0) -> dict:
+    def Client(self, USER: str, PASS: str, num: int = 0, fresh: bool = False) -> dict:
         """
-        EN: Creates a TastyTrade client with USER and PASS.
-        ES: Crea un cliente de TastyTrade con USER y PASS.
+        EN: Creates a TastyTrade client with USER and PASS, reusing a cached session if there is one.
+        ES: Crea un cliente de TastyTrade con USER y PASS, reutilizando una sesión cacheada si la hay.
+
+        The session token and the account list are taken from the session cache while the
+        session is valid (no request at all), and the session is refreshed in the background
+        shortly before it expires; the returned dict is updated in place with the new token.
+        A cached session the server rejects (401, e.g. after a logout elsewhere) is dropped
+        from the cache and the login is repeated once.
+
+        Args:
+            num: Index of the account of the login
+            fresh: Ignore the cached session and log in again
         """
         self._USER = USER
         self._PASS = PASS
+        self._session_passwords[USER] = PASS
+
+        entry = None if fresh else self._sessions.get(USER)
+        if entry is None or entry.get('accounts') is None:
+            session = self._login(None, USER, PASS)
+            accounts = self._get_accounts(session['session_token'])
+            entry = self._sessions.put(USER, session['session_token'], session['remember_token'],
+                                       session['expires_at'], self._accounts_cache(accounts))
+        elif self._sessions.needs_refresh(entry):
+            entry = self._renew_session(USER, entry)
+        else:
+            with self._relogin_lock:
+                self._cached_tokens[entry['session_token']] = USER
+
+        ac_num = self._account_number_result(entry['accounts'], num)
+
+        self._Client = {'session_token': entry['session_token'], 'account_number': ac_num}
+        self._follow_session(USER, self._Client, entry['expires_at'])
+
+        return self._Client
+
+    def _accounts_cache(self, accounts: list) -> list:
+        """Only the account numbers of /customers/me/accounts are kept in the session cache."""
+        return [{'account': {'account-number': a['account']['account-number']}} for a in accounts]
+
+    def _renew_session(self, login: str, entry: dict) -> dict:
+        session = self._login(entry.get('remember_token'), login, self._session_passwords.get(login))
+        return self._sessions.put(login, session['session_token'], session['remember_token'], session['expires_at'])
+
+    def _follow_session(self, login: str, Client: dict, expires_at: float):
+        """Keeps Client's token current: schedules a refresh refresh_margin seconds before expiry."""
+        with self._session_lock:
+            clients = self._session_clients.setdefault(login, [])
+            if not any(c is Client for c in clients):
+                clients.append(Client)
+            old = self._session_timers.pop(login, None)
+            if old:
+                old.cancel()
+            delay = max(0.0, expires_at - self._sessions.refresh_margin - time.time())
+            timer = threading.Timer(delay, self._refresh_session, args=(login,))
+            timer.daemon = True
+            self._session_timers[login] = timer
+            timer.start()
+
+    def _refresh_session(self, login: str):
+        try:
+            entry = self._sessions.get(login)
+            # Another process may have refreshed it already
+            if entry is None or self._sessions.needs_refresh(entry):
+                entry = self._renew_session(login, entry or {})
+        except Exception as e:
+            print("Error refreshing the session -->", e)
+            return
+
+        self._adopt_session(login, entry)
+
+    def _adopt_session(self, login: str, entry: dict):
+        """Moves every Client of the login to the session of `entry`, releasing the old token's quote token."""
+        with self._session_lock:
+            clients = list(self._session_clients.get(login, []))
+        for Client in clients:
+            old = Client['session_token']
+            if old != entry['session_token']:
+                # Its refresh timer would keep calling /api-quote-tokens with a dead session
+                self._quote_tokens.invalidate(old)
+            Client['session_token'] = entry['session_token']
+            self._follow_session(login, Client, entry['expires_at'])
+
+    def _session_rejected(self, session_token: str) -> str:
+        """Logs in again when a session reused from the cache gets a 401; returns the new token or None."""
+        with self._relogin_lock:
+            if session_token in self._replaced_tokens:
+                return self._replaced_tokens[session_token]
+            login = self._cached_tokens.pop(session_token, None)
+            password = self._session_passwords.get(login)
+            if login is None or password is None:
+                return None
+            old = self._sessions.get(login) or {}
+            self._sessions.drop(login)
+            try:
+                session = self._login(None, login, password)
+            except Exception as e:
+                print("Error logging in again -->", e)
+                return None
+            entry = self._sessions.put(login, session['session_token'], session['remember_token'],
+                                       session['expires_at'], old.get('accounts'))
+            self._replaced_tokens[session_token] = entry['session_token']
 
-        session_token = self._get_token()
-        ac_num = self._account_number(session_token, num)
-
-        self._Client = {'session_token': session_token, 'account_number': ac_num}
-
-        return {'session_token': session_token, 'account_number': ac_num}
+        self._adopt_session(login, entry)
+        return entry['session_token']
 
     def _get__balances(self, Client: dict) -> dict:
         """
         EN: Obtains the general info of the account associated to the client (balances).
         ES: Obtiene la información general de la cuenta asociada al cliente (balances).
         """
-        session_token = Client['session_token']
+        account_number = self._account_of(Client)
+        response = self._http.get(f"/accounts/{account_number}/balances", Client['session_token'])
+        return self._balances_result(response)
+
+    def _account_of(self, Client: dict) -> str:
+        """Account number of the client, raising if the session has no account."""
         account_number = Client['account_number']
 
         if account_number == 'No Account':
             raise Exception("Warning: No account is associated with this client.")
 
-        url = f"{self._API_URL}/accounts/{account_number}/balances"
-
-        headers = {
-            "Authorization": self._get_auth_header(session_token)
-        }
-
-        response = requests.get(url, headers=headers)
+        return account_number
 
+    def _balances_result(self, response) -> dict:
         if response.status_code in [200, 201]:
             data = response.json()
             data = data['data']
@@ -157,6 +394,35 @@ class TastyTradeAPI:
         else:
             raise Exception(f"Error retrieving balances | Status Code: {response.status_code}")
 
+    def balance_snapshot(self, Client: dict, refresh: bool = False) -> BalanceSnapshot:
+        """
+        EN: Returns the cached balances of the account, fetching them again once the TTL expires.
+        ES: Devuelve los balances cacheados de la cuenta, pidiéndolos de nuevo al expirar el TTL.
+        """
+        account_number = Client['account_number']
+
+        with self._balances_lock:
+            snap = self._balances.get(account_number)
+        if not refresh and snap is not None and snap.age() < self.balance_ttl:
+            return snap
+
+        snap = BalanceSnapshot(account_number, self._get__balances(Client))
+        if self.balance_ttl > 0:
+            with self._balances_lock:
+                self._balances[account_number] = snap
+        return snap
+
+    def invalidate_balances(self, Client: dict = None):
+        """
+        EN: Drops the cached balances of the account (or of every account if Client is None).
+        ES: Descarta los balances cacheados de la cuenta (o de todas si Client es None).
+        """
+        with self._balances_lock:
+            if Client is None:
+                self._balances.clear()
+            else:
+                self._balances.pop(Client['account_number'], None)
+
     # -------------------   ES: MÉTRICAS DE LA CUENTA   -------------------
     # -------------------   EN: ACCOUNT METRICS   -------------------
 
@@ -166,7 +432,9 @@ class TastyTradeAPI:
         ES: Obtiene información básica sobre el cliente.
         """
         data = self._get_client_info(Client['session_token'])
+        return self._client_info_dict(data)
 
+    def _client_info_dict(self, data: dict) -> dict:
         return {
             "name": f"{data.get('first-name', '')} {data.get('last-name', '')}".strip(),
             "email": data.get("email", ""),
@@ -179,64 +447,39 @@ class TastyTradeAPI:
         EN: Obtains the cash balance of the account.
         ES: Obtiene el balance de efectivo de la cuenta.
         """
-        data = self._get__balances(Client)
-        try:
-            return float(data['cash-balance'])
-        except Exception as e:
-            raise Exception(f"Error retrieving balances --->\n{e}")
+        return self.balance_snapshot(Client).cash_balance
 
     def equity_BP(self, Client: dict) -> float:
         """
         EN: Obtains the equity buying power.
         ES: Obtiene el equity buying power.
         """
-        data = self._get__balances(Client)
-        try:
-            return float(data['equity-buying-power'])
-        except Exception as e:
-            raise Exception(f"Error retrieving Equity Buying Power --->\n{e}")
+        return self.balance_snapshot(Client).equity_buying_power
 
     def derivative_BP(self, Client: dict) -> float:
         """
         EN: Obtains the derivative buying power.
         ES: Obtiene el derivative buying power.
         """
-        data = self._get__balances(Client)
-        try:
-            return float(data['derivative-buying-power'])
-        except Exception as e:
-            raise Exception(f"Error retrieving Derivative Buying Power --->\n{e}")
+        return self.balance_snapshot(Client).derivative_buying_power
 
     def liquidity(self, Client: dict) -> float:
         """
         EN: Obtains the liquidity of the account.
         ES: Obtiene la liquidity de la cuenta.
         """
-        data = self._get__balances(Client)
-        try:
-            return float(data['net-liquidating-value'])
-        except Exception as e:
-            raise Exception(f"Error retrieving Net Liquidating Value --->\n{e}")
+        return self.balance_snapshot(Client).net_liquidating_value
 
     def total_fees(self, Client: dict) -> float:
         """
         EN: Obtains the total fees applied to the account.
         ES: Obtiene los fees totales aplicados a la cuenta.
         """
-        session_token = Client['session_token']
-        account_number = Client['account_number']
-
-        if account_number == 'No Account':
-            raise Exception("Warning: No account is associated with this client.")
-
-        url = f"{self._API_URL}/accounts/{account_number}/transactions/total-fees"
-
-        headers = {
-            "Authorization": self._get_auth_header(session_token)
-        }
-
-        response = requests.get(url, headers=headers)
+        account_number = self._account_of(Client)
+        response = self._http.get(f"/accounts/{account_number}/transactions/total-fees", Client['session_token'])
+        return self._total_fees_result(response)
 
+    def _total_fees_result(self, response) -> float:
         if response.status_code in [200, 201]:
             data = response.json()
             data = data['data']['total-fees']
@@ -244,6 +487,97 @@ class TastyTradeAPI:
         else:
             raise Exception(f"Error retrieving the applied fees | Status Code: {response.status_code}")
 
+    # -------------------   ES: VARIAS CUENTAS   -------------------
+    # -------------------   EN: MULTIPLE ACCOUNTS   -------------------
+
+    def account_clients(self, Client: dict) -> list:
+        """
+        EN: One Client per account of the login, all sharing the session token of Client.
+        ES: Un Client por cada cuenta del login, todos con el token de sesión de Client.
+        """
+        accounts = self._get_accounts(Client['session_token'])
+        return self._account_clients_result(Client, accounts)
+
+    def _account_clients_result(self, Client: dict, accounts: list) -> list:
+        return [{'session_token': Client['session_token'], 'account_number': a['account']['account-number']}
+                for a in accounts]
+
+    def _fan_out(self, Client: dict, fn, max_workers: int) -> list:
+        """Runs fn(account_client) for every account concurrently: [(account_number, result, error)]."""
+        clients = self.account_clients(Client)
+        if not clients:
+            return []
+
+        def run(c):
+            try:
+                return c['account_number'], fn(c), None
+            except Exception as e:
+                return c['account_number'], None, str(e)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(clients)))) as pool:
+            return list(pool.map(run, clients))
+
+    def _balances_frame(self, results: list) -> pd.DataFrame:
+        import pandas as pd
+
+        rows = []
+        for account, snap, error in results:
+            row = {'account_number': account, 'error': error}
+            for name in ('cash_balance', 'equity_buying_power', 'derivative_buying_power', 'net_liquidating_value'):
+                try:
+                    row[name] = getattr(snap, name) if snap is not None else float('nan')
+                except Exception as e:
+                    row[name], row['error'] = float('nan'), str(e)
+            rows.append(row)
+        columns = ['account_number', 'cash_balance', 'equity_buying_power', 'derivative_buying_power',
+                   'net_liquidating_value', 'error']
+        return pd.DataFrame(rows, columns=columns).set_index('account_number')
+
+    def _positions_frame(self, results: list) -> pd.DataFrame:
+        import pandas as pd
+
+        columns = ['account_number', 'symbol', 'quantity', 'type', 'profit', 'avg_entry_price', 'current_price',
+                   'opened_at', 'updated_at', 'error']
+        rows = []
+        for account, positions, error in results:
+            if error is not None:
+                rows.append({'account_number': account, 'error': error})
+                continue
+            for symbol, p in positions.items():
+                rows.append({'account_number': account, 'symbol': symbol, **p})
+        return pd.DataFrame(rows, columns=columns).set_index('account_number')
+
+    def _fees_frame(self, results: list) -> pd.DataFrame:
+        import pandas as pd
+
+        rows = [{'account_number': account, 'total_fees': float(fees) if fees is not None else float('nan'),
+                 'error': error} for account, fees, error in results]
+        return pd.DataFrame(rows, columns=['account_number', 'total_fees', 'error']).set_index('account_number')
+
+    def accounts_balances(self, Client: dict, max_workers: int = 8, refresh: bool = False) -> pd.DataFrame:
+        """
+        EN: Balances of every account of the login, fetched concurrently, one row per account number.
+        ES: Balances de todas las cuentas del login, en paralelo, una fila por número de cuenta.
+
+        Accounts that fail have NaN values and the reason in 'error'. Snapshots go through the
+        balance cache like balance_snapshot().
+        """
+        return self._balances_frame(self._fan_out(Client, lambda c: self.balance_snapshot(c, refresh), max_workers))
+
+    def accounts_positions(self, Client: dict, max_workers: int = 8) -> pd.DataFrame:
+        """
+        EN: Open positions of every account of the login, fetched concurrently, indexed by account number.
+        ES: Posiciones abiertas de todas las cuentas del login, en paralelo, indexadas por número de cuenta.
+        """
+        return self._positions_frame(self._fan_out(Client, self.all_positions, max_workers))
+
+    def accounts_fees(self, Client: dict, max_workers: int = 8) -> pd.DataFrame:
+        """
+        EN: Total fees of every account of the login, fetched concurrently, one row per account number.
+        ES: Fees totales de todas las cuentas del login, en paralelo, una fila por número de cuenta.
+        """
+        return self._fees_frame(self._fan_out(Client, self.total_fees, max_workers))
+
     # -------------------   ES: EJECUTAR ORDENES   -------------------
     # -------------------   EN: PLACE ORDERS   -------------------
 
@@ -300,11 +634,28 @@ class TastyTradeAPI:
         return json.dumps(order)
 
     def order(self, Client: dict, ticker: str, val: int, order_type: str, action: str,
-              time_force: str = 'Day', otype: str = 'Market') -> dict:
+              time_force: str = 'Day', otype: str = 'Market', dry_run: bool = False) -> dict:
         """
-        EN: Places a market order for the specified ticker and quantity.
-        ES: Realiza una orden de mercado para el ticker y cantidad especificados.
+        EN: Places a market order for the specified ticker and quantity (dry_run only checks and prices it).
+        ES: Realiza una orden de mercado para el ticker y cantidad especificados (dry_run solo la valida).
         """
+        order = self._order_json(ticker, val, order_type, action, time_force, otype)
+
+        headers = {
+            'Content-Type': 'application/json'
+        }
+
+        response = self._http.post(self._orders_path(Client, dry_run), Client['session_token'],
+                                   headers=headers, data=order)
+
+        result = self._order_result(response)
+        if not dry_run:
+            self.invalidate_balances(Client)
+        return result
+
+    def _order_json(self, ticker: str, val: int, order_type: str, action: str,
+                    time_force: str, otype: str) -> str:
+        """Builds the order body, validating order_type and action."""
         if order_type == 'Long':
             if action == 'Start':
                 order = self._start_long(ticker, val, time_force, otype)
@@ -322,21 +673,9 @@ class TastyTradeAPI:
         else:
             raise Exception("Order error ---> Invalid order type, try: Long or Short")
 
-        session_token = Client['session_token']
-        account_number = Client['account_number']
-
-        if account_number == 'No Account':
-            raise Exception("Warning: No account is associated with this client.")
-
-        url = f"{self._API_URL}/accounts/{account_number}/orders"
-
-        headers = {
-            "Authorization": self._get_auth_header(session_token),
-            'Content-Type': 'application/json'
-        }
-
-        response = requests.post(url, headers=headers, data=order)
+        return order
 
+    def _order_result(self, response) -> dict:
         if response.status_code not in [200, 201]:
             raise Exception(f"Order error ---> Response Status: {response.status_code}")
 
@@ -354,6 +693,101 @@ class TastyTradeAPI:
             "ReceivedAt": ord_data["received-at"]
         }
 
+    # ------------------- ES: ÓRDENES EN LOTE -------------------
+    # ------------------- EN: BATCH ORDERS -------------------
+
+    def _batch_orders(self, orders: list, time_force: str, otype: str) -> list:
+        """
+        Validates every order spec before anything is sent, returning [(ticker, body)].
+        A spec is a dict with ticker, val, order_type, action (and optionally time_force,
+        otype) or a tuple in the order of order().
+        """
+        keys = ('ticker', 'val', 'order_type', 'action', 'time_force', 'otype')
+        built, errors = [], []
+        for i, spec in enumerate(orders):
+            try:
+                if isinstance(spec, dict):
+                    unknown = set(spec) - set(keys)
+                    if unknown:
+                        raise Exception(f"unknown fields {sorted(unknown)}")
+                    spec = {'time_force': time_force, 'otype': otype, **spec}
+                else:
+                    spec = {'time_force': time_force, 'otype': otype, **dict(zip(keys, spec))}
+                missing = [k for k in keys[:4] if k not in spec]
+                if missing:
+                    raise Exception(f"missing {', '.join(missing)}")
+                if not isinstance(spec['ticker'], str) or not spec['ticker']:
+                    raise Exception("ticker must be a non-empty string")
+                if isinstance(spec['val'], bool) or not isinstance(spec['val'], (int, float)) or spec['val'] <= 0:
+                    raise Exception(f"invalid quantity {spec['val']!r}")
+                body = self._order_json(spec['ticker'], spec['val'], spec['order_type'], spec['action'],
+                                        spec['time_force'], spec['otype'])
+                built.append((spec['ticker'], body))
+            except Exception as e:
+                errors.append(f"  #{i}: {e}")
+
+        if errors:
+            raise Exception(f"Order batch error ---> {len(errors)} invalid order(s), nothing was sent:\n"
+                            + "\n".join(errors))
+        return built
+
+    def _batch_entry(self, index: int, ticker: str, latency: float, response=None, error=None) -> dict:
+        """Per-order outcome of a batch: the fields of order() plus Ok, Error and Latency (seconds)."""
+        entry = {"Index": index, "Ticker": ticker, "Ok": False, "Status": None, "Size": None, "Fees": None,
+                 "Commission": None, "NewBuyingPower": None, "ReceivedAt": None, "Error": error,
+                 "Latency": latency}
+        if response is not None:
+            try:
+                entry.update(self._order_result(response))
+                entry["Ok"] = True
+            except Exception as e:
+                entry["Error"] = str(e)
+        return entry
+
+    def _orders_path(self, Client: dict, dry_run: bool) -> str:
+        account_number = self._account_of(Client)
+        return f"/accounts/{account_number}/orders" + ("/dry-run" if dry_run else "")
+
+    def order_batch(self, Client: dict, orders: list, dry_run: bool = False, max_workers: int = 8,
+                    time_force: str = 'Day', otype: str = 'Market') -> list:
+        """
+        EN: Sends many orders concurrently and returns one result per order, in input order.
+        ES: Envía muchas órdenes en paralelo y devuelve un resultado por orden, en el orden de entrada.
+
+        Every spec is validated first; if any is invalid nothing is sent. Orders are then posted
+        by at most `max_workers` threads over the pooled connections. A failed order does not
+        stop the others: its result has Ok=False and the reason in Error.
+
+        Args:
+            orders: Dicts {'ticker', 'val', 'order_type', 'action'[, 'time_force', 'otype']}
+                or tuples (ticker, val, order_type, action[, time_force, otype])
+            dry_run: Send to the dry-run endpoint (orders are checked and priced, not placed)
+            max_workers: Orders in flight at the same time
+            time_force, otype: Defaults of the specs that do not set them
+        """
+        built = self._batch_orders(orders, time_force, otype)
+        if not built:
+            return []
+
+        path = self._orders_path(Client, dry_run)
+        headers = {'Content-Type': 'application/json'}
+
+        def send(index: int, ticker: str, body: str) -> dict:
+            started = time.perf_counter()
+            try:
+                response = self._http.post(path, Client['session_token'], headers=headers, data=body)
+            except Exception as e:
+                return self._batch_entry(index, ticker, time.perf_counter() - started, error=str(e))
+            return self._batch_entry(index, ticker, time.perf_counter() - started, response=response)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(built)))) as pool:
+            futures = [pool.submit(send, i, ticker, body) for i, (ticker, body) in enumerate(built)]
+            results = [f.result() for f in futures]
+
+        if not dry_run:
+            self.invalidate_balances(Client)
+        return results
+
     # ------------------- ES: DATOS DE LAS POSICIONES -------------------
     # ------------------- EN: POSITION DATA -------------------
 
@@ -362,20 +796,11 @@ class TastyTradeAPI:
         EN: Obtains the list of open positions.
         ES: Obtiene la lista de las posiciones abiertas.
         """
-        session_token = Client['session_token']
-        account_number = Client['account_number']
-
-        if account_number == 'No Account':
-            raise Exception("Warning: No account is associated with this client.")
-
-        url = f"{self._API_URL}/accounts/{account_number}/positions"
-
-        headers = {
-            "Authorization": self._get_auth_header(session_token)
-        }
-
-        response = requests.get(url, headers=headers)
+        account_number = self._account_of(Client)
+        response = self._http.get(f"/accounts/{account_number}/positions", Client['session_token'])
+        return self._position_result(response)
 
+    def _position_result(self, response) -> list:
         if response.status_code in [200, 201]:
             data = response.json()
             data = data['data']['items']
@@ -425,7 +850,14 @@ class TastyTradeAPI:
         """
         try:
             positions = self._position(Client)
+        except Exception as e:
+            raise Exception(f"Error parsing positions --->\n{e}")
 
+        return self._positions_dict(positions)
+
+    def _positions_dict(self, positions: list) -> dict:
+        """Parses the raw positions into {symbol: position}."""
+        try:
             if len(positions) == 0:
                 return {}
 
@@ -454,33 +886,93 @@ class TastyTradeAPI:
     # ------------------- ES: DATOS DE LAS TRANSACCIONES -------------------
     # ------------------- EN: TRANSACTION DATA -------------------
 
-    def _transaction(self, Client: dict) -> list:
+    def _transaction_params(self, symbol: str = None, start_date=None, end_date=None, types=None,
+                            per_page: int = 250, sort: str = 'Desc') -> list:
+        """Query parameters of /transactions; the filters are applied by the server."""
+
+        def as_date(value) -> str:
+            return value.isoformat()[:10] if hasattr(value, 'isoformat') else str(value)
+
+        params = [('per-page', int(per_page)), ('sort', sort)]
+        if symbol:
+            params.append(('symbol', symbol))
+        if types:
+            params.extend(('types[]', t) for t in ([types] if isinstance(types, str) else types))
+        if start_date:
+            params.append(('start-date', as_date(start_date)))
+        if end_date:
+            params.append(('end-date', as_date(end_date)))
+        return params
+
+    def _transaction(self, Client: dict, params: list = None, page: int = 0) -> tuple:
         """
-        EN: Obtains the list of transactions.
-        ES: Obtiene la lista de transacciones.
+        EN: Obtains one page of transactions as (items, total_pages).
+        ES: Obtiene una página de transacciones como (items, total_pages).
         """
-        session_token = Client['session_token']
-        account_number = Client['account_number']
-
-        if account_number == 'No Account':
-            raise Exception("Warning: No account is associated with this client.")
+        account_number = self._account_of(Client)
+        params = list(params if params is not None else self._transaction_params()) + [('page-offset', page)]
 
         # FIX #3: Added missing slash before 'transactions'
-        url = f"{self._API_URL}/accounts/{account_number}/transactions"
-
-        headers = {
-            "Authorization": self._get_auth_header(session_token)
-        }
-
-        response = requests.get(url, headers=headers)
+        response = self._http.get(f"/accounts/{account_number}/transactions", Client['session_token'],
+                                  params=params)
+        return self._transaction_page_result(response)
 
+    def _transaction_page_result(self, response) -> tuple:
         if response.status_code in [200, 201]:
             data = response.json()
-            data = data['data']['items']
-            return data
+            total_pages = (data.get('pagination') or {}).get('total-pages')
+            return data['data']['items'], total_pages
         else:
             raise Exception(f"Error retrieving transactions | Status Code: {response.status_code}")
 
+    def _has_next_page(self, page: int, items: list, total_pages, per_page: int) -> bool:
+        """True if another page follows (from the pagination block, else from a full page)."""
+        if total_pages is not None:
+            return page + 1 < total_pages
+        return len(items) >= per_page
+
+    def _transaction_pages(self, Client: dict, params: list, prefetch: bool = True):
+        """Yields the raw item lists of every page, fetching the next one in the background."""
+        per_page = dict(params)['per-page']
+        pool = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            page = 0
+            items, total_pages = self._transaction(Client, params, page)
+            while True:
+                has_next = self._has_next_page(page, items, total_pages, per_page)
+                pending = pool.submit(self._transaction, Client, params, page + 1) if has_next and pool else None
+                yield items
+                if not has_next:
+                    return
+                page += 1
+                items, total_pages = pending.result() if pending else self._transaction(Client, params, page)
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=False)
+
+    def iter_transactions(self, Client: dict, symbol: str = None, start_date=None, end_date=None,
+                          types=None, per_page: int = 250, sort: str = 'Desc', prefetch: bool = True):
+        """
+        EN: Lazily yields every transaction of the account, page by page (newest first by default).
+        ES: Devuelve perezosamente cada transacción de la cuenta, página a página (más recientes primero).
+
+        Only one page (two with prefetch) is held in memory, so years of history can be walked
+        with flat memory. The filters are sent to the server, which only returns what matches.
+
+        Args:
+            symbol: Only transactions of this symbol
+            start_date: First day (date, datetime or 'YYYY-MM-DD')
+            end_date: Last day (date, datetime or 'YYYY-MM-DD')
+            types: Transaction type or list of types (e.g. 'Trade', 'Money Movement')
+            per_page: Transactions requested per page
+            sort: 'Desc' (newest first) or 'Asc'
+            prefetch: Request the next page while the current one is being consumed
+        """
+        params = self._transaction_params(symbol, start_date, end_date, types, per_page, sort)
+        for items in self._transaction_pages(Client, params, prefetch):
+            for t in items:
+                yield self._transaction_entry(t)
+
     def _parse_transaction(self, item: dict) -> dict:
         """Parses transaction data to return a user-friendly dictionary."""
 
@@ -501,30 +993,36 @@ class TastyTradeAPI:
             "date": format_date(item.get("executed-at", "")),
         }
 
-    def all_transactions(self, Client: dict) -> dict:
+    def _transaction_entry(self, item: dict) -> dict:
+        """Parsed transaction with its symbol ({'symbol', 'error'} if it cannot be parsed)."""
+        symbol = item.get("symbol")
+        try:
+            return {"symbol": symbol, **self._parse_transaction(item)}
+        except Exception as e:
+            return {"symbol": symbol, "error": str(e)}
+
+    def all_transactions(self, Client: dict, start_date=None, end_date=None, types=None) -> dict:
         """
-        EN: Obtains all transactions.
-        ES: Obtiene todas las transacciones.
+        EN: Obtains all transactions (every page), optionally within a date range or of some types.
+        ES: Obtiene todas las transacciones (todas las páginas), opcionalmente por fechas o tipos.
         """
-        transactions = self._transaction(Client)
+        params = self._transaction_params(start_date=start_date, end_date=end_date, types=types)
         data = {}
+        for items in self._transaction_pages(Client, params):
+            self._add_transactions(data, items)
+        return data
 
-        if len(transactions) == 0:
-            return data
+    def _transactions_dict(self, transactions: list) -> dict:
+        """Parses the raw transactions into {symbol: [transactions]}."""
+        return self._add_transactions({}, transactions)
 
+    def _add_transactions(self, data: dict, transactions: list) -> dict:
         for t in transactions:
-            try:
-                symbol = t.get("symbol")
-                parsed = self._parse_transaction(t)
-                if symbol not in data:
-                    data[symbol] = []
-                data[symbol].append(parsed)
-            except Exception as e:
-                symbol = t.get("symbol", "unknown")
-                if symbol not in data:
-                    data[symbol] = []
-                data[symbol].append({"error": str(e)})
-
+            entry = self._transaction_entry(t)
+            symbol = entry.pop("symbol")
+            if symbol not in data:
+                data[symbol] = []
+            data[symbol].append(entry)
         return data
 
     def check_transaction(self, Client: dict, symbol: str) -> dict:
@@ -532,12 +1030,18 @@ class TastyTradeAPI:
         EN: Checks if there are transactions for the given symbol.
         ES: Comprueba si hay transacciones para el símbolo dado.
         """
-        transactions = self.all_transactions(Client)
-        return transactions.get(symbol, None)
+        params = self._transaction_params(symbol=symbol)
+        data = {}
+        for items in self._transaction_pages(Client, params):
+            self._add_transactions(data, items)
+        return data.get(symbol, None)
 
     def still_connected(self, Client):
-        """Check if the client session is still valid."""
+        """Check if the client session is still valid (locally if its expiry is known)."""
         session_token = Client['session_token']
+        expires_at = self._sessions.expires_at(session_token)
+        if expires_at is not None:
+            return expires_at > time.time()
         try:
             _ = self._get_client_info(session_token)
             return True
@@ -553,26 +1057,32 @@ class TastyTradeAPI:
         """
         session_token = Client['session_token']
 
-        url = f"{self._API_URL}/api-quote-tokens"
-
-        headers = {
-            "Authorization": self._get_auth_header(session_token)
-        }
-
-        response = requests.get(url, headers=headers)
+        response = self._http.get("/api-quote-tokens", session_token)
+        return self._DX_vals_result(response)
 
+    def _DX_vals_result(self, response) -> dict:
         if response.status_code in [200, 201]:
             data = response.json()
             return data['data']
         else:
             raise Exception(f"Error retrieving DX session | Status Code: {response.status_code}")
 
+    def _quote_token(self, Client: dict, refresh: bool = False) -> dict:
+        """
+        EN: Returns the cached DX link and token of the session, fetching both in one request on a miss.
+        ES: Devuelve el link y token de DX cacheados de la sesión, pidiendo ambos en una petición si faltan.
+        """
+        session_token = Client['session_token']
+        if refresh:
+            self._quote_tokens.invalidate(session_token)
+        return self._quote_tokens.get(session_token, lambda: self._get_DX_vals({'session_token': session_token}))
+
     def DX_link(self, Client: dict) -> str:
         """
         EN: Obtains the url api to DX feed.
         ES: Obtienes la url de la api para DX feed.
         """
-        data = self._get_DX_vals(Client)
+        data = self._quote_token(Client)
         try:
             return data['dxlink-url']
         except Exception as e:
@@ -583,12 +1093,24 @@ class TastyTradeAPI:
         EN: Returns the DX token.
         ES: Devuelve el token de DX.
         """
-        data = self._get_DX_vals(Client)
+        data = self._quote_token(Client)
         try:
             return data['token']
         except Exception as e:
             raise Exception(f"Error retrieving DX TOKEN --->\n{e}")
 
+    def _DX_session_messages(self, dx_token: str) -> dict:
+        """
+        EN: Connection-level DXLink messages (channel 0) shared by every feed.
+        ES: Mensajes DXLink a nivel de conexión (canal 0) comunes a todos los feeds.
+        """
+        return {
+            'SETUP': {"type": "SETUP", "channel": 0, "version": "0.1-DXF-JS/0.3.0",
+                      "keepaliveTimeout": 60, "acceptKeepaliveTimeout": 60},
+            'AUTH': {"type": "AUTH", "channel": 0, "token": dx_token},
+            'KEEP': {"type": "KEEPALIVE", "channel": 0}
+        }
+
     def DX_messages(self, dx_token: str, ticker_list: list) -> dict:
         """
         EN: Creates messages to communicate with DX websocket for real-time data.
@@ -597,27 +1119,38 @@ class TastyTradeAPI:
         if len(ticker_list) == 0:
             return None
 
-        lista = []
-        for i in ticker_list:
-            val = {"type": "Quote", "symbol": i}
-            lista.append(val)
+        return self._DX_stream_messages(dx_token, ticker_list)
 
+    def _DX_stream_messages(self, dx_token: str, ticker_list: list) -> dict:
         # FIX #8: Use COMPACT format (FULL is being deprecated per TastyTrade docs)
+        session = self._DX_session_messages(dx_token)
         messages = {
-            'SETUP': {"type": "SETUP", "channel": 0, "version": "0.1-DXF-JS/0.3.0",
-                      "keepaliveTimeout": 60, "acceptKeepaliveTimeout": 60},
-            'AUTH': {"type": "AUTH", "token": dx_token, "channel": 0},
+            'SETUP': session['SETUP'],
+            'AUTH': session['AUTH'],
             'CHANNEL': {"type": "CHANNEL_REQUEST", "channel": 3, "service": "FEED",
                         "parameters": {"contract": "AUTO"}},
             'FEED': {"type": "FEED_SETUP", "channel": 3, "acceptAggregationPeriod": 0.1,
                      "acceptDataFormat": "COMPACT",
-                     "acceptEventFields": {"Quote": ["eventType", "eventSymbol", "bidPrice", "askPrice"]}},
-            'SUB': {"type": "FEED_SUBSCRIPTION", "channel": 3, "reset": True, "add": lista},
-            'KEEP': {"type": "KEEPALIVE", "channel": 0}
+                     "acceptEventFields": {"Quote": list(QUOTE_FIELDS)}},
+            'SUB': self._DX_subscription(add=ticker_list, reset=True),
+            'KEEP': session['KEEP']
         }
 
         return messages
 
+    def _DX_subscription(self, add: list = (), remove: list = (), reset: bool = False, channel: int = 3) -> dict:
+        """
+        EN: FEED_SUBSCRIPTION message adding / removing Quote symbols (reset replaces the whole list).
+        ES: Mensaje FEED_SUBSCRIPTION que añade / quita símbolos Quote (reset reemplaza toda la lista).
+        """
+        message = {"type": "FEED_SUBSCRIPTION", "channel": channel}
+        if reset:
+            message["reset"] = True
+        message["add"] = [{"type": "Quote", "symbol": i} for i in add]
+        if remove:
+            message["remove"] = [{"type": "Quote", "symbol": i} for i in remove]
+        return message
+
     def _get_hist_DX_messages(self, dx_token: str, ticker_list: list, num: int, t_time: str,
                               fromTime, candle_fields: list = None) -> dict:
         """
@@ -627,7 +1160,7 @@ class TastyTradeAPI:
         Based on TastyTrade DXLink documentation:
         - Symbol format: AAPL{=5m} where 5=period, m=type (minutes)
         - Must use COMPACT data format
-        - fromTime is Unix epoch milliseconds
+        - fromTime is Unix epoch milliseconds (or a {ticker: ms} dict for per-ticker starts)
         """
         if len(ticker_list) == 0:
             return None
@@ -643,93 +1176,77 @@ class TastyTradeAPI:
             subscription = {
                 "type": "Candle",
                 "symbol": candle_symbol,
-                "fromTime": fromTime
+                "fromTime": fromTime.get(ticker) if isinstance(fromTime, dict) else fromTime
             }
             lista.append(subscription)
 
         # FIX #8: Use COMPACT format with proper keepalive
+        session = self._DX_session_messages(dx_token)
         messages = {
-            'SETUP': {"type": "SETUP", "channel": 0, "version": "0.1-DXF-JS/0.3.0",
-                      "keepaliveTimeout": 60, "acceptKeepaliveTimeout": 60},
-            'AUTH': {"type": "AUTH", "channel": 0, "token": dx_token},
+            'SETUP': session['SETUP'],
+            'AUTH': session['AUTH'],
             'CHANNEL': {"type": "CHANNEL_REQUEST", "channel": 3, "service": "FEED",
                         "parameters": {"contract": "AUTO"}},
             'FEED': {"type": "FEED_SETUP", "channel": 3, "acceptAggregationPeriod": 0.1,
                      "acceptDataFormat": "COMPACT",
                      "acceptEventFields": {"Candle": candle_fields}},
             'SUB': {"type": "FEED_SUBSCRIPTION", "channel": 3, "reset": True, "add": lista},
-            'KEEP': {"type": "KEEPALIVE", "channel": 0}
+            'KEEP': session['KEEP']
         }
 
         return messages
 
     # -------------------   WEBSOCKET FOR HISTORICAL DATA   ---------------------
 
-    def _websocket_historical(self, link: str, messages: dict, df: pd.DataFrame,
-                              num_vars: int, timeout: int = 30) -> pd.DataFrame:
+    def _websocket_historical(self, link: str, messages: dict, buffer: CandleBuffer,
+                              tracker: CompletionTracker, timeout: int = 30,
+                              connect_timeout: int = 10) -> CandleBuffer:
         """
-        EN: Connects to DX websocket and retrieves historical Candle data.
-        ES: Se conecta al websocket de DX y recupera datos históricos de Candle.
+        EN: Connects to DX websocket and decodes historical Candle data into the column buffer.
+        ES: Se conecta al websocket de DX y decodifica los datos históricos de Candle en el buffer.
 
-        FIX #6: Added proper timeout and completion detection so the WebSocket
-        actually closes instead of hanging forever.
+        Returns as soon as the tracker reports every subscribed symbol as done (snapshot end,
+        current bar reached or quiet period), the socket closes or `timeout` expires.
         """
-        rows_collected = []
-        data_received = threading.Event()
+        import websocket
+
         connection_ready = threading.Event()
         ws_instance = [None]
-
-        def add_rows_to_list(data_array):
-            """Parse incoming COMPACT format data array."""
-            if not data_array or not isinstance(data_array, list):
-                return
-
-            for i in range(0, len(data_array), num_vars):
-                if i + num_vars <= len(data_array):
-                    row = data_array[i:i + num_vars]
-                    rows_collected.append(row)
-
-            data_received.set()
+        metrics = self.metrics
+        opened = time.perf_counter()
 
         def treat_message(ws, message):
             try:
                 message_data = json.loads(message)
-                msg_type = message_data.get("type")
-
-                if msg_type == "AUTH_STATE":
-                    state = message_data.get("state")
-                    if state == 'UNAUTHORIZED':
-                        ws.send(json.dumps(messages['AUTH']))
-                    elif state == 'AUTHORIZED':
-                        ws.send(json.dumps(messages['CHANNEL']))
-
-                elif msg_type == "CHANNEL_OPENED" and message_data.get("channel") == 3:
-                    ws.send(json.dumps(messages['FEED']))
-
-                elif msg_type == "FEED_CONFIG" and message_data.get("channel") == 3:
-                    ws.send(json.dumps(messages['SUB']))
-                    connection_ready.set()
-
-                elif msg_type == "FEED_DATA" and message_data.get("channel") == 3:
-                    data = message_data.get('data', [])
-                    # COMPACT format: ["Candle", [data_values...]]
-                    if len(data) >= 2 and isinstance(data[1], list):
-                        add_rows_to_list(data[1])
-
             except json.JSONDecodeError:
-                pass
+                return
+
+            try:
+                for reply in self._historical_replies(message_data, messages, buffer, tracker):
+                    ws.send(json.dumps(reply))
+                    if reply is messages['SUB']:
+                        connection_ready.set()
+                        if metrics.enabled:
+                            metrics.handshake('historical', time.perf_counter() - opened)
             except Exception as e:
                 print(f"Error processing message: {e}")
 
         def on_message(ws, message):
+            if not metrics.enabled:
+                treat_message(ws, message)
+                return
+            started, rows = time.perf_counter(), len(buffer)
             treat_message(ws, message)
+            metrics.message('historical', len(buffer) - rows, time.perf_counter() - started)
 
         def on_error(ws, error):
             print(f'WebSocket Error: {error}')
-            data_received.set()
+            tracker.close()
+            connection_ready.set()
 
         def on_close(ws, close_status_code=None, close_msg=None):
-            data_received.set()
+            tracker.close()
+            connection_ready.set()
 
         def on_open(ws):
             ws.send(json.dumps(messages['SETUP']))
@@ -742,36 +1259,61 @@ class TastyTradeAPI:
         ws_instance[0] = ws
 
         # FIX #6: Run WebSocket in a daemon thread so we can implement timeout
-        ws_thread = threading.Thread(target=ws.run_forever, daemon=True)
+        ws_thread = threading.Thread(target=ws.run_forever, kwargs=RUN_OPTIONS, daemon=True)
         ws_thread.start()
 
-        # Wait for connection to be ready
-        connection_ready.wait(timeout=10)
-
-        # Wait for data with timeout
-        data_received.wait(timeout=timeout)
+        # Wait for the subscription to be sent (or the socket to fail)
+        if not connection_ready.wait(timeout=connect_timeout):
+            tracker.close()
 
-        # Brief pause to allow final messages
-        time.sleep(2)
+        # Wait until every symbol is complete, idle, or the overall timeout expires
+        tracker.wait(timeout)
 
         # Close the WebSocket connection
-        if ws_instance[0]:
-            ws_instance[0].close()
+        close_websocket(ws_instance[0], ws_thread)
 
-        ws_thread.join(timeout=5)
+        return buffer
 
-        # Batch-add all rows to DataFrame
-        if rows_collected and len(df.columns) > 0:
-            for row in rows_collected:
-                if len(row) == len(df.columns):
-                    df.loc[len(df)] = row
-
-        return df
+    def _historical_replies(self, message_data: dict, messages: dict, buffer: CandleBuffer,
+                            tracker: CompletionTracker) -> list:
+        """
+        EN: Handles one DXLink message of a historical fetch and returns the messages to send back.
+        ES: Procesa un mensaje DXLink de una descarga histórica y devuelve los mensajes a responder.
+        """
+        msg_type = message_data.get("type")
+        channel = messages['CHANNEL']['channel']
+
+        if msg_type == "AUTH_STATE":
+            state = message_data.get("state")
+            if state == 'UNAUTHORIZED':
+                return [messages['AUTH']]
+            elif state == 'AUTHORIZED':
+                return [messages['CHANNEL']]
+
+        elif msg_type == "CHANNEL_OPENED" and message_data.get("channel") == channel:
+            return [messages['FEED']]
+
+        elif msg_type == "FEED_CONFIG" and message_data.get("channel") == channel:
+            # Server-confirmed field order for COMPACT arrays
+            fields = (message_data.get("eventFields") or {}).get("Candle")
+            if fields and len(buffer) == 0:
+                buffer.set_fields(fields)
+            tracker.subscribed()
+            return [messages['SUB']]
+
+        elif msg_type == "FEED_DATA" and message_data.get("channel") == channel:
+            data = message_data.get('data', [])
+            # COMPACT format: ["Candle", [data_values...]]
+            if len(data) >= 2 and isinstance(data[1], list):
+                buffer.add(data[1], tracker)
+
+        return []
 
     # -------------------   HISTORICAL DATA   -------------------
 
     def get_historical(self, Client: dict, tickers: list, interval: str,
-                       vars: list = None, max_data: int = 100) -> dict:
+                       vars: list = None, max_data: int = 100, quiet_period: float = 1.0,
+                       store=None, shard_size: int = 25, concurrency: int = 4, retries: int = 2) -> dict:
         """
         EN: Obtains historical Candle data for specified tickers and interval.
         ES: Obtiene datos históricos de Candle para los tickers e intervalo especificados.
@@ -782,29 +1324,91 @@ class TastyTradeAPI:
             interval: Time interval string (e.g., "1m", "5m", "15m", "1h", "1d")
             vars: List of OHLCV fields (e.g., ['open', 'high', 'low', 'close', 'volume'])
             max_data: Maximum number of data points per ticker
+            quiet_period: Seconds without new bars after which a symbol is considered complete
+            store: Optional CandleStore. Cached bars are read from it and only the bars from the
+                last stored one on (plus any unfilled gaps) are requested from DXLink
+            shard_size: Maximum number of tickers per DXLink connection
+            concurrency: Maximum number of shards fetched at the same time
+            retries: Times a shard whose symbols failed or timed out is fetched again
 
         Returns:
-            Dict mapping ticker symbols to DataFrames with historical data
+            Dict mapping ticker symbols to DataFrames with historical data. The completion
+            status and timing of each ticker is in `df.attrs['fetch']` and, for every requested
+            ticker (including those that returned nothing), in `self.last_historical_status`.
+        """
+        dx_vals = self._quote_token(Client)
+        link = dx_vals['dxlink-url']
+        token = dx_vals['token']
+
+        if len(tickers) == 0:
+            return {}
+
+        plan = self._historical_plan(tickers, interval, vars, max_data, store)
+
+        # Timeout based on data volume (per shard, so it only depends on the shard size)
+        wait_time = 30
+        if plan['days'] > 30 or min(len(tickers), shard_size) > 5:
+            wait_time = 45
+
+        fetched, report = self._fetch_sharded(link, token, tickers, plan['num'], plan['t_time'],
+                                              plan['from_times'], plan['candle_fields'], quiet_period,
+                                              wait_time, shard_size, concurrency, retries)
+
+        return self._historical_result(fetched, report, plan, store)
+
+    def get_historical_multi(self, Client: dict, tickers: list, intervals: list, vars: list = None,
+                             max_data: int = 100, session: tuple = ('09:30', '16:00'), **kwargs) -> dict:
+        """
+        EN: Candles of several intervals from one fetch of the finest of them, resampled locally.
+        ES: Velas de varios intervalos a partir de una sola descarga del más fino, reagregadas en local.
+
+        Only the finest interval is downloaded (one websocket, one handshake), with enough bars
+        for `max_data` bars of the coarsest one; the others are built with resample_candles
+        (session-aligned OHLCV aggregation). Every interval must be a multiple of the finest.
+
+            bars = tt.get_historical_multi(client, ["AAPL"], ["1m", "5m", "15m", "1h"], max_data=200)
+            bars["1h"]["AAPL"]
+
+        Args:
+            intervals: Intervals to return, e.g. ['1m', '5m', '15m', '1h']
+            max_data: Maximum number of bars per ticker and interval
+            session: Trading session (New York time) used to align and filter the bars
+            **kwargs: Passed to get_historical (quiet_period, store, shard_size, ...)
+
+        Returns:
+            {interval: {ticker: DataFrame}}, frames shaped like those of get_historical
+        """
+        from .resample import base_rows, interval_ns, resample_frames
+
+        intervals = list(dict.fromkeys(intervals))
+        base = min(intervals, key=interval_ns)
+        frames = self.get_historical(Client, tickers, base, vars, base_rows(base, intervals, max_data, session),
+                                     **kwargs)
+        result = resample_frames(frames, [i for i in intervals if i != base], max_rows=max_data, session=session)
+        result[base] = {ticker: df.head(max_data) for ticker, df in frames.items()}
+        return {interval: result[interval] for interval in intervals}
+
+    def _historical_plan(self, tickers: list, interval: str, vars: list, max_data: int, store=None) -> dict:
+        """
+        EN: Works out the Candle fields, window and per-ticker fromTime of a historical request.
+        ES: Calcula los campos Candle, la ventana y el fromTime por ticker de una petición histórica.
         """
-        link = self.DX_link(Client)
-        token = self.DX_token(Client)
+        from .candles import VALUE_FIELDS
 
         # FIX #4: Properly parse interval string (e.g., "15m" -> num=15, t_time="m")
         num_str = ''.join([c for c in interval if c.isdigit()])
         t_time = ''.join([c for c in interval if c.isalpha()])
         num = int(num_str) if num_str else 1
 
-        if len(tickers) == 0:
-            return {}
-
         # FIX #5: Don't mutate default argument - create a new list
         # Build complete list of Candle fields for DXLink
         user_fields = list(vars) if vars else ['close']
 
         # DXLink Candle fields (order matters for COMPACT format!)
-        candle_fields = ['eventType', 'eventSymbol', 'time']
-        for field in ['open', 'high', 'low', 'close', 'volume']:
-            if field in user_fields:
+        # eventFlags carries the snapshot begin/end markers used for completion detection
+        candle_fields = ['eventType', 'eventSymbol', 'time', 'eventFlags']
+        for field in VALUE_FIELDS:
+            if field in user_fields or store is not None:
                 candle_fields.append(field)
 
         # Calculate how far back to fetch data
@@ -814,39 +1418,199 @@ class TastyTradeAPI:
         elif t_time == 'h':
             days = int((max_data * num) / 6)
 
-        # Timeout based on data volume
-        wait_time = 30
-        if days > 30 or len(tickers) > 5:
-            wait_time = 45
-
-        max_rows = int(max_data)
+        bar_ms = self._interval_ms(num, t_time)
 
         # Calculate fromTime in milliseconds
         now = datetime.datetime.now(datetime.UTC)
         fromTime = int((now - timedelta(days=max(days, 1))).timestamp() * 1000)
 
-        # Build DXLink messages
-        messages = self._get_hist_DX_messages(token, tickers, num, t_time, fromTime, candle_fields)
-
-        # Column name mapping (DXLink field -> DataFrame column)
-        vars_names = {
-            'eventType': 'EventType',
-            'eventSymbol': 'Ticker',
-            'time': 'Time',
-            'open': 'Open',
-            'high': 'High',
-            'low': 'Low',
-            'close': 'Close',
-            'volume': 'Volume'
+        # With a store, each ticker starts at its last stored bar (re-requested, as it may have been
+        # stored while still forming) or at its oldest unfilled gap inside the window
+        from_times, gaps = fromTime, {}
+        if store is not None:
+            from_times = {}
+            for tck in tickers:
+                last = store.last_time(tck, interval)
+                gaps[tck] = [g for g in store.gaps(tck, interval, bar_ms) if g[1] >= fromTime]
+                start = fromTime if last is None or last < fromTime else last
+                if gaps[tck]:
+                    start = max(min(start, gaps[tck][0][0]), fromTime)
+                from_times[tck] = start
+
+        return {
+            'interval': interval, 'num': num, 't_time': t_time, 'days': days, 'bar_ms': bar_ms,
+            'user_fields': user_fields, 'candle_fields': candle_fields, 'max_rows': int(max_data),
+            'fromTime': fromTime, 'from_times': from_times, 'gaps': gaps
         }
 
-        cols = [vars_names[v] for v in candle_fields if v in vars_names]
-        df = pd.DataFrame(columns=cols)
+    def _historical_result(self, fetched: pd.DataFrame, report: dict, plan: dict, store=None) -> dict:
+        """
+        EN: Turns the raw Candle frame of a request into {ticker: DataFrame} with completion status.
+        ES: Convierte el DataFrame Candle de una petición en {ticker: DataFrame} con su estado.
+        """
+        from .candles import CANDLE_COLUMNS, VALUE_FIELDS
+
+        status = {sym.split('{')[0]: st for sym, st in report.items()}
+        self.last_historical_status = status
+
+        if store is not None:
+            raw = self._store_candles(store, plan['interval'], fetched, plan['gaps'], plan['fromTime'], status)
+        else:
+            raw = fetched
+
+        # FIX #7: Check for empty data before processing
+        if raw.empty:
+            return {}
 
-        # Fetch data via WebSocket
-        df_new = self._websocket_historical(link, messages, df, num_vars=len(candle_fields), timeout=wait_time)
+        dicc = self._historical_frames(raw, plan['max_rows'])
+        keep = ['EventType'] + [CANDLE_COLUMNS[f] for f in VALUE_FIELDS if f in plan['user_fields']] + ['Date']
+        for tck in list(dicc):
+            dicc[tck] = dicc[tck][[c for c in keep if c in dicc[tck].columns]]
+            dicc[tck].attrs['fetch'] = status.get(tck)
+
+        return dicc
+
+    def _fetch_candles(self, link: str, token: str, tickers: list, num: int, t_time: str,
+                       from_times, candle_fields: list, quiet_period: float, timeout: int):
+        """
+        EN: Runs one DXLink Candle subscription and returns the filled (CandleBuffer, CompletionTracker).
+        ES: Ejecuta una suscripción Candle en DXLink y devuelve (CandleBuffer, CompletionTracker).
+        """
+        from .candles import CandleBuffer, CompletionTracker
+
+        messages = self._get_hist_DX_messages(token, tickers, num, t_time, from_times, candle_fields)
+
+        # Fetch data via WebSocket, decoding straight into typed column buffers
+        symbols = [sub['symbol'] for sub in messages['SUB']['add']]
+        from_map = {sub['symbol']: sub['fromTime'] for sub in messages['SUB']['add']}
+        tracker = CompletionTracker(symbols, quiet_period=quiet_period, from_time=from_map,
+                                    bar_ms=self._interval_ms(num, t_time))
+        buffer = CandleBuffer(candle_fields)
+        buffer = self._websocket_historical(link, messages, buffer, tracker, timeout=timeout)
+        return buffer, tracker
+
+    def _fetch_sharded(self, link: str, token: str, tickers: list, num: int, t_time: str, from_times,
+                       candle_fields: list, quiet_period: float, timeout: int, shard_size: int,
+                       concurrency: int, retries: int):
+        """
+        EN: Splits the tickers into shards fetched over parallel connections and merges the results.
+        ES: Divide los tickers en grupos descargados por conexiones en paralelo y une los resultados.
+
+        Shards whose symbols failed or timed out are fetched again (only those symbols), up to
+        `retries` times. Symbols that finished 'empty' or 'no_data' are not retried: the server
+        answered their connection and had nothing for them. Returns (raw Candle frame, {candle symbol: status}).
+        """
+        shard_size = max(1, int(shard_size))
+        pending = [tickers[i:i + shard_size] for i in range(0, len(tickers), shard_size)]
+        frames, report = {}, {}
+
+        def run(shard):
+            try:
+                return shard, self._fetch_candles(link, token, shard, num, t_time, from_times,
+                                                  candle_fields, quiet_period, timeout)
+            except Exception as e:
+                return shard, e
+
+        with ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(pending)))) as pool:
+            for attempt in range(retries + 1):
+                failed = []
+                for shard_id, (shard, result) in enumerate(pool.map(run, pending)):
+                    retry = self._merge_shard(shard, result, attempt, shard_id, num, t_time, frames, report)
+                    if retry:
+                        failed.append(retry)
+
+                if not failed:
+                    break
+                pending = failed
+
+        return self._merged_frames(frames), report
+
+    def _merge_shard(self, shard: list, result, attempt: int, shard_id: int, num: int, t_time: str,
+                     frames: dict, report: dict) -> list:
+        """
+        EN: Records one shard's (buffer, tracker) or exception. Returns the tickers to retry.
+        ES: Registra el (buffer, tracker) o la excepción de un grupo. Devuelve los tickers a reintentar.
+        """
+        if isinstance(result, Exception):
+            for tck in shard:
+                report[f"{tck}{{={num}{t_time}}}"] = {
+                    'complete': False, 'reason': 'error', 'error': str(result), 'rows': 0}
+            return list(shard)
+
+        buffer, tracker = result
+        frame = buffer.to_frame()
+        groups = {}
+        if not frame.empty:
+            groups = {str(k): g for k, g in frame.groupby('Ticker', observed=True, sort=False)}
+        retry = []
+        for sym, st in tracker.report().items():
+            st['attempts'] = attempt + 1
+            st['shard'] = shard_id
+            report[sym] = st
+            # The latest attempt replaces any partial data of a previous one
+            frames[sym] = groups.get(sym, frame.iloc[:0])
+            if not st['complete'] and st['reason'] != 'no_data':
+                retry.append(sym.split('{')[0])
+        return retry
+
+    def _merged_frames(self, frames: dict) -> pd.DataFrame:
+        import pandas as pd
+
+        parts = [f for f in frames.values() if not f.empty]
+        if not parts:
+            return pd.DataFrame()
+        fetched = pd.concat(parts, ignore_index=True)
+        fetched['Ticker'] = fetched['Ticker'].astype(str).astype('category')
+        return fetched
+
+    def _store_candles(self, store, interval: str, fetched: pd.DataFrame, gaps: dict,
+                       since: int, status: dict) -> pd.DataFrame:
+        """
+        EN: Merges the fetched bars into the store and returns the window [since, now] read back from it.
+        ES: Fusiona las velas recibidas en el almacén y devuelve la ventana [since, ahora] leída de él.
+        """
+        import pandas as pd
+
+        if not fetched.empty:
+            fetched = fetched.copy()
+            fetched['Ticker'] = fetched['Ticker'].astype(str).str.split('{').str[0]
+            for tck, bars in fetched.groupby('Ticker', sort=False):
+                # Gaps only count as verified when the refetch actually completed
+                checked = gaps.get(tck) if status.get(tck, {}).get('complete') else None
+                store.merge(tck, interval, bars, checked_gaps=checked)
+
+        frames = []
+        for tck in status:
+            bars = store.read(tck, interval, since=since)
+            status[tck]['stored_rows'] = len(bars)
+            if bars.empty:
+                continue
+            # Newest first, as DXLink delivers snapshots, so max_data keeps the latest bars
+            bars = bars.iloc[::-1]
+            bars.insert(0, 'Ticker', tck)
+            bars.insert(0, 'EventType', 'Candle')
+            frames.append(bars)
+
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+    def _interval_ms(self, num: int, t_time: str):
+        """Length of one bar in milliseconds (None for months, which are not fixed-length)."""
+        units = {'m': 60_000, 'h': 3_600_000, 'd': 86_400_000, 'w': 7 * 86_400_000}
+        if t_time not in units:
+            return None
+        return num * units[t_time]
+
+    def _historical_frames(self, df_new: pd.DataFrame, max_rows: int) -> dict:
+        """
+        EN: Cleans the raw Candle frame (ticker suffix, dates, trading hours) and splits it by ticker.
+        ES: Limpia el DataFrame de Candle (sufijo del ticker, fechas, horario) y lo divide por ticker.
+        """
+        import pandas as pd
+        from .candles import split_by_ticker
+        from .resample import session_mask
 
-        # FIX #7: Check for empty DataFrame before processing
         if df_new.empty:
             return {}
 
@@ -859,31 +1623,32 @@ class TastyTradeAPI:
             cad = tck.split('{')[0]
             return cad
 
-        def dividir_por_empresa(df, max_rows):
-            """Split DataFrame by ticker symbol into dictionary of DataFrames."""
-            diccionario_empresas = {}
-            for empresa in df['Ticker'].unique():
-                df_empresa = df[df['Ticker'] == empresa].copy()
-                df_empresa = df_empresa.drop(columns=['Ticker'])
-                df_empresa = df_empresa.head(max_rows)
-                diccionario_empresas[empresa] = df_empresa
-            return diccionario_empresas
-
-        df_new['Ticker'] = df_new['Ticker'].apply(treat_tck)
-        df_new['Time'] = df_new['Time'] / 1000
-        df_new['Date'] = pd.to_datetime(df_new['Time'], unit='s')
+        # Only the categories are rewritten, not every row
+        tickers = df_new['Ticker'].astype('category')
+        names = [treat_tck(c) for c in tickers.cat.categories]
+        if len(set(names)) == len(names):
+            df_new['Ticker'] = tickers.cat.rename_categories(names)
+        else:
+            df_new['Ticker'] = tickers.astype(str).map(treat_tck).astype('category')
+        df_new['Date'] = pd.to_datetime(df_new['Time'], unit='ms')
         df_new = df_new.drop(columns=['Time'])
 
-        # Filter for regular trading hours (9:30 AM - 4:00 PM ET, shown in UTC as ~14:30-21:00)
-        df_new = df_new[
-            ((df_new['Date'].dt.hour > 14) | ((df_new['Date'].dt.hour == 14) & (df_new['Date'].dt.minute >= 30))) &
-            (df_new['Date'].dt.hour < 21)
-        ]
+        # Filter for regular trading hours (9:30 AM - 4:00 PM ET, 13:30-20:00 or 14:30-21:00 UTC with DST)
+        df_new = df_new[session_mask(df_new['Date'].to_numpy())]
 
-        dicc = dividir_por_empresa(df_new, max_rows)
+        dicc = split_by_ticker(df_new, max_rows)
 
         return dicc
 
+    def historical_session(self, Client: dict, keepalive_interval: float = 30.0) -> HistoricalSession:
+        """
+        EN: Returns a HistoricalSession that reuses one authorized DXLink connection across fetches.
+        ES: Devuelve una HistoricalSession que reutiliza una conexión DXLink autorizada entre consultas.
+        """
+        from .historical import HistoricalSession
+
+        return HistoricalSession(self, Client, keepalive_interval=keepalive_interval)
+
     def values_from_data(self, interval: str, date) -> int:
         """
         EN: Calculates data points needed from start date to present based on interval.
@@ -919,44 +1684,237 @@ class TastyTradeAPI:
     # -------------------   REAL TIME DATA   ---------------------
 
     class RealTimeStreamer:
-        def __init__(self, client: dict, tickers: list, verbose: bool = False):
+        def __init__(self, client: dict, tickers: list, verbose: bool = False, api=None,
+                     batch_window: float = 0.05, reconnect: bool = True, keepalive_interval: float = 30.0,
+                     heartbeat_timeout: float = 60.0, backoff: tuple = (0.5, 30.0),
+                     connect_timeout: float = 10.0, record_to=None):
             """
-            EN: Initializes the RealTimeStreamer.
-            ES: Inicializa el RealTimeStreamer.
+            EN: Initializes the RealTimeStreamer. The DX token comes from the process-wide quote-token cache.
+            ES: Inicializa el RealTimeStreamer. El token de DX sale de la caché global de tokens.
+
+            Args:
+                batch_window: Seconds subscribe()/unsubscribe() changes are collected before being sent
+                reconnect: Reconnect (and resubscribe) automatically when the connection drops
+                keepalive_interval: Seconds between KEEPALIVE messages
+                heartbeat_timeout: Seconds without any message after which the connection is considered dead
+                backoff: (first, max) delay in seconds between reconnect attempts, doubled on each
+                    failure with random jitter
+                connect_timeout: Seconds start() waits for the connection to be authorized
+                record_to: Directory (or TickRecorder) where every received quote is recorded
             """
-            api_temp = TastyTradeAPI()
+            from .quotes import QuoteBoard
+            from .ticks import TickRecorder
+
+            api_temp = api if api is not None else TastyTradeAPI()
+            self.api = api_temp
+            self.client = client
 
-            self.dx_token = api_temp.DX_token(client)
-            self.messages = api_temp.DX_messages(self.dx_token, tickers)
-            self.link = api_temp.DX_link(client)
+            dx_vals = api_temp._quote_token(client)
+            self.dx_token = dx_vals['token']
+            self.messages = api_temp._DX_stream_messages(self.dx_token, tickers)
+            self.link = dx_vals['dxlink-url']
 
             self.verbose = verbose
-            self.data = {}
+            self.batch_window = batch_window
+            self.symbols = list(dict.fromkeys(tickers))
+            self._sub_lock = threading.Lock()
+            self._pending = {}
+            self._flush_timer = None
+            self._opened = False
+            self.board = QuoteBoard(tickers)
+            self._event_fields = {'Quote': list(QUOTE_FIELDS)}
+            self._dispatcher = None
             self.ws = None
             self.thread = None
 
-        def _treat_data(self, message_data):
+            self.reconnect = reconnect
+            self.keepalive_interval = keepalive_interval
+            self.heartbeat_timeout = heartbeat_timeout
+            self.backoff = backoff
+            self.connect_timeout = connect_timeout
+            self.state = 'idle'
+            self.reconnects = 0
+            self.recovery_times = []
+            self._state_callbacks = []
+            self._connected = threading.Event()
+            self._stopping = threading.Event()
+            self._supervisor = None
+            self._last_rx = time.monotonic()
+            self._auth_rejects = 0
+            self._down_since = None
+            self._opening = None
+
+            self._own_recorder = isinstance(record_to, str)
+            self.recorder = TickRecorder(record_to) if self._own_recorder else record_to
+
+        @property
+        def data(self) -> dict:
+            """Latest mid price per symbol, {symbol: (bid + ask) / 2}, read from the quote board."""
+            return self.board.mids()
+
+        def on(self, callback, symbols: list = None, event_types: list = None,
+               maxsize: int = 1024, policy: str = DROP_OLDEST) -> Subscription:
+            """
+            EN: Calls callback(event) for every event of the given symbols / event types, off the websocket thread.
+            ES: Llama a callback(event) por cada evento de los símbolos / tipos dados, fuera del hilo del websocket.
+
+            Each subscription has its own bounded queue (`maxsize`) and overflow `policy`:
+            'drop_oldest', 'conflate' (latest per symbol) or 'block'. 'block' makes the shared
+            dispatcher thread wait, stalling every subscription until this one has room (the
+            websocket is never blocked; see dispatcher_stats). Events are dicts keyed by the
+            DXLink fields, e.g. {'eventSymbol': 'AAPL', 'bidPrice': 238.0, ...}.
+            """
+            if self._dispatcher is None:
+                self._dispatcher = EventDispatcher()
+            return self._dispatcher.add(Subscription(callback, symbols=symbols, event_types=event_types,
+                                                     maxsize=maxsize, policy=policy))
+
+        def off(self, subscription: Subscription):
+            """
+            EN: Removes a subscription created with on().
+            ES: Elimina una suscripción creada con on().
+            """
+            if self._dispatcher is not None:
+                self._dispatcher.remove(subscription)
+
+        def subscriber_stats(self) -> list:
+            """Per-subscription counters: received, delivered, dropped, errors, lag, max_lag, last_latency."""
+            return self._dispatcher.stats() if self._dispatcher is not None else []
+
+        def dispatcher_stats(self) -> dict:
+            """Inbox of the dispatcher: batches routed, pending, max_pending and dropped (None before on())."""
+            return self._dispatcher.inbox_stats() if self._dispatcher is not None else None
+
+        # -------------------   LIVE SUBSCRIPTION CHANGES   -------------------
+
+        def subscribe(self, symbols: list):
+            """
+            EN: Adds symbols to the running stream (sent together with other changes of the batch window).
+            ES: Añade símbolos al stream en marcha (se envían junto al resto de cambios de la ventana).
+            """
+            self._change(symbols, True)
+
+        def unsubscribe(self, symbols: list):
+            """
+            EN: Removes symbols from the running stream; their quotes are cleared from the board.
+            ES: Quita símbolos del stream en marcha; sus cotizaciones se borran del tablero.
+            """
+            self._change(symbols, False)
+
+        def _change(self, symbols: list, add: bool):
+            if isinstance(symbols, str):
+                symbols = [symbols]
+            with self._sub_lock:
+                current = dict.fromkeys(self.symbols)
+                for symbol in symbols:
+                    if add and symbol not in current:
+                        current[symbol] = None
+                    elif not add and symbol in current:
+                        del current[symbol]
+                    else:
+                        continue
+                    # An add and a remove of the same symbol inside one window cancel out
+                    if self._pending.get(symbol) == (not add):
+                        del self._pending[symbol]
+                    else:
+                        self._pending[symbol] = add
+                self.symbols = list(current)
+
+                if not self._opened:
+                    # Not connected yet: the full list is sent on open
+                    self.board.reset([s for s, a in self._pending.items() if not a])
+                    self._pending.clear()
+                elif self._pending and self._flush_timer is None:
+                    self._flush_timer = threading.Timer(self.batch_window, self.flush)
+                    self._flush_timer.daemon = True
+                    self._flush_timer.start()
+
+        def flush(self):
+            """
+            EN: Sends the pending subscription changes now as a single FEED_SUBSCRIPTION message.
+            ES: Envía ya los cambios de suscripción pendientes en un único mensaje FEED_SUBSCRIPTION.
+            """
+            with self._sub_lock:
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+                pending, self._pending = self._pending, {}
+                removed = [s for s, a in pending.items() if not a]
+                if pending and self._opened:
+                    message = self.api._DX_subscription(add=[s for s, a in pending.items() if a], remove=removed)
+                    try:
+                        self.ws.send(json.dumps(message))
+                    except Exception as e:
+                        print("Error sending subscription -->", e)
+            self.board.reset(removed)
+
+        def _treat_config(self, message_data):
+            # Server-confirmed field order for COMPACT arrays
+            event_fields = message_data.get("eventFields") or {}
+            self._event_fields.update(event_fields)
+            if event_fields.get("Quote"):
+                self.board.set_fields(event_fields["Quote"])
+
+        def _treat_data(self, message_data) -> int:
+            """Decodes one FEED_DATA message. Returns the number of events it carried."""
+            events = 0
             try:
                 data_block = message_data.get("data", [])
-                if isinstance(data_block, list) and len(data_block) > 1:
+                # COMPACT format: ["Quote", [eventType, symbol, bidPrice, askPrice, ..., eventType, symbol, ...]]
+                if isinstance(data_block, list) and len(data_block) > 1 and isinstance(data_block[1], list):
                     event_type = data_block[0]
-                    values = data_block[1]
-                    # COMPACT format: values come in order specified in acceptEventFields
-                    # For Quote with ["eventType", "eventSymbol", "bidPrice", "askPrice"]
-                    # Data: [eventType, symbol, bidPrice, askPrice, eventType, symbol, ...]
-                    if event_type == "Quote" and isinstance(values, list):
-                        # 4 fields per quote
-                        for i in range(0, len(values), 4):
-                            if i + 3 < len(values):
-                                symbol = values[i + 1]
-                                bid = values[i + 2]
-                                ask = values[i + 3]
-                                if bid is not None and ask is not None:
-                                    self.data[symbol] = (float(bid) + float(ask)) / 2
+                    if event_type == "Quote":
+                        events = self.board.add(data_block[1])
+                        if self.recorder is not None:
+                            self.recorder.add(self.board.fields, data_block[1])
+                    else:
+                        fields = self._event_fields.get(event_type)
+                        events = len(data_block[1]) // len(fields) if fields else 0
+                    if self._dispatcher is not None:
+                        self._dispatcher.publish(event_type, self._event_fields.get(event_type), data_block[1])
             except Exception as e:
                 print("Error processing ws response -->", e)
+            return events
+
+        # -------------------   CONNECTION STATE   -------------------
+
+        def on_state(self, callback):
+            """
+            EN: Calls callback(state, stats) on every connection state change.
+            ES: Llama a callback(state, stats) en cada cambio de estado de la conexión.
+
+            States: 'connecting', 'connected', 'disconnected', 'reconnecting', 'stopped'.
+            """
+            self._state_callbacks.append(callback)
+            return callback
+
+        def _set_state(self, state: str):
+            if state == self.state:
+                return
+            self.state = state
+            if self.verbose:
+                print("-->State", state)
+            stats = self.connection_stats()
+            for callback in list(self._state_callbacks):
+                try:
+                    callback(state, stats)
+                except Exception as e:
+                    print("State callback error -->", e)
+
+        def connection_stats(self) -> dict:
+            """State, reconnect count, time-to-recover of the last outage and seconds since the last message."""
+            return {
+                'state': self.state,
+                'reconnects': self.reconnects,
+                'last_recovery': self.recovery_times[-1] if self.recovery_times else None,
+                'recovery_times': list(self.recovery_times),
+                'last_message_age': round(time.monotonic() - self._last_rx, 4),
+            }
 
         def _on_message(self, ws, message):
+            self._last_rx = time.monotonic()
+            metrics = self.api.metrics
+            started = time.perf_counter() if metrics.enabled else None
             if self.verbose:
                 print("Message received -->", message)
 
@@ -965,13 +1923,38 @@ class TastyTradeAPI:
             except Exception:
                 return
 
-            if msg.get("type") == "FEED_DATA":
-                self._treat_data(msg)
+            msg_type = msg.get("type")
+            if msg_type == "FEED_DATA":
+                events = self._treat_data(msg)
+                if started is not None:
+                    metrics.message('streamer', events, time.perf_counter() - started)
+                    data_block = msg.get("data")
+                    if events and data_block[0] == "Quote":
+                        metrics.quotes(self.board.fields, data_block[1])
+                return
+
+            if started is not None:
+                metrics.message('streamer', 0, time.perf_counter() - started)
+            if msg_type == "FEED_CONFIG":
+                self._treat_config(msg)
+            elif msg_type == "AUTH_STATE" and msg.get("state") == "UNAUTHORIZED":
+                self._auth_rejects += 1
+            elif msg_type == "AUTH_STATE" and msg.get("state") == "AUTHORIZED":
+                if self._down_since is not None:
+                    self.recovery_times.append(round(time.monotonic() - self._down_since, 4))
+                    self._down_since = None
+                if started is not None and self._opening is not None:
+                    metrics.handshake('streamer', time.perf_counter() - self._opening)
+                self._opening = None
+                self._connected.set()
+                self._set_state('connected')
 
         def _on_error(self, ws, error):
             print("Error -->", error)
 
         def _on_close(self, ws, *args):
+            self._opened = False
+            self._connected.clear()
             if self.verbose:
                 print("-->Connection closed")
 
@@ -983,9 +1966,69 @@ class TastyTradeAPI:
             ws.send(json.dumps(self.messages["AUTH"]))
             ws.send(json.dumps(self.messages["CHANNEL"]))
             ws.send(json.dumps(self.messages["FEED"]))
-            ws.send(json.dumps(self.messages["SUB"]))
+
+            with self._sub_lock:
+                self._pending.clear()
+                self.messages["SUB"] = self.api._DX_subscription(add=self.symbols, reset=True)
+                ws.send(json.dumps(self.messages["SUB"]))
+                self._opened = True
 
         def start(self):
+            """
+            EN: Starts the supervised connection and waits (up to connect_timeout) until it is authorized.
+            ES: Arranca la conexión supervisada y espera (hasta connect_timeout) a que esté autorizada.
+            """
+            self._stopping.clear()
+            self._supervisor = threading.Thread(target=self._supervise, daemon=True)
+            self._supervisor.start()
+            self._connected.wait(self.connect_timeout)
+            return self
+
+        def _supervise(self):
+            """Keeps one connection alive: keepalives, dead-connection detection and jittered reconnects."""
+            attempt = 0
+            refresh = False
+            while not self._stopping.is_set():
+                self._set_state('connecting' if attempt == 0 and self.reconnects == 0 else 'reconnecting')
+                try:
+                    authorized, rejected = self._run_connection(refresh)
+                except Exception as e:
+                    print("Connection error -->", e)
+                    authorized, rejected = False, False
+
+                if self._stopping.is_set():
+                    break
+                if self._down_since is None:
+                    self._down_since = time.monotonic()
+                self._set_state('disconnected')
+                if not self.reconnect:
+                    break
+
+                # The cached quote token is reused unless the server rejected it
+                refresh = rejected
+                attempt = 0 if authorized else attempt + 1
+                first, top = self.backoff
+                delay = min(top, first * (2 ** attempt)) * random.uniform(0.5, 1.0)
+                if self._stopping.wait(delay):
+                    break
+                self.reconnects += 1
+
+            self._set_state('stopped')
+
+        def _run_connection(self, refresh: bool) -> tuple:
+            """Runs one websocket until it closes or goes silent. Returns (authorized, token rejected)."""
+            import websocket
+
+            dx_vals = self.api._quote_token(self.client, refresh=refresh)
+            if dx_vals['token'] != self.dx_token or dx_vals['dxlink-url'] != self.link:
+                self.dx_token = dx_vals['token']
+                self.link = dx_vals['dxlink-url']
+                self.messages = self.api._DX_stream_messages(self.dx_token, self.symbols)
+
+            self._connected.clear()
+            self._auth_rejects = 0
+            self._last_rx = time.monotonic()
+            self._opening = time.perf_counter()
             self.ws = websocket.WebSocketApp(
                 self.link,
                 on_open=self._on_open,
@@ -993,16 +2036,52 @@ class TastyTradeAPI:
                 on_error=self._on_error,
                 on_close=self._on_close
             )
-            self.thread = threading.Thread(target=self.ws.run_forever, daemon=True)
+            self.thread = threading.Thread(target=self.ws.run_forever, kwargs=RUN_OPTIONS, daemon=True)
             self.thread.start()
-            time.sleep(1)
-            return self
+
+            authorized = False
+            last_keep = time.monotonic()
+            tick = max(0.05, min(1.0, self.keepalive_interval / 2, self.heartbeat_timeout / 4))
+            while self.thread.is_alive() and not self._stopping.wait(tick):
+                now = time.monotonic()
+                authorized = authorized or self._connected.is_set()
+                if now - self._last_rx > self.heartbeat_timeout:
+                    if self.verbose:
+                        print("-->No heartbeat, closing connection")
+                    break
+                if self._connected.is_set() and now - last_keep >= self.keepalive_interval:
+                    last_keep = now
+                    try:
+                        self.ws.send(json.dumps(self.messages["KEEP"]))
+                    except Exception:
+                        break
+
+            authorized = authorized or self._connected.is_set()
+            self._opened = False
+            self._connected.clear()
+            close_websocket(self.ws, self.thread)
+            # DXLink sends UNAUTHORIZED once before AUTH is processed; a second one means the token was refused
+            return authorized, not authorized and self._auth_rejects > 1
 
         def stop(self):
-            if self.ws:
-                self.ws.close()
-            if self.thread:
-                self.thread.join()
+            self._stopping.set()
+            with self._sub_lock:
+                self._opened = False
+                if self._flush_timer is not None:
+                    self._flush_timer.cancel()
+                    self._flush_timer = None
+            if self._supervisor is not None and self._supervisor is not threading.current_thread():
+                self._supervisor.join(timeout=10)
+            else:
+                close_websocket(self.ws, self.thread)
+            if self._dispatcher is not None:
+                self._dispatcher.close()
+                self._dispatcher = None
+            if self.recorder is not None:
+                if self._own_recorder:
+                    self.recorder.close()
+                else:
+                    self.recorder.flush()
 
             if self.verbose:
                 print("-->Streamer stopped")
@@ -0,0 +1,329 @@
+from array import array
+from collections import Counter
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .dxlink import _to_flags, _to_float, _to_time
+
+
+# DXLink field -> DataFrame column
+CANDLE_COLUMNS = {
+    'eventType': 'EventType',
+    'eventSymbol': 'Ticker',
+    'time': 'Time',
+    'open': 'Open',
+    'high': 'High',
+    'low': 'Low',
+    'close': 'Close',
+    'volume': 'Volume'
+}
+
+VALUE_FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+# DXFeed eventFlags bits used by Candle snapshots
+TX_PENDING = 0x01
+REMOVE_EVENT = 0x02
+SNAPSHOT_BEGIN = 0x04
+SNAPSHOT_END = 0x08
+SNAPSHOT_SNIP = 0x10
+
+
+class CandleBuffer:
+    """
+    EN: Typed column buffers that decode COMPACT Candle FEED_DATA arrays without building row objects.
+    ES: Buffers de columnas tipadas que decodifican arrays COMPACT de Candle sin crear filas.
+
+    Time is kept as int64 (epoch ms), OHLCV as float64 and the symbol as integer codes
+    over a category table, so the DataFrame is built once at the end.
+
+    Args:
+        fields: DXLink Candle fields in the order the server sends them
+    """
+
+    def __init__(self, fields: list):
+        self._codes = {}
+        self.categories = []
+        self.symbol_codes = array('i')
+        self.times = array('q')
+        self.flags = array('i')
+        self.values = {}
+        self.event_type = 'Candle'
+        self.set_fields(fields)
+
+    def set_fields(self, fields: list):
+        """
+        EN: Sets the field layout (e.g. the one confirmed by FEED_CONFIG). Only valid before data arrives.
+        ES: Fija el orden de los campos (p. ej. el confirmado por FEED_CONFIG). Solo antes de recibir datos.
+        """
+        if len(self) > 0 and list(fields) != self.fields:
+            raise Exception("Candle fields cannot change once data has been received")
+
+        self.fields = list(fields)
+        self.width = len(self.fields)
+        self._sym_pos = self.fields.index('eventSymbol')
+        self._time_pos = self.fields.index('time')
+        self._flags_pos = self.fields.index('eventFlags') if 'eventFlags' in self.fields else None
+        self._value_pos = {f: self.fields.index(f) for f in VALUE_FIELDS if f in self.fields}
+        for f in self._value_pos:
+            self.values.setdefault(f, array('d'))
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    def _code(self, symbol) -> int:
+        code = self._codes.get(symbol)
+        if code is None:
+            code = len(self.categories)
+            self._codes[symbol] = code
+            self.categories.append(symbol)
+        return code
+
+    def add(self, data_array: list, tracker=None) -> int:
+        """
+        EN: Appends a flat COMPACT data array ([f0, f1, ..., f0, f1, ...]). Returns the number of rows added.
+        ES: Añade un array COMPACT plano ([f0, f1, ..., f0, f1, ...]). Devuelve el número de filas añadidas.
+
+        If a CompletionTracker is given, it is told which symbols, times and flags arrived.
+        """
+        if not data_array or not isinstance(data_array, list):
+            return 0
+
+        width = self.width
+        n_rows = len(data_array) // width
+        if n_rows == 0:
+            return 0
+        end = n_rows * width
+
+        code = self._code
+        symbols = data_array[self._sym_pos:end:width]
+        # Plain int() first (the hot path); a malformed value ('NaN', ...) only costs a second pass
+        raw_times = data_array[self._time_pos:end:width]
+        try:
+            times = [int(t) if t is not None else 0 for t in raw_times]
+        except (TypeError, ValueError, OverflowError):
+            times = [_to_time(t) for t in raw_times]
+        if self._flags_pos is not None:
+            raw_flags = data_array[self._flags_pos:end:width]
+            try:
+                flags = [int(f) if f else 0 for f in raw_flags]
+            except (TypeError, ValueError, OverflowError):
+                flags = [_to_flags(f) for f in raw_flags]
+        else:
+            flags = [0] * n_rows
+
+        self.symbol_codes.extend([code(s) for s in symbols])
+        self.times.extend(times)
+        self.flags.extend(flags)
+        for f, pos in self._value_pos.items():
+            self.values[f].extend([_to_float(v) for v in data_array[pos:end:width]])
+
+        if tracker is not None:
+            tracker.update(symbols, times, flags)
+
+        return n_rows
+
+    def column_names(self) -> list:
+        return [CANDLE_COLUMNS[f] for f in self.fields if f in CANDLE_COLUMNS]
+
+    def to_frame(self) -> pd.DataFrame:
+        """
+        EN: Builds the DataFrame once from the column buffers (Ticker is categorical, Time int64 ms).
+        ES: Construye el DataFrame una sola vez desde los buffers (Ticker categórico, Time int64 ms).
+        """
+        n = len(self)
+        codes = np.frombuffer(self.symbol_codes, dtype=np.int32) if n else np.empty(0, dtype=np.int32)
+
+        # Events flagged REMOVE_EVENT (e.g. the placeholder of an empty snapshot) are not bars
+        keep = None
+        if n and self._flags_pos is not None:
+            flags = np.frombuffer(self.flags, dtype=np.int32)
+            removed = (flags & REMOVE_EVENT) != 0
+            if removed.any():
+                keep = ~removed
+
+        columns = {}
+        for f in self.fields:
+            if f == 'eventType':
+                columns['EventType'] = pd.Categorical.from_codes(np.zeros(n, dtype=np.int8),
+                                                                 categories=[self.event_type])
+            elif f == 'eventSymbol':
+                columns['Ticker'] = pd.Categorical.from_codes(codes, categories=list(self.categories))
+            elif f == 'time':
+                columns['Time'] = np.frombuffer(self.times, dtype=np.int64) if n else np.empty(0, dtype=np.int64)
+            elif f in self.values:
+                buf = self.values[f]
+                columns[CANDLE_COLUMNS[f]] = np.frombuffer(buf, dtype=np.float64) if n else np.empty(0)
+
+        df = pd.DataFrame(columns)
+        if keep is not None:
+            df = df[keep].reset_index(drop=True)
+        return df
+
+
+class CompletionTracker:
+    """
+    EN: Tracks, per subscribed Candle symbol, when its historical snapshot is complete.
+    ES: Controla, por cada símbolo Candle suscrito, cuándo su snapshot histórico está completo.
+
+    A symbol is done when:
+        - 'snapshot': DXLink flags the end of its snapshot (SNAPSHOT_END / SNAPSHOT_SNIP)
+        - 'current_bar': its bars cover the requested window up to the bar in progress
+        - 'quiet': it delivered data and then stayed idle for quiet_period seconds
+        - 'empty': the server has no bars for it (an empty snapshot: a REMOVE_EVENT placeholder
+          flagging its begin / end)
+    A symbol that sent nothing while the others of its connection finished and the connection
+    stayed idle for quiet_period stops waiting as 'no_data' (incomplete, but the server answered
+    the connection, so it is not worth a retry); symbols still pending when the overall timeout
+    hits are marked 'timeout'.
+
+    Args:
+        symbols: Candle symbols subscribed (e.g. 'AAPL{=5m}')
+        quiet_period: Idle seconds after the last batch that count as completion
+        from_time: Requested fromTime (epoch ms, or {symbol: ms}), used by the 'current_bar' rule
+        bar_ms: Bar length in ms, used by the 'current_bar' rule
+    """
+
+    def __init__(self, symbols: list, quiet_period: float = 1.0, from_time: int = None, bar_ms: int = None):
+        self.quiet_period = quiet_period
+        self.from_time = from_time
+        self.bar_ms = bar_ms
+        self.started = time.monotonic()
+        self.closed = False
+        # monotonic time of the last batch of any symbol of the connection
+        self._last_batch = None
+        self._changed = threading.Event()
+        self._lock = threading.Lock()
+        self.status = {
+            sym: {'complete': False, 'reason': None, 'rows': 0, 'first_data': None, 'elapsed': None,
+                  '_symbol': sym, '_last': None, '_min_time': None, '_max_time': None}
+            for sym in symbols
+        }
+
+    def subscribed(self):
+        """Restarts the clock when the subscription is actually sent, so timings exclude the handshake."""
+        self.started = time.monotonic()
+
+    def _finish(self, entry: dict, reason: str, now: float):
+        entry['complete'] = reason not in ('timeout', 'closed', 'no_data')
+        entry['reason'] = reason
+        entry['elapsed'] = round(now - self.started, 4)
+
+    def update(self, symbols: list, times: list, flags: list):
+        """Registers one decoded FEED_DATA batch (parallel lists of symbols, times and flags)."""
+        now = time.monotonic()
+        counts = Counter(symbols)
+        ended = {symbols[i] for i, f in enumerate(flags) if f & (SNAPSHOT_END | SNAPSHOT_SNIP)}
+        removed = Counter(symbols[i] for i, f in enumerate(flags) if f & REMOVE_EVENT)
+        # An empty snapshot is a single placeholder flagged SNAPSHOT_BEGIN | REMOVE_EVENT (| SNAPSHOT_END)
+        placeholders = {symbols[i] for i, f in enumerate(flags)
+                        if f & SNAPSHOT_BEGIN and f & REMOVE_EVENT}
+
+        with self._lock:
+            self._last_batch = now
+            for sym, n in counts.items():
+                entry = self.status.get(sym)
+                if entry is None:
+                    continue
+                entry['rows'] += n - removed.get(sym, 0)
+                entry['_last'] = now
+                if entry['first_data'] is None:
+                    entry['first_data'] = round(now - self.started, 4)
+
+                sym_times = [t for s, t in zip(symbols, times) if s == sym] if len(counts) > 1 else times
+                lo, hi = min(sym_times), max(sym_times)
+                entry['_min_time'] = lo if entry['_min_time'] is None else min(entry['_min_time'], lo)
+                entry['_max_time'] = hi if entry['_max_time'] is None else max(entry['_max_time'], hi)
+
+                if entry['reason'] is not None:
+                    continue
+                if entry['rows'] == 0 and (sym in ended or sym in placeholders):
+                    self._finish(entry, 'empty', now)
+                elif sym in ended:
+                    self._finish(entry, 'snapshot', now)
+                elif self._covers_current_bar(entry):
+                    self._finish(entry, 'current_bar', now)
+
+        self._changed.set()
+
+    def _covers_current_bar(self, entry: dict) -> bool:
+        from_time = self.from_time.get(entry['_symbol']) if isinstance(self.from_time, dict) else self.from_time
+        if from_time is None or not self.bar_ms:
+            return False
+        current_bar = int(time.time() * 1000) // self.bar_ms * self.bar_ms
+        return entry['_max_time'] >= current_bar and entry['_min_time'] <= from_time + self.bar_ms
+
+    def close(self):
+        """Marks the connection as closed, releasing any waiter."""
+        self.closed = True
+        self._changed.set()
+
+    def done(self) -> bool:
+        with self._lock:
+            return all(e['reason'] is not None for e in self.status.values())
+
+    def _check_quiet(self, now: float):
+        with self._lock:
+            # The server answered other symbols and then went idle: the silent ones are not coming
+            idle = self._last_batch is not None and now - self._last_batch >= self.quiet_period \
+                and any(e['complete'] for e in self.status.values())
+            for entry in self.status.values():
+                if entry['reason'] is not None:
+                    continue
+                if entry['_last'] is not None and now - entry['_last'] >= self.quiet_period:
+                    self._finish(entry, 'quiet', now)
+                elif entry['_last'] is None and idle:
+                    self._finish(entry, 'no_data', now)
+
+    def poll(self, deadline: float) -> bool:
+        """
+        EN: Applies the quiet-period rule and tells whether waiting can stop (all done, closed or past deadline).
+        ES: Aplica la regla del periodo de inactividad e indica si se puede dejar de esperar.
+        """
+        now = time.monotonic()
+        self._check_quiet(now)
+        return self.done() or self.closed or now >= deadline
+
+    def finish(self) -> bool:
+        """Marks every pending symbol as 'closed' or 'timeout'. Returns True if all completed."""
+        now = time.monotonic()
+        with self._lock:
+            for entry in self.status.values():
+                if entry['reason'] is None:
+                    self._finish(entry, 'closed' if self.closed else 'timeout', now)
+            return all(e['complete'] for e in self.status.values())
+
+    def wait(self, timeout: float) -> bool:
+        """
+        EN: Blocks until every symbol is done, the connection closes or the timeout expires.
+        ES: Bloquea hasta que todos los símbolos terminen, se cierre la conexión o expire el timeout.
+        """
+        deadline = self.started + timeout
+        while not self.poll(deadline):
+            self._changed.clear()
+            self._changed.wait(max(0.0, min(self.quiet_period / 4, deadline - time.monotonic())))
+        return self.finish()
+
+    def report(self) -> dict:
+        """Public per-symbol status (without internal bookkeeping fields)."""
+        with self._lock:
+            return {sym: {k: v for k, v in e.items() if not k.startswith('_')} for sym, e in self.status.items()}
+
+
+def split_by_ticker(df: pd.DataFrame, max_rows: int = None) -> dict:
+    """
+    EN: Splits a frame by its 'Ticker' column in a single grouped pass.
+    ES: Divide un DataFrame por su columna 'Ticker' en una sola pasada agrupada.
+    """
+    if df.empty:
+        return {}
+
+    result = {}
+    for ticker, group in df.groupby('Ticker', observed=True, sort=False):
+        group = group.drop(columns=['Ticker'])
+        if max_rows is not None:
+            group = group.head(max_rows)
+        result[str(ticker)] = group
+    return result
@@ -0,0 +1,262 @@
+from collections import OrderedDict, deque
+import threading
+import time
+
+
+# Overflow policies of a Subscription queue
+DROP_OLDEST = 'drop_oldest'
+CONFLATE = 'conflate'
+BLOCK = 'block'
+POLICIES = (DROP_OLDEST, CONFLATE, BLOCK)
+
+# FEED_DATA batches the dispatcher inbox holds before it drops the oldest
+INBOX_SIZE = 4096
+
+
+class Subscription:
+    """
+    EN: Callback fed from its own bounded queue and worker thread.
+    ES: Callback alimentado desde su propia cola acotada y su hilo de trabajo.
+
+    Events are dicts keyed by the DXLink field names of the event type (e.g. 'eventSymbol',
+    'bidPrice', 'askPrice' for Quote). When the queue is full:
+        - 'drop_oldest': the oldest queued event is discarded
+        - 'conflate': only the latest event per (type, symbol) is kept, older ones are replaced
+        - 'block': the dispatcher thread waits for room. That stalls routing for every
+          subscription of the dispatcher, not only this one; the websocket thread keeps going
+          and the dispatcher inbox fills up meanwhile, dropping its oldest batches once full
+          (see EventDispatcher.inbox_stats). Use it only when every subscriber is fast
+
+    Args:
+        callback: Called as callback(event) on the subscription thread
+        symbols: Only events of these symbols (None = all)
+        event_types: Only these event types, e.g. ['Quote'] (None = all)
+        maxsize: Maximum number of queued events
+        policy: 'drop_oldest', 'conflate' or 'block'
+    """
+
+    def __init__(self, callback, symbols: list = None, event_types: list = None,
+                 maxsize: int = 1024, policy: str = DROP_OLDEST):
+        if policy not in POLICIES:
+            raise ValueError(f"Unsupported overflow policy: {policy}, try: {', '.join(POLICIES)}")
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.callback = callback
+        self.symbols = set(symbols) if symbols is not None else None
+        self.event_types = set(event_types) if event_types is not None else None
+        self.maxsize = int(maxsize)
+        self.policy = policy
+
+        self._queue = OrderedDict() if policy == CONFLATE else deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self.received = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self.max_lag = 0
+        self.last_latency = None
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def matches(self, event_type: str, symbol: str) -> bool:
+        return (self.event_types is None or event_type in self.event_types) and \
+               (self.symbols is None or symbol in self.symbols)
+
+    @property
+    def lag(self) -> int:
+        """Events queued and not yet delivered."""
+        return len(self._queue)
+
+    def put(self, event: dict, received_at: float):
+        """Queues one event, applying the overflow policy."""
+        with self._cond:
+            if self._closed:
+                return
+            self.received += 1
+            queue = self._queue
+
+            if self.policy == CONFLATE:
+                key = (event.get('eventType'), event.get('eventSymbol'))
+                if key in queue:
+                    self.dropped += 1
+                elif len(queue) >= self.maxsize:
+                    queue.popitem(last=False)
+                    self.dropped += 1
+                queue[key] = (event, received_at)
+            else:
+                if len(queue) >= self.maxsize:
+                    if self.policy == DROP_OLDEST:
+                        queue.popleft()
+                        self.dropped += 1
+                    else:
+                        while len(queue) >= self.maxsize and not self._closed:
+                            self._cond.wait()
+                        if self._closed:
+                            return
+                queue.append((event, received_at))
+
+            self.max_lag = max(self.max_lag, len(queue))
+            self._cond.notify_all()
+
+    def _pop(self):
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            if not self._queue:
+                return None
+            if self.policy == CONFLATE:
+                item = self._queue.popitem(last=False)[1]
+            else:
+                item = self._queue.popleft()
+            self._cond.notify_all()
+            return item
+
+    def _run(self):
+        while True:
+            item = self._pop()
+            if item is None:
+                return
+            event, received_at = item
+            self.last_latency = time.time() - received_at
+            try:
+                self.callback(event)
+            except Exception as e:
+                self.errors += 1
+                print("Subscriber callback error -->", e)
+            self.delivered += 1
+
+    def close(self, timeout: float = 1.0):
+        """Stops the subscription (events still queued are discarded)."""
+        with self._cond:
+            self._closed = True
+            self._queue.clear()
+            self._cond.notify_all()
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        return {
+            'policy': self.policy,
+            'received': self.received,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'lag': self.lag,
+            'max_lag': self.max_lag,
+            'last_latency': self.last_latency,
+        }
+
+
+class EventDispatcher:
+    """
+    EN: Fans raw FEED_DATA batches out to the subscriptions on a thread of its own.
+    ES: Reparte los lotes FEED_DATA a las suscripciones desde un hilo propio.
+
+    publish() only appends the batch to an inbox, so the websocket thread never waits for a
+    subscriber; decoding into event dicts and routing happen on the dispatcher thread. The
+    inbox is bounded (`maxsize` batches): if the dispatcher falls behind, e.g. waiting on a
+    'block' subscription, the oldest batches are dropped and counted in inbox_stats().
+
+    Args:
+        maxsize: Maximum number of batches waiting to be routed
+    """
+
+    def __init__(self, maxsize: int = INBOX_SIZE):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = int(maxsize)
+        # A full deque with maxlen discards its oldest item on append, atomically
+        self._inbox = deque(maxlen=self.maxsize)
+        self._wake = threading.Event()
+        self._lock = threading.Lock()
+        self._subs = []
+        self._closed = False
+        self.batches = 0
+        self.dropped = 0
+        self.max_pending = 0
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def add(self, sub: Subscription) -> Subscription:
+        with self._lock:
+            self._subs = self._subs + [sub]
+        return sub
+
+    def remove(self, sub: Subscription):
+        with self._lock:
+            self._subs = [s for s in self._subs if s is not sub]
+        sub.close()
+
+    def __len__(self) -> int:
+        return len(self._subs)
+
+    @property
+    def pending(self) -> int:
+        """Batches received from the websocket and not yet routed."""
+        return len(self._inbox)
+
+    def publish(self, event_type: str, fields: list, values: list, received_at: float = None):
+        """Hands over one COMPACT batch (event type, field layout, flat values)."""
+        if self._closed or not self._subs:
+            return
+        inbox = self._inbox
+        if len(inbox) >= self.maxsize:
+            self.dropped += 1
+        inbox.append((event_type, fields, values, received_at or time.time()))
+        if len(inbox) > self.max_pending:
+            self.max_pending = len(inbox)
+        self._wake.set()
+
+    def _route(self, event_type: str, fields: list, values: list, received_at: float):
+        subs = [s for s in self._subs if s.event_types is None or event_type in s.event_types]
+        if not subs or not fields:
+            return
+        width = len(fields)
+        sym_pos = fields.index('eventSymbol') if 'eventSymbol' in fields else None
+        for base in range(0, len(values) - width + 1, width):
+            symbol = values[base + sym_pos] if sym_pos is not None else None
+            targets = [s for s in subs if s.symbols is None or symbol in s.symbols]
+            if targets:
+                event = dict(zip(fields, values[base:base + width]))
+                for sub in targets:
+                    sub.put(event, received_at)
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait()
+            self._wake.clear()
+            while self._inbox:
+                batch = self._inbox.popleft()
+                self.batches += 1
+                try:
+                    self._route(*batch)
+                except Exception as e:
+                    print("Dispatcher error -->", e)
+
+    def close(self, timeout: float = 1.0):
+        """Stops the dispatcher and every subscription."""
+        self._closed = True
+        self._wake.set()
+        with self._lock:
+            subs, self._subs = self._subs, []
+        for sub in subs:
+            sub.close(timeout)
+        if self._thread is not threading.current_thread():
+            self._thread.join(timeout)
+
+    def stats(self) -> list:
+        return [sub.stats() for sub in self._subs]
+
+    def inbox_stats(self) -> dict:
+        """Batches routed, waiting (pending, max_pending) and dropped because the inbox was full."""
+        return {
+            'maxsize': self.maxsize,
+            'batches': self.batches,
+            'pending': self.pending,
+            'max_pending': self.max_pending,
+            'dropped': self.dropped,
+        }
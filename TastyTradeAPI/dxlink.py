@@ -0,0 +1,67 @@
+import math
+import threading
+
+
+# run_forever() options of every DXLink socket. websocket-client validates the UTF-8 of each
+# text frame in pure Python unless wsaccel is installed, which costs more than parsing the JSON;
+# DXLink only sends JSON, which json.loads decodes (and rejects) on its own.
+RUN_OPTIONS = {'skip_utf8_validation': True}
+
+# DXLink Quote fields requested by RealTimeStreamer (order matters for COMPACT format)
+QUOTE_FIELDS = ['eventType', 'eventSymbol', 'bidPrice', 'askPrice', 'bidSize', 'askSize', 'bidTime', 'askTime']
+
+
+# Field converters of COMPACT arrays, shared by the candle, quote and tick decoders. They live
+# here rather than in candles so the streaming modules do not import pandas
+def _to_float(val) -> float:
+    if val is None:
+        return math.nan
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _to_time(val) -> int:
+    """Epoch ms of a time field; 0 for missing or malformed values ('NaN', None, ...)."""
+    try:
+        return int(val or 0)
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+
+def _to_flags(val) -> int:
+    """eventFlags bit mask; 0 for missing or malformed values."""
+    try:
+        return int(val or 0)
+    except (TypeError, ValueError, OverflowError):
+        return 0
+
+
+def close_websocket(ws, thread: threading.Thread = None, timeout: float = 5.0):
+    """
+    EN: Closes a WebSocketApp running in `thread` and waits for the thread to finish.
+    ES: Cierra un WebSocketApp que corre en `thread` y espera a que el hilo termine.
+
+    WebSocketApp.close() called from another thread reads the server's close reply itself,
+    which leaves run_forever blocked in select() until the join times out. Sending only the
+    close frame lets the websocket thread receive the reply and tear down on its own.
+    """
+    if ws is None:
+        return
+
+    ws.keep_running = False
+    sock = getattr(ws, 'sock', None)
+    try:
+        if sock is not None and sock.connected:
+            sock.send_close()
+    except Exception:
+        pass
+
+    if thread is not None and thread is not threading.current_thread():
+        thread.join(timeout=timeout / 2)
+        if thread.is_alive():
+            ws.close()
+            thread.join(timeout=timeout / 2)
+    else:
+        ws.close()
@@ -0,0 +1,246 @@
+import json
+import threading
+import time
+
+import pandas as pd
+import websocket
+
+from .candles import CandleBuffer, CompletionTracker
+from .dxlink import RUN_OPTIONS, close_websocket
+
+
+class _Query:
+    """One historical request routed to its own FEED channel of the shared connection."""
+
+    def __init__(self, channel: int, messages: dict, buffer: CandleBuffer, tracker: CompletionTracker):
+        self.channel = channel
+        self.messages = messages
+        self.buffer = buffer
+        self.tracker = tracker
+
+
+class HistoricalSession:
+    """
+    EN: Long-lived, authorized DXLink connection that serves many historical queries.
+    ES: Conexión DXLink autorizada y persistente que atiende muchas consultas históricas.
+
+    SETUP and AUTH are done once. Each fetch() opens its own FEED channel on the same socket,
+    subscribes its Candle symbols there and closes the channel when complete, so concurrent
+    callers get only their own bars. KEEPALIVE is sent every `keepalive_interval` seconds.
+
+        with tt.historical_session(client) as hs:
+            m5 = hs.fetch(["AAPL", "MSFT"], "5m", ["close"], 100)
+            h1 = hs.fetch(["AAPL", "MSFT"], "1h", ["close"], 100)
+
+    Args:
+        api: TastyTradeAPI instance (used for the quote token and the result parsing)
+        Client: Authentication dict with session_token and account_number
+        keepalive_interval: Seconds between KEEPALIVE messages
+        connect_timeout: Seconds to wait for the connection to be authorized
+    """
+
+    def __init__(self, api, Client: dict, keepalive_interval: float = 30.0, connect_timeout: float = 10.0):
+        self.api = api
+        self.client = Client
+        self.keepalive_interval = keepalive_interval
+        self.connect_timeout = connect_timeout
+
+        self.ws = None
+        self.thread = None
+        self._keep_thread = None
+        self._authorized = threading.Event()
+        self._closed = threading.Event()
+        self._stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._queries = {}
+        self._next_channel = 1
+        self._token = None
+        self.handshake_time = None
+
+    # -------------------   CONNECTION   -------------------
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    @property
+    def connected(self) -> bool:
+        return self._authorized.is_set() and not self._closed.is_set()
+
+    def open(self):
+        """
+        EN: Connects and authorizes the websocket (no-op if already connected).
+        ES: Conecta y autoriza el websocket (no hace nada si ya está conectado).
+        """
+        if self.connected:
+            return self
+
+        dx_vals = self.api._quote_token(self.client)
+        self._token = dx_vals['token']
+        self._base = self.api._DX_session_messages(self._token)
+        self._authorized.clear()
+        self._closed.clear()
+        self._stopping.clear()
+
+        started = time.monotonic()
+        self.ws = websocket.WebSocketApp(dx_vals['dxlink-url'],
+                                         on_open=self._on_open,
+                                         on_message=self._on_message,
+                                         on_error=self._on_error,
+                                         on_close=self._on_close)
+        self.thread = threading.Thread(target=self.ws.run_forever, kwargs=RUN_OPTIONS, daemon=True)
+        self.thread.start()
+
+        if not self._authorized.wait(self.connect_timeout) or self._closed.is_set():
+            self.close()
+            raise Exception("HistoricalSession error ---> DXLink connection could not be authorized")
+        self.handshake_time = round(time.monotonic() - started, 4)
+        if self.api.metrics.enabled:
+            self.api.metrics.handshake('historical_session', time.monotonic() - started)
+
+        self._keep_thread = threading.Thread(target=self._keepalive_loop, daemon=True)
+        self._keep_thread.start()
+        return self
+
+    def close(self):
+        """
+        EN: Closes the connection, releasing any query still waiting.
+        ES: Cierra la conexión, liberando cualquier consulta en espera.
+        """
+        self._stopping.set()
+        close_websocket(self.ws, self.thread)
+        self._closed.set()
+        with self._lock:
+            for query in self._queries.values():
+                query.tracker.close()
+
+    def _send(self, message: dict):
+        self.ws.send(json.dumps(message))
+
+    def _keepalive_loop(self):
+        while not self._stopping.wait(self.keepalive_interval):
+            try:
+                self._send(self._base['KEEP'])
+            except Exception:
+                return
+
+    # -------------------   WEBSOCKET CALLBACKS   -------------------
+
+    def _on_open(self, ws):
+        self._send(self._base['SETUP'])
+
+    def _on_error(self, ws, error):
+        print(f'WebSocket Error: {error}')
+
+    def _on_close(self, ws, close_status_code=None, close_msg=None):
+        self._closed.set()
+        self._authorized.set()
+        with self._lock:
+            for query in self._queries.values():
+                query.tracker.close()
+
+    def _on_message(self, ws, message):
+        metrics = self.api.metrics
+        if not metrics.enabled:
+            self._treat_message(message)
+            return
+        started = time.perf_counter()
+        events = self._treat_message(message)
+        metrics.message('historical_session', events, time.perf_counter() - started)
+
+    def _treat_message(self, message) -> int:
+        """Handles one DXLink message. Returns the number of candles it carried."""
+        try:
+            msg = json.loads(message)
+        except json.JSONDecodeError:
+            return 0
+
+        msg_type = msg.get("type")
+        try:
+            if msg_type == "AUTH_STATE":
+                if msg.get("state") == 'UNAUTHORIZED':
+                    self._send(self._base['AUTH'])
+                elif msg.get("state") == 'AUTHORIZED':
+                    self._authorized.set()
+                return 0
+
+            with self._lock:
+                query = self._queries.get(msg.get("channel"))
+            if query is None:
+                return 0
+
+            if msg_type == "CHANNEL_OPENED":
+                self._send(query.messages['FEED'])
+
+            elif msg_type == "FEED_CONFIG":
+                fields = (msg.get("eventFields") or {}).get("Candle")
+                if fields and len(query.buffer) == 0:
+                    query.buffer.set_fields(fields)
+                if not query.tracker.closed:
+                    self._send(query.messages['SUB'])
+                    query.tracker.subscribed()
+
+            elif msg_type == "FEED_DATA":
+                data = msg.get('data', [])
+                if len(data) >= 2 and isinstance(data[1], list):
+                    return query.buffer.add(data[1], query.tracker)
+
+            elif msg_type in ("CHANNEL_CLOSED", "ERROR"):
+                query.tracker.close()
+
+        except Exception as e:
+            print(f"Error processing message: {e}")
+        return 0
+
+    # -------------------   QUERIES   -------------------
+
+    def _channel_messages(self, channel: int, plan: dict) -> dict:
+        messages = self.api._get_hist_DX_messages(self._token, plan['tickers'], plan['num'], plan['t_time'],
+                                                  plan['from_times'], plan['candle_fields'])
+        for key in ('CHANNEL', 'FEED', 'SUB'):
+            messages[key] = dict(messages[key], channel=channel)
+        messages['CANCEL'] = {"type": "CHANNEL_CANCEL", "channel": channel}
+        return messages
+
+    def fetch(self, tickers: list, interval: str, vars: list = None, max_data: int = 100,
+              quiet_period: float = 1.0, timeout: float = 30.0, store=None) -> dict:
+        """
+        EN: Historical Candle data over the open connection, same arguments and result as get_historical.
+        ES: Datos históricos de Candle por la conexión abierta, mismos argumentos y resultado que get_historical.
+        """
+        if len(tickers) == 0:
+            return {}
+        self.open()
+
+        plan = self.api._historical_plan(tickers, interval, vars, max_data, store)
+        plan['tickers'] = list(tickers)
+
+        with self._lock:
+            channel = self._next_channel
+            self._next_channel += 2
+
+        messages = self._channel_messages(channel, plan)
+        symbols = [sub['symbol'] for sub in messages['SUB']['add']]
+        from_map = {sub['symbol']: sub['fromTime'] for sub in messages['SUB']['add']}
+        tracker = CompletionTracker(symbols, quiet_period=quiet_period, from_time=from_map,
+                                    bar_ms=plan['bar_ms'])
+        query = _Query(channel, messages, CandleBuffer(plan['candle_fields']), tracker)
+
+        with self._lock:
+            self._queries[channel] = query
+        try:
+            self._send(messages['CHANNEL'])
+            tracker.wait(timeout)
+        finally:
+            with self._lock:
+                self._queries.pop(channel, None)
+            if self.connected:
+                try:
+                    self._send(messages['CANCEL'])
+                except Exception:
+                    pass
+
+        fetched = query.buffer.to_frame() if len(query.buffer) else pd.DataFrame()
+        return self.api._historical_result(fetched, tracker.report(), plan, store)
@@ -0,0 +1,186 @@
+import datetime
+import json
+import sqlite3
+import threading
+
+
+LEDGER_COLUMNS = ['id', 'symbol', 'transaction_type', 'description', 'quantity', 'price', 'value', 'date']
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS transactions (
+    id INTEGER PRIMARY KEY,
+    account TEXT NOT NULL,
+    symbol TEXT,
+    transaction_type TEXT,
+    description TEXT,
+    quantity REAL,
+    price REAL,
+    value REAL,
+    date TEXT,
+    executed_at TEXT,
+    raw TEXT
+);
+CREATE INDEX IF NOT EXISTS transactions_symbol ON transactions (account, symbol, executed_at);
+CREATE INDEX IF NOT EXISTS transactions_date ON transactions (account, executed_at);
+"""
+
+
+def _day(value) -> datetime.date:
+    if isinstance(value, datetime.datetime):
+        return value.date()
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value)[:10])
+
+
+class TransactionLedger:
+    """
+    EN: Local SQLite copy of the account transactions, kept up to date incrementally.
+    ES: Copia local en SQLite de las transacciones de la cuenta, actualizada de forma incremental.
+
+    Rows hold the fields of TastyTradeAPI._parse_transaction plus the account, the raw
+    'executed-at' timestamp (used for ordering and date filters) and the raw JSON item.
+    The id is the primary key and (account, symbol, time) and (account, time) are indexed,
+    so queries by symbol or date range are answered locally.
+
+    sync() only asks the server for transactions from the day of the newest stored one on
+    (the high-water mark); ids already stored are ignored.
+
+        ledger = TransactionLedger("transactions.db")
+        ledger.sync(tt, client)
+        aapl = ledger.transactions(symbol="AAPL", start_date="2024-01-01")
+
+    Args:
+        path: SQLite file (created if missing)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+        self._db.commit()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+    # -------------------   SYNC   -------------------
+
+    def high_water(self, account: str):
+        """'executed-at' of the newest stored transaction of the account (None if there is none)."""
+        with self._lock:
+            row = self._db.execute("SELECT MAX(executed_at) FROM transactions WHERE account = ?",
+                                   (account,)).fetchone()
+        return row[0]
+
+    def sync(self, api, Client: dict, per_page: int = 250) -> int:
+        """
+        EN: Downloads the transactions newer than the stored ones. Returns the number of new rows.
+        ES: Descarga las transacciones posteriores a las guardadas. Devuelve el número de filas nuevas.
+
+        Args:
+            api: TastyTradeAPI used for the requests
+            Client: Client of the account to sync
+            per_page: Transactions requested per page
+        """
+        account = api._account_of(Client)
+        mark = self.high_water(account)
+        # One day of margin: the server filters by calendar day and its time zone may differ
+        start = _day(mark) - datetime.timedelta(days=1) if mark else None
+
+        params = api._transaction_params(start_date=start, per_page=per_page, sort='Asc')
+        added = 0
+        for items in api._transaction_pages(Client, params):
+            added += self.add(account, items, api)
+        return added
+
+    def add(self, account: str, items: list, api) -> int:
+        """Stores raw transaction items (parsed with api), ignoring known ids. Returns the new rows."""
+        rows = []
+        for item in items:
+            entry = api._transaction_entry(item)
+            rows.append((item.get('id'), account, entry['symbol'], entry.get('transaction_type'),
+                         entry.get('description'), entry.get('quantity'), entry.get('price'),
+                         entry.get('value'), entry.get('date'), item.get('executed-at'), json.dumps(item)))
+        if not rows:
+            return 0
+        with self._lock:
+            before = self._db.total_changes
+            self._db.executemany("INSERT OR IGNORE INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            self._db.commit()
+            return self._db.total_changes - before
+
+    # -------------------   QUERIES   -------------------
+
+    def _select(self, columns: str, account: str, symbol: str, start_date, end_date, types) -> tuple:
+        where, args = [], []
+        if account is not None:
+            where.append("account = ?")
+            args.append(account)
+        if symbol is not None:
+            where.append("symbol = ?")
+            args.append(symbol)
+        if start_date is not None:
+            where.append("executed_at >= ?")
+            args.append(_day(start_date).isoformat())
+        if end_date is not None:
+            where.append("executed_at < ?")
+            args.append((_day(end_date) + datetime.timedelta(days=1)).isoformat())
+        if types:
+            types = [types] if isinstance(types, str) else list(types)
+            where.append(f"transaction_type IN ({', '.join('?' * len(types))})")
+            args.extend(types)
+
+        sql = f"SELECT {columns} FROM transactions"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        return sql + " ORDER BY executed_at, id", args
+
+    def transactions(self, symbol: str = None, start_date=None, end_date=None, types=None,
+                     account: str = None) -> list:
+        """
+        EN: Stored transactions (oldest first) as the dicts of TastyTradeAPI.iter_transactions.
+        ES: Transacciones guardadas (más antiguas primero) como los dicts de TastyTradeAPI.iter_transactions.
+
+        Args:
+            symbol: Only this symbol
+            start_date: First day (date, datetime or 'YYYY-MM-DD')
+            end_date: Last day, included
+            types: Transaction sub-type or list of them (e.g. 'Buy to Open')
+            account: Only this account number
+        """
+        sql, args = self._select(', '.join(LEDGER_COLUMNS), account, symbol, start_date, end_date, types)
+        with self._lock:
+            rows = self._db.execute(sql, args).fetchall()
+        return [dict(zip(LEDGER_COLUMNS, row)) for row in rows]
+
+    def by_symbol(self, start_date=None, end_date=None, types=None, account: str = None) -> dict:
+        """Stored transactions as {symbol: [transactions]}, the shape of TastyTradeAPI.all_transactions."""
+        data = {}
+        for t in self.transactions(None, start_date, end_date, types, account):
+            data.setdefault(t.pop('symbol'), []).append(t)
+        return data
+
+    def to_frame(self, symbol: str = None, start_date=None, end_date=None, types=None,
+                 account: str = None):
+        """Stored transactions as a DataFrame with an 'executed_at' datetime column."""
+        import pandas as pd
+
+        sql, args = self._select(', '.join(LEDGER_COLUMNS + ['account', 'executed_at']), account, symbol,
+                                 start_date, end_date, types)
+        with self._lock:
+            df = pd.read_sql_query(sql, self._db, params=args)
+        df['executed_at'] = pd.to_datetime(df['executed_at'], utc=True, format='ISO8601')
+        return df
@@ -0,0 +1,288 @@
+import math
+import re
+import threading
+import time
+
+
+# Histogram buckets grow by 5% from 1 µs: quantiles are exact to ~2.5%, memory is constant
+_MIN_VALUE = 1e-6
+_GROWTH = 1.05
+_LOG_GROWTH = math.log(_GROWTH)
+_BUCKETS = 600
+
+# Seconds of history behind the 'recent' message and event rates
+RATE_WINDOW = 10
+# Quotes of each FEED_DATA message whose age is measured (evenly spaced), bounding the cost per message
+QUOTE_AGE_SAMPLES = 8
+
+_ACCOUNT_SEGMENT = re.compile(r'(/accounts/)[^/?]+')
+_ID_SEGMENT = re.compile(r'/\d+(?=/|$)')
+
+
+def endpoint_name(method: str, path: str) -> str:
+    """'GET /accounts/{account}/positions': method and path with account numbers and ids replaced."""
+    if '://' in path:
+        path = '/' + path.split('://', 1)[1].partition('/')[2]
+    path = path.split('?', 1)[0]
+    path = _ACCOUNT_SEGMENT.sub(r'\1{account}', path)
+    return f"{method.upper()} {_ID_SEGMENT.sub('/{id}', path)}"
+
+
+class Histogram:
+    """Log-bucketed histogram of non-negative values (seconds)."""
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * _BUCKETS
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, value: float):
+        if value <= _MIN_VALUE:
+            idx = 0
+        else:
+            idx = min(_BUCKETS - 1, int(math.log(value / _MIN_VALUE) / _LOG_GROWTH) + 1)
+        self.counts[idx] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def add_many(self, values: list):
+        """add() for a batch of values, with the lookups hoisted out of the loop."""
+        if not values:
+            return
+        counts, log, last = self.counts, math.log, _BUCKETS - 1
+        for value in values:
+            counts[min(last, int(log(value / _MIN_VALUE) / _LOG_GROWTH) + 1) if value > _MIN_VALUE else 0] += 1
+        self.count += len(values)
+        self.total += sum(values)
+        top = max(values)
+        if top > self.max:
+            self.max = top
+
+    def quantile(self, q: float) -> float:
+        """Approximate q-quantile (upper bound of the bucket that holds it), None if empty."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for idx, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= rank:
+                return min(self.max, _MIN_VALUE * _GROWTH ** idx)
+        return self.max
+
+    def summary(self) -> dict:
+        if not self.count:
+            return {'count': 0, 'mean': None, 'p50': None, 'p90': None, 'p99': None, 'max': None}
+        return {'count': self.count, 'mean': self.total / self.count, 'p50': self.quantile(0.5),
+                'p90': self.quantile(0.9), 'p99': self.quantile(0.99), 'max': self.max}
+
+
+class _Stream:
+    """Message and event counters of one websocket stream, with a per-second ring for recent rates."""
+
+    __slots__ = ('messages', 'events', 'parse', 'first', 'last', 'ring')
+
+    def __init__(self):
+        self.messages = 0
+        self.events = 0
+        self.parse = Histogram()
+        self.first = None
+        self.last = None
+        # [second, messages, events] per slot
+        self.ring = [[0, 0, 0] for _ in range(RATE_WINDOW)]
+
+    def add(self, events: int, seconds: float, now: float):
+        self.messages += 1
+        self.events += events
+        self.parse.add(seconds)
+        if self.first is None:
+            self.first = now
+        self.last = now
+        second = int(now)
+        slot = self.ring[second % RATE_WINDOW]
+        if slot[0] != second:
+            slot[0], slot[1], slot[2] = second, 0, 0
+        slot[1] += 1
+        slot[2] += events
+
+    def summary(self, now: float) -> dict:
+        elapsed = (self.last - self.first) if self.first is not None else 0.0
+        # Complete seconds of the window only, the current one is still filling
+        second = int(now)
+        recent = [s for s in self.ring if second - RATE_WINDOW <= s[0] < second]
+        return {
+            'messages': self.messages,
+            'events': self.events,
+            'messages_per_sec': self.messages / elapsed if elapsed > 0 else None,
+            'events_per_sec': self.events / elapsed if elapsed > 0 else None,
+            'recent_messages_per_sec': sum(s[1] for s in recent) / RATE_WINDOW,
+            'recent_events_per_sec': sum(s[2] for s in recent) / RATE_WINDOW,
+            'parse': self.parse.summary(),
+        }
+
+
+class Metrics:
+    """
+    EN: Request, websocket and quote-latency instrumentation of a client, off by default.
+    ES: Instrumentación de peticiones, websockets y latencia de cotizaciones de un cliente, apagada por defecto.
+
+    Recorded while enabled:
+        - requests: count, errors (status >= 400 or exception) and latency per endpoint
+          ('GET /accounts/{account}/positions'), one entry per attempt
+        - streams: messages, events, lifetime and recent (last RATE_WINDOW s) rates and the
+          time spent handling each message, per stream ('streamer', 'historical', ...)
+        - quote_age: event time (bidTime/askTime) to local receive time of the quotes, sampled
+          (QUOTE_AGE_SAMPLES per message)
+        - handshakes: connect-to-authorized time per stream
+
+    stats() returns a snapshot of everything as plain dicts. Hooks are called on the thread
+    that records, as hook(metric, value, labels) with metric one of 'request_seconds',
+    'message_seconds', 'quote_age_seconds', 'handshake_seconds', so they can feed an
+    external metrics system. While disabled every call site pays a single attribute check.
+
+        tt = TastyTradeAPI(metrics=True)
+        tt.metrics.add_hook(lambda metric, value, labels: statsd.timing(metric, value, tags=labels))
+        tt.stats()['requests']['GET /accounts/{account}/positions']['latency']['p99']
+
+    Args:
+        enabled: Start recording right away
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._hooks = []
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self):
+        self.enabled = True
+        return self
+
+    def disable(self):
+        self.enabled = False
+        return self
+
+    def reset(self):
+        """Forgets everything recorded so far."""
+        with self._lock:
+            self._requests = {}
+            self._streams = {}
+            self._handshakes = {}
+            self._quote_age = Histogram()
+            self._since = time.time()
+
+    def add_hook(self, hook):
+        """Calls hook(metric, value, labels) for every recorded value."""
+        self._hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook):
+        if hook in self._hooks:
+            self._hooks.remove(hook)
+
+    def _emit(self, metric: str, value: float, labels: dict):
+        for hook in list(self._hooks):
+            try:
+                hook(metric, value, labels)
+            except Exception as e:
+                print("Metrics hook error -->", e)
+
+    # -------------------   RECORDING   -------------------
+
+    def request(self, method: str, path: str, seconds: float, status: int = None, error: Exception = None):
+        """One REST attempt: its latency and either the status code or the exception it raised."""
+        endpoint = endpoint_name(method, path)
+        failed = error is not None or status is None or status >= 400
+        with self._lock:
+            entry = self._requests.get(endpoint)
+            if entry is None:
+                entry = self._requests[endpoint] = [0, 0, Histogram(), {}]
+            entry[0] += 1
+            entry[1] += failed
+            entry[2].add(seconds)
+            key = status if error is None else type(error).__name__
+            entry[3][key] = entry[3].get(key, 0) + 1
+        if self._hooks:
+            self._emit('request_seconds', seconds, {'endpoint': endpoint, 'status': key, 'error': failed})
+
+    def message(self, stream: str, events: int, seconds: float):
+        """One websocket message of `stream`, carrying `events` events, handled in `seconds`."""
+        now = time.time()
+        with self._lock:
+            entry = self._streams.get(stream)
+            if entry is None:
+                entry = self._streams[stream] = _Stream()
+            entry.add(events, seconds, now)
+        if self._hooks:
+            self._emit('message_seconds', seconds, {'stream': stream, 'events': events})
+
+    def quotes(self, fields: list, data: list, stream: str = 'streamer'):
+        """Quote age of up to QUOTE_AGE_SAMPLES events of a flat COMPACT Quote array, from bidTime/askTime (ms)."""
+        width = len(fields)
+        positions = [i for i, name in enumerate(fields) if name in ('bidTime', 'askTime', 'time')]
+        if not positions or not width:
+            return
+        rows = len(data) // width
+        end = rows * width
+        step = width * max(1, -(-rows // QUOTE_AGE_SAMPLES))
+        now_ms = time.time() * 1000
+        try:
+            stamps = map(max, *[data[p:end:step] for p in positions]) if len(positions) > 1 \
+                else data[positions[0]:end:step]
+            ages = [max(0.0, (now_ms - t) / 1000) for t in stamps if t]
+        except TypeError:
+            # Missing (None) or non-numeric times: only the complete events are measured
+            ages = []
+            for base in range(0, end, step):
+                stamp = [data[base + p] for p in positions]
+                if all(isinstance(t, (int, float)) for t in stamp) and max(stamp) > 0:
+                    ages.append(max(0.0, (now_ms - max(stamp)) / 1000))
+        if not ages:
+            return
+        with self._lock:
+            self._quote_age.add_many(ages)
+        if self._hooks:
+            for age in ages:
+                self._emit('quote_age_seconds', age, {'stream': stream})
+
+    def handshake(self, stream: str, seconds: float):
+        """Time from opening the websocket of `stream` until it was authorized (and subscribed)."""
+        with self._lock:
+            entry = self._handshakes.get(stream)
+            if entry is None:
+                entry = self._handshakes[stream] = Histogram()
+            entry.add(seconds)
+        if self._hooks:
+            self._emit('handshake_seconds', seconds, {'stream': stream})
+
+    # -------------------   SNAPSHOT   -------------------
+
+    def stats(self) -> dict:
+        """
+        EN: Snapshot of every metric recorded since the last reset(), as plain dicts (seconds).
+        ES: Instantánea de todas las métricas registradas desde el último reset(), como dicts (segundos).
+        """
+        now = time.time()
+        with self._lock:
+            return {
+                'enabled': self.enabled,
+                'since': self._since,
+                'requests': {endpoint: {'count': count, 'errors': errors, 'status': dict(statuses),
+                                        'latency': hist.summary()}
+                             for endpoint, (count, errors, hist, statuses) in sorted(self._requests.items())},
+                'streams': {name: entry.summary(now) for name, entry in self._streams.items()},
+                'quote_age': self._quote_age.summary(),
+                'handshakes': {name: hist.summary() for name, hist in self._handshakes.items()},
+            }
+
+
+def metrics_for(metrics) -> Metrics:
+    """Metrics of the metrics argument of the clients: a Metrics instance (shared) or a bool (enabled)."""
+    if isinstance(metrics, Metrics):
+        return metrics
+    return Metrics(enabled=bool(metrics))
@@ -0,0 +1,258 @@
+import threading
+import time
+
+import numpy as np
+
+from .dispatch import CONFLATE
+
+
+class PositionBook:
+    """
+    EN: Open positions loaded once and indexed by symbol, with unrealized P&L marked to live quotes.
+    ES: Posiciones abiertas cargadas una vez e indexadas por símbolo, con P&L latente a precios en vivo.
+
+    refresh() downloads the positions (also on a timer with start()). Quantity, direction,
+    entry price and multiplier live in NumPy columns, one slot per symbol. Until a quote
+    arrives a position is marked at its 'close-price', like TastyTradeAPI.all_positions.
+    attach() subscribes the symbols on a RealTimeStreamer; every quote then re-marks its
+    position and adjusts the total by the difference, so nothing is re-polled. Marks are
+    matched by symbol, so positions whose symbol differs from the streamer symbol (options,
+    futures) keep the close-price until one is streamed under the same name.
+
+        book = PositionBook(tt, client)
+        book.attach(stream)
+        book.total_unrealized, book['AAPL']
+
+    Args:
+        api: TastyTradeAPI used for the requests
+        Client: Client of the account
+        mark: 'mid' marks at (bid + ask) / 2; 'exit' at the bid for longs and the ask for shorts
+    """
+
+    def __init__(self, api, Client: dict, mark: str = 'mid'):
+        if mark not in ('mid', 'exit'):
+            raise ValueError(f"Unsupported mark: {mark}, try: mid, exit")
+        self.api = api
+        self.client = Client
+        self.mark = mark
+
+        self._lock = threading.Lock()
+        self._index = {}
+        self._parsed = {}
+        self._errors = {}
+        self._alloc(0)
+        self._total = 0.0
+        self.refreshed_at = None
+
+        self._streamer = None
+        self._subscription = None
+        self._timer_stop = threading.Event()
+        self._timer = None
+
+        self.refresh()
+
+    def _alloc(self, n: int):
+        self._qty = np.zeros(n)
+        self._sign = np.zeros(n)
+        self._entry = np.zeros(n)
+        self._mult = np.ones(n)
+        self._price = np.zeros(n)
+        self._pnl = np.zeros(n)
+        self._marked_at = np.zeros(n)
+
+    # -------------------   LOADING   -------------------
+
+    def refresh(self) -> int:
+        """
+        EN: Downloads the open positions again. Returns how many there are.
+        ES: Vuelve a descargar las posiciones abiertas. Devuelve cuántas hay.
+
+        Live marks of symbols that are still open are kept.
+        """
+        raw = self.api._position(self.client)
+
+        parsed, errors = {}, {}
+        for item in raw:
+            symbol = item.get('symbol', 'unknown')
+            try:
+                parsed[symbol] = (self.api._parse_position_data(item), float(item.get('multiplier', 1)))
+            except Exception as e:
+                errors[symbol] = {"error": str(e)}
+
+        with self._lock:
+            old_index, old_price, old_marked = self._index, self._price, self._marked_at
+            self._alloc(len(parsed))
+            self._index = {}
+            self._parsed = {}
+            for i, (symbol, (p, multiplier)) in enumerate(parsed.items()):
+                self._index[symbol] = i
+                self._parsed[symbol] = p
+                direction = (p['type'] or '').lower()
+                self._sign[i] = 1.0 if direction == 'long' else -1.0 if direction == 'short' else 0.0
+                self._qty[i] = p['quantity']
+                self._entry[i] = p['avg_entry_price']
+                self._mult[i] = multiplier
+                j = old_index.get(symbol)
+                if j is not None and old_marked[j] > 0:
+                    self._price[i], self._marked_at[i] = old_price[j], old_marked[j]
+                else:
+                    self._price[i] = p['current_price']
+            self._pnl = self._sign * (self._price - self._entry) * self._qty * self._mult
+            self._total = float(self._pnl.sum())
+            self._errors = errors
+            self.refreshed_at = time.time()
+
+        if self._streamer is not None:
+            self._follow(self._streamer)
+        return len(parsed)
+
+    def start(self, interval: float = 60.0):
+        """
+        EN: Refreshes the positions every `interval` seconds on a background thread.
+        ES: Refresca las posiciones cada `interval` segundos en un hilo en segundo plano.
+        """
+        self.stop()
+        self._timer_stop.clear()
+
+        def run():
+            while not self._timer_stop.wait(interval):
+                try:
+                    self.refresh()
+                except Exception as e:
+                    print("Error refreshing positions -->", e)
+
+        self._timer = threading.Thread(target=run, daemon=True)
+        self._timer.start()
+        return self
+
+    def stop(self):
+        """Stops the refresh timer."""
+        self._timer_stop.set()
+        if self._timer is not None and self._timer is not threading.current_thread():
+            self._timer.join(1.0)
+        self._timer = None
+
+    # -------------------   LIVE MARKS   -------------------
+
+    def attach(self, streamer):
+        """
+        EN: Marks the positions to the quotes of a RealTimeStreamer (their symbols are subscribed).
+        ES: Valora las posiciones con las cotizaciones de un RealTimeStreamer (se suscriben sus símbolos).
+        """
+        self.detach()
+        self._streamer = streamer
+        self._follow(streamer)
+        return self
+
+    def detach(self):
+        """Stops following the streamer (the last marks are kept)."""
+        if self._streamer is not None and self._subscription is not None:
+            self._streamer.off(self._subscription)
+        self._streamer = None
+        self._subscription = None
+
+    def _follow(self, streamer):
+        symbols = list(self._index)
+        if self._subscription is not None:
+            if self._subscription.symbols == set(symbols):
+                return
+            streamer.off(self._subscription)
+
+        missing = [s for s in symbols if s not in streamer.symbols]
+        if missing:
+            streamer.subscribe(missing)
+        # Conflated: only the newest quote of each symbol matters for the mark
+        self._subscription = streamer.on(self._on_quote, symbols=symbols, event_types=['Quote'],
+                                         maxsize=max(len(symbols), 1), policy=CONFLATE)
+
+        # Seed with the quotes the board already holds
+        for symbol in symbols:
+            quote = streamer.board.quote(symbol)
+            if quote is not None and quote['seq'] > 0:
+                self.update(symbol, quote['bid'], quote['ask'])
+
+    def _on_quote(self, event: dict):
+        self.update(event.get('eventSymbol'), event.get('bidPrice'), event.get('askPrice'))
+
+    def update(self, symbol: str, bid: float, ask: float) -> bool:
+        """
+        EN: Re-marks one position with a quote. Returns False if the symbol is not held or the quote is empty.
+        ES: Revalora una posición con una cotización. Devuelve False si no hay posición o la cotización está vacía.
+        """
+        idx = self._index.get(symbol)
+        if idx is None:
+            return False
+        bid = float(bid) if bid is not None else np.nan
+        ask = float(ask) if ask is not None else np.nan
+
+        with self._lock:
+            if self._index.get(symbol) != idx:
+                return False
+            sign = self._sign[idx]
+            if self.mark == 'exit':
+                price = bid if sign >= 0 else ask
+            else:
+                price = (bid + ask) / 2
+            if not np.isfinite(price) or price <= 0:
+                return False
+
+            pnl = sign * (price - self._entry[idx]) * self._qty[idx] * self._mult[idx]
+            self._total += pnl - self._pnl[idx]
+            self._pnl[idx] = pnl
+            self._price[idx] = price
+            self._marked_at[idx] = time.time()
+        return True
+
+    # -------------------   READS   -------------------
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, symbol) -> bool:
+        return symbol in self._index
+
+    def __getitem__(self, symbol: str) -> dict:
+        position = self.get(symbol)
+        if position is None:
+            raise KeyError(symbol)
+        return position
+
+    @property
+    def symbols(self) -> list:
+        return list(self._index)
+
+    def _entry_of(self, symbol: str, idx: int) -> dict:
+        p = dict(self._parsed[symbol])
+        p['current_price'] = float(self._price[idx])
+        p['profit'] = round(float(self._pnl[idx]), 3) if self._sign[idx] else None
+        p['marked_at'] = float(self._marked_at[idx]) or None
+        return p
+
+    def get(self, symbol: str) -> dict:
+        """
+        EN: Position of the symbol (the dict of all_positions with the live price and profit), or None.
+        ES: Posición del símbolo (el dict de all_positions con precio y beneficio en vivo), o None.
+        """
+        with self._lock:
+            idx = self._index.get(symbol)
+            if idx is None:
+                return self._errors.get(symbol)
+            return self._entry_of(symbol, idx)
+
+    def positions(self) -> dict:
+        """Every position as {symbol: position}, the shape of TastyTradeAPI.all_positions."""
+        with self._lock:
+            data = {symbol: self._entry_of(symbol, idx) for symbol, idx in self._index.items()}
+            data.update(self._errors)
+        return data
+
+    def unrealized(self, symbol: str) -> float:
+        """Unrealized P&L of one position (0.0 if it is not held)."""
+        with self._lock:
+            idx = self._index.get(symbol)
+            return float(self._pnl[idx]) if idx is not None else 0.0
+
+    @property
+    def total_unrealized(self) -> float:
+        """Unrealized P&L of every position, kept up to date quote by quote."""
+        return self._total
@@ -0,0 +1,138 @@
+import datetime
+import threading
+import time
+import weakref
+
+
+class QuoteTokenManager:
+    """
+    EN: Process-wide cache of DXLink quote tokens (link + token), refreshed before they expire.
+    ES: Caché global del proceso de tokens de DXLink (link + token), renovados antes de expirar.
+
+    Entries are keyed by session token, so every TastyTradeAPI instance, historical fetch
+    and RealTimeStreamer of the same session shares one /api-quote-tokens request.
+
+    Args:
+        refresh_margin: Seconds before expiry at which the token is refreshed in the background
+        default_lifetime: Lifetime assumed when the response carries no 'expires-at' (24 h)
+    """
+
+    def __init__(self, refresh_margin: float = 600.0, default_lifetime: float = 24 * 3600.0):
+        self.refresh_margin = refresh_margin
+        self.default_lifetime = default_lifetime
+        self._entries = {}
+        self._timers = {}
+        self._lock = threading.Lock()
+        self._fetch_locks = {}
+        # asyncio locks belong to one event loop: {loop: {session token: asyncio.Lock}}
+        self._async_fetch_locks = weakref.WeakKeyDictionary()
+
+    def _expiry(self, data: dict) -> float:
+        """Converts the 'expires-at' field of the response into a time.time() deadline."""
+        expires_at = data.get('expires-at')
+        if expires_at:
+            try:
+                dt = datetime.datetime.fromisoformat(str(expires_at).replace("Z", "+00:00"))
+                return dt.timestamp()
+            except Exception:
+                pass
+        return time.time() + self.default_lifetime
+
+    def _store(self, session_token: str, data: dict, fetch):
+        entry = {
+            'dxlink-url': data['dxlink-url'],
+            'token': data['token'],
+            'expires_at': self._expiry(data),
+            'fetched_at': time.time()
+        }
+        with self._lock:
+            self._entries[session_token] = entry
+            old = self._timers.pop(session_token, None)
+            if old:
+                old.cancel()
+
+            delay = entry['expires_at'] - self.refresh_margin - time.time()
+            if fetch is not None and delay > 0:
+                timer = threading.Timer(delay, self._background_refresh, args=(session_token, fetch))
+                timer.daemon = True
+                self._timers[session_token] = timer
+                timer.start()
+        return entry
+
+    def _background_refresh(self, session_token: str, fetch):
+        try:
+            self._store(session_token, fetch(), fetch)
+        except Exception:
+            # EN: Keep the current token, the next get() retries once it is near expiry.
+            # ES: Se mantiene el token actual, el siguiente get() reintenta al acercarse la expiración.
+            with self._lock:
+                self._timers.pop(session_token, None)
+
+    def _valid(self, entry: dict) -> bool:
+        return entry is not None and entry['expires_at'] - time.time() > self.refresh_margin / 2
+
+    def get(self, session_token: str, fetch) -> dict:
+        """
+        EN: Returns {'dxlink-url', 'token', 'expires_at'} for the session, calling fetch() only on a miss.
+        ES: Devuelve {'dxlink-url', 'token', 'expires_at'} de la sesión, llamando a fetch() solo si falta.
+        """
+        with self._lock:
+            entry = self._entries.get(session_token)
+            if self._valid(entry):
+                return entry
+            fetch_lock = self._fetch_locks.setdefault(session_token, threading.Lock())
+
+        # EN: Only one thread fetches per session, the rest wait and reuse its result.
+        # ES: Solo un hilo pide el token por sesión, el resto espera y reutiliza el resultado.
+        with fetch_lock:
+            with self._lock:
+                entry = self._entries.get(session_token)
+            if self._valid(entry):
+                return entry
+            return self._store(session_token, fetch(), fetch)
+
+    async def aget(self, session_token: str, fetch) -> dict:
+        """
+        EN: Same as get() for asyncio callers, with fetch being a coroutine function.
+        ES: Igual que get() para código asyncio, siendo fetch una función corrutina.
+
+        The background refresh runs the coroutine on the caller's event loop.
+        """
+        import asyncio
+
+        with self._lock:
+            entry = self._entries.get(session_token)
+        if self._valid(entry):
+            return entry
+
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            fetch_lock = self._async_fetch_locks.setdefault(loop, {}).setdefault(session_token, asyncio.Lock())
+
+        def refresh():
+            return asyncio.run_coroutine_threadsafe(fetch(), loop).result(timeout=60)
+
+        # EN: Only one coroutine fetches per session, the rest await and reuse its result.
+        # ES: Solo una corrutina pide el token por sesión, el resto espera y reutiliza el resultado.
+        async with fetch_lock:
+            with self._lock:
+                entry = self._entries.get(session_token)
+            if self._valid(entry):
+                return entry
+            return self._store(session_token, await fetch(), refresh)
+
+    def invalidate(self, session_token: str = None):
+        """
+        EN: Forgets the cached token of the session (or every token if session_token is None).
+        ES: Olvida el token cacheado de la sesión (o todos si session_token es None).
+        """
+        with self._lock:
+            keys = list(self._entries) if session_token is None else [session_token]
+            for key in keys:
+                self._entries.pop(key, None)
+                timer = self._timers.pop(key, None)
+                if timer:
+                    timer.cancel()
+
+
+QUOTE_TOKENS = QuoteTokenManager()
@@ -0,0 +1,247 @@
+import threading
+import time
+
+import numpy as np
+
+from .dxlink import QUOTE_FIELDS, _to_float, _to_time
+
+
+_FLOAT_COLUMNS = {'bid': 'bidPrice', 'ask': 'askPrice', 'bid_size': 'bidSize', 'ask_size': 'askSize'}
+
+
+class QuoteBoard:
+    """
+    EN: Latest quote of every symbol in preallocated NumPy columns, one slot per symbol.
+    ES: Última cotización de cada símbolo en columnas NumPy preasignadas, un hueco por símbolo.
+
+    Columns: bid, ask, bid_size, ask_size (float64), time (event time, epoch ms), updated
+    (time.time() of the last update) and seq (number of updates of the slot). The websocket
+    thread writes them in place; readers never lock, they copy the columns inside a seqlock
+    (a version counter that is odd while a batch is being written) and retry if a batch
+    landed during the copy, so every snapshot is consistent.
+
+    Args:
+        symbols: Symbols to allocate slots for up front (more are added on first update)
+        capacity: Initial number of slots (doubled when full)
+        fields: DXLink Quote fields in the order the server sends them
+    """
+
+    def __init__(self, symbols: list = (), capacity: int = 256, fields: list = QUOTE_FIELDS):
+        self._index = {}
+        self.symbols = []
+        self._version = 0
+        self._write_lock = threading.Lock()
+        self._alloc(max(int(capacity), len(symbols), 1))
+        for symbol in symbols:
+            self.slot(symbol)
+        self.set_fields(fields)
+
+    # -------------------   STORAGE   -------------------
+
+    def _alloc(self, capacity: int):
+        n = len(self.symbols)
+        columns = {
+            'bid': np.full(capacity, np.nan),
+            'ask': np.full(capacity, np.nan),
+            'bid_size': np.full(capacity, np.nan),
+            'ask_size': np.full(capacity, np.nan),
+            'time': np.zeros(capacity, dtype=np.int64),
+            'updated': np.zeros(capacity, dtype=np.float64),
+            'seq': np.zeros(capacity, dtype=np.int64),
+        }
+        if n:
+            for name, col in columns.items():
+                col[:n] = self._columns[name][:n]
+        self._columns = columns
+        self.capacity = capacity
+
+    def set_fields(self, fields: list):
+        """
+        EN: Sets the field layout of incoming COMPACT arrays (e.g. the one confirmed by FEED_CONFIG).
+        ES: Fija el orden de los campos de los arrays COMPACT (p. ej. el confirmado por FEED_CONFIG).
+        """
+        self.fields = list(fields)
+        self.width = len(self.fields)
+        self._sym_pos = self.fields.index('eventSymbol')
+        self._float_pos = [(name, self.fields.index(f)) for name, f in _FLOAT_COLUMNS.items() if f in self.fields]
+        self._time_pos = [self.fields.index(f) for f in ('time', 'bidTime', 'askTime') if f in self.fields]
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def __contains__(self, symbol) -> bool:
+        return symbol in self._index
+
+    def slot(self, symbol: str) -> int:
+        """Slot index of the symbol, allocating one if it is new."""
+        idx = self._index.get(symbol)
+        if idx is None:
+            with self._write_lock:
+                idx = self._index.get(symbol)
+                if idx is None:
+                    self._version += 1
+                    try:
+                        if len(self.symbols) == self.capacity:
+                            self._alloc(self.capacity * 2)
+                        idx = len(self.symbols)
+                        self.symbols.append(symbol)
+                        self._index[symbol] = idx
+                    finally:
+                        self._version += 1
+        return idx
+
+    # -------------------   WRITES   -------------------
+
+    def add(self, data_array: list) -> int:
+        """
+        EN: Writes a flat COMPACT Quote array into the slots in place. Returns the number of quotes.
+        ES: Escribe un array COMPACT plano de Quote en los huecos. Devuelve el número de cotizaciones.
+        """
+        if not data_array or not isinstance(data_array, list):
+            return 0
+        width = self.width
+        n_rows = len(data_array) // width
+        if n_rows == 0:
+            return 0
+
+        slot = self.slot
+        slots = [slot(s) for s in data_array[self._sym_pos:n_rows * width:width]]
+
+        time_pos = self._time_pos
+        now = time.time()
+
+        with self._write_lock:
+            cols = self._columns
+            time_col, seq_col, upd_col = cols['time'], cols['seq'], cols['updated']
+            float_pos = [(cols[name], pos) for name, pos in self._float_pos]
+            # The version must end even, whatever happens in between, or readers spin forever
+            self._version += 1
+            try:
+                base = 0
+                for idx in slots:
+                    for col, pos in float_pos:
+                        col[idx] = _to_float(data_array[base + pos])
+                    if time_pos:
+                        time_col[idx] = max(_to_time(data_array[base + p]) for p in time_pos)
+                    upd_col[idx] = now
+                    seq_col[idx] += 1
+                    base += width
+            finally:
+                self._version += 1
+        return n_rows
+
+    def update(self, symbol: str, bid: float, ask: float, bid_size: float = np.nan,
+               ask_size: float = np.nan, event_time: int = 0):
+        """Writes one quote in place."""
+        idx = self.slot(symbol)
+        with self._write_lock:
+            cols = self._columns
+            self._version += 1
+            try:
+                cols['bid'][idx] = bid
+                cols['ask'][idx] = ask
+                cols['bid_size'][idx] = bid_size
+                cols['ask_size'][idx] = ask_size
+                cols['time'][idx] = event_time
+                cols['updated'][idx] = time.time()
+                cols['seq'][idx] += 1
+            finally:
+                self._version += 1
+
+    def apply(self, slots: np.ndarray, bid: np.ndarray, ask: np.ndarray, bid_size: np.ndarray,
+              ask_size: np.ndarray, event_time: np.ndarray, updated: np.ndarray):
+        """
+        EN: Vectorized update from parallel arrays (one entry per event, in order); the last event per slot wins.
+        ES: Actualización vectorizada desde arrays paralelos (un evento por posición); gana el último por hueco.
+        """
+        slots = np.asarray(slots, dtype=np.int64)
+        if len(slots) == 0:
+            return
+        # Position of the last event of every slot
+        rev_unique, rev_first = np.unique(slots[::-1], return_index=True)
+        last = len(slots) - 1 - rev_first
+
+        with self._write_lock:
+            cols = self._columns
+            self._version += 1
+            try:
+                cols['bid'][rev_unique] = np.asarray(bid)[last]
+                cols['ask'][rev_unique] = np.asarray(ask)[last]
+                cols['bid_size'][rev_unique] = np.asarray(bid_size)[last]
+                cols['ask_size'][rev_unique] = np.asarray(ask_size)[last]
+                cols['time'][rev_unique] = np.asarray(event_time)[last]
+                cols['updated'][rev_unique] = np.asarray(updated)[last]
+                np.add.at(cols['seq'], slots, 1)
+            finally:
+                self._version += 1
+
+    def reset(self, symbols: list):
+        """Clears the quotes of the symbols (their slots are kept for reuse)."""
+        with self._write_lock:
+            cols = self._columns
+            self._version += 1
+            try:
+                for symbol in symbols:
+                    idx = self._index.get(symbol)
+                    if idx is None:
+                        continue
+                    for name in _FLOAT_COLUMNS:
+                        cols[name][idx] = np.nan
+                    cols['time'][idx] = 0
+                    cols['updated'][idx] = 0.0
+            finally:
+                self._version += 1
+
+    def symbols_in(self, data_array: list) -> list:
+        """Symbols of a flat COMPACT Quote array, in arrival order."""
+        n = len(data_array) // self.width * self.width
+        return data_array[self._sym_pos:n:self.width]
+
+    # -------------------   READS   -------------------
+
+    def snapshot(self, symbols: list = None) -> dict:
+        """
+        EN: Consistent copy of the board: {'symbol': [...], 'bid': array, 'ask': array, ...}.
+        ES: Copia consistente del tablero: {'symbol': [...], 'bid': array, 'ask': array, ...}.
+
+        Args:
+            symbols: Only these symbols, in this order (unknown symbols are NaN / 0)
+        """
+        while True:
+            version = self._version
+            if version & 1:
+                time.sleep(0)
+                continue
+
+            cols = self._columns
+            if symbols is None:
+                names = list(self.symbols)
+                n = len(names)
+                snap = {name: col[:n].copy() for name, col in cols.items()}
+            else:
+                names = list(symbols)
+                idx = np.array([self._index.get(s, -1) for s in names], dtype=np.int64)
+                known = idx >= 0
+                snap = {}
+                for name, col in cols.items():
+                    out = np.full(len(names), np.nan) if col.dtype.kind == 'f' else np.zeros(len(names), col.dtype)
+                    out[known] = col[idx[known]]
+                    snap[name] = out
+
+            if self._version == version:
+                snap['symbol'] = names
+                return snap
+
+    def quote(self, symbol: str) -> dict:
+        """Latest quote of one symbol as a dict (None if it has no slot)."""
+        if symbol not in self._index:
+            return None
+        snap = self.snapshot([symbol])
+        return {name: (col[0] if name == 'symbol' else col[0].item()) for name, col in snap.items()}
+
+    def mids(self) -> dict:
+        """{symbol: (bid + ask) / 2} for every symbol with both sides quoted."""
+        snap = self.snapshot()
+        mid = (snap['bid'] + snap['ask']) / 2
+        ok = (snap['seq'] > 0) & ~np.isnan(mid)
+        return {s: float(m) for s, m, k in zip(snap['symbol'], mid, ok) if k}
@@ -0,0 +1,274 @@
+import datetime
+import email.utils
+import random
+import threading
+import time
+
+
+# (requests per second, burst) of every endpoint class; '*' is the budget shared by all of them.
+# An opt-in preset (rate_limits=True), not TastyTrade's limits: the API does not publish them,
+# these are conservative guesses to tune with rate_limits={...}
+DEFAULT_RATE_LIMITS = {
+    '*': (20.0, 60),
+    'orders': (10.0, 30),
+    'sessions': (2.0, 5),
+    'market': (5.0, 10),
+    'accounts': (20.0, 60),
+}
+
+IDEMPOTENT_METHODS = ('GET', 'HEAD', 'OPTIONS')
+RETRY_STATUSES = (429, 502, 503, 504)
+
+
+def endpoint_class(path: str) -> str:
+    """Endpoint class of a request path: orders, sessions, market, accounts or default."""
+    if '://' in path:
+        path = '/' + path.split('://', 1)[1].partition('/')[2]
+    if '/orders' in path:
+        return 'orders'
+    if path.startswith('/sessions'):
+        return 'sessions'
+    if path.startswith('/api-quote-tokens') or path.startswith('/market-data') or path.startswith('/quote'):
+        return 'market'
+    if path.startswith('/accounts') or path.startswith('/customers'):
+        return 'accounts'
+    return 'default'
+
+
+def retry_after(value) -> float:
+    """Seconds of a Retry-After header (delta-seconds or HTTP date), None if absent or unreadable."""
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        dt = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, dt.timestamp() - time.time())
+
+
+class TokenBucket:
+    """
+    `rate` tokens per second, at most `burst` stored.
+
+    The rate adapts to the server: a 429 halves it (slow_down) and every accepted request
+    wins back a small step of the configured `limit` (speed_up), so a limit set above the
+    real one settles just below it instead of tripping it again and again.
+    """
+
+    __slots__ = ('limit', 'rate', 'burst', 'tokens', 'stamp')
+
+    def __init__(self, rate: float, burst: float):
+        self.limit = float(rate)
+        self.rate = float(rate)
+        self.burst = float(max(burst, 1))
+        self.tokens = self.burst
+        self.stamp = time.monotonic()
+
+    def refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.stamp) * self.rate)
+        self.stamp = now
+
+    def wait_time(self, n: float = 1.0) -> float:
+        """Seconds until `n` tokens are stored (0.0 if they already are)."""
+        if self.tokens >= n:
+            return 0.0
+        return (min(n, self.burst) - self.tokens) / self.rate
+
+    def slow_down(self, now: float):
+        self.refill(now)
+        self.tokens = min(self.tokens, 0.0)
+        self.rate = max(self.limit / 20, self.rate / 2)
+
+    def speed_up(self):
+        if self.rate < self.limit:
+            self.rate = min(self.limit, self.rate + self.limit / 50)
+
+
+class RequestScheduler:
+    """
+    EN: Client-side rate limiter and retry policy shared by every REST call of a client.
+    ES: Limitador de peticiones y política de reintentos del lado del cliente, compartido por todas las llamadas REST.
+
+    Every request takes one token from the bucket of its endpoint class (see endpoint_class)
+    and one from the shared '*' bucket, waiting until both have one, so bursts go out at
+    full speed and sustained load settles at the configured rate instead of tripping the
+    server limit. Order POSTs are served first: while one waits for the shared bucket,
+    other requests leave it the next token.
+
+    A 429 blocks its endpoint class for the Retry-After of the response, empties its bucket
+    and the shared one and halves their rate, which then recovers request by request (see
+    TokenBucket). GET requests are retried on 429, 502, 503, 504 and connection errors with
+    jittered exponential backoff; other methods are only retried on 429, which the server
+    sends before processing the request, so an order is never sent twice.
+
+    One scheduler can be shared by several clients (e.g. a TastyTradeAPI and an
+    AsyncTastyTradeAPI of the same login) so they draw from the same budget.
+
+    Args:
+        limits: {class: (rate per second, burst)} merged over DEFAULT_RATE_LIMITS (None removes a limit)
+        max_retries: Retries of a request after the first attempt
+        backoff: Base delay in seconds of the exponential backoff
+        max_backoff: Upper bound of a single backoff delay
+    """
+
+    def __init__(self, limits: dict = None, max_retries: int = 3, backoff: float = 0.25,
+                 max_backoff: float = 10.0):
+        merged = dict(DEFAULT_RATE_LIMITS)
+        merged.update(limits or {})
+        self.limits = {k: v for k, v in merged.items() if v}
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self._buckets = {k: TokenBucket(*v) for k, v in self.limits.items() if k != '*'}
+        self._shared = TokenBucket(*self.limits['*']) if '*' in self.limits else None
+        self._blocked = {}
+        self._urgent = set()
+        self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        self.stats = {'requests': 0, 'retries': 0, 'throttled': 0, 'waited': 0.0}
+
+    # -------------------   TOKENS   -------------------
+
+    def _take(self, klass: str, urgent: bool, ticket) -> float:
+        """Takes the tokens of a request (0.0) or returns how long to wait. Called with the lock held."""
+        now = time.monotonic()
+        self._urgent.discard(ticket)
+
+        wait = self._blocked.get(klass, 0.0) - now
+        if wait > 0:
+            return wait
+        bucket = self._buckets.get(klass)
+        if bucket is not None:
+            bucket.refill(now)
+            wait = bucket.wait_time()
+            if wait > 0:
+                return wait
+
+        shared = self._shared
+        if shared is not None:
+            shared.refill(now)
+            # Tokens of the shared bucket are left for the order POSTs waiting on it
+            wait = shared.wait_time(1.0 if urgent else 1.0 + len(self._urgent))
+            if wait > 0:
+                if urgent:
+                    self._urgent.add(ticket)
+                return wait
+            shared.tokens -= 1
+        if bucket is not None:
+            bucket.tokens -= 1
+        self.stats['requests'] += 1
+        return 0.0
+
+    def acquire(self, method: str, klass: str) -> float:
+        """
+        EN: Blocks until the request may be sent. Returns the seconds waited.
+        ES: Bloquea hasta que la petición puede enviarse. Devuelve los segundos esperados.
+        """
+        urgent = method == 'POST' and klass == 'orders'
+        ticket = object()
+        start = time.monotonic()
+        with self._cond:
+            try:
+                while True:
+                    wait = self._take(klass, urgent, ticket)
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+            finally:
+                self._urgent.discard(ticket)
+            waited = time.monotonic() - start
+            self.stats['waited'] += waited
+        return waited
+
+    async def aacquire(self, method: str, klass: str) -> float:
+        """asyncio version of acquire(): sleeps instead of blocking the event loop."""
+        import asyncio
+
+        urgent = method == 'POST' and klass == 'orders'
+        ticket = object()
+        start = time.monotonic()
+        try:
+            while True:
+                with self._lock:
+                    wait = self._take(klass, urgent, ticket)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+        finally:
+            with self._lock:
+                self._urgent.discard(ticket)
+        waited = time.monotonic() - start
+        with self._lock:
+            self.stats['waited'] += waited
+        return waited
+
+    # -------------------   RETRIES   -------------------
+
+    def retry_delay(self, method: str, klass: str, attempt: int, status: int = None,
+                    headers=None, error: Exception = None) -> float:
+        """
+        EN: Seconds to wait before retrying an attempt, or None if it is done or must not be retried.
+        ES: Segundos a esperar antes de reintentar un intento, o None si ha terminado o no se reintenta.
+
+        Called after every attempt: accepted requests let the adapted rates recover, and a
+        429 blocks the endpoint class until its Retry-After has passed.
+
+        Args:
+            method: HTTP method of the request
+            klass: Endpoint class of the request
+            attempt: Attempts already retried (0 after the first failure)
+            status: Status code of the response (None if the request raised)
+            headers: Response headers (for Retry-After)
+            error: Exception raised by the attempt
+        """
+        after = None
+        buckets = [b for b in (self._buckets.get(klass), self._shared) if b is not None]
+        if status == 429:
+            after = retry_after(headers.get('Retry-After') if headers else None)
+            with self._lock:
+                self.stats['throttled'] += 1
+                now = time.monotonic()
+                if after is not None:
+                    self._blocked[klass] = max(self._blocked.get(klass, 0.0), now + after)
+                for bucket in buckets:
+                    bucket.slow_down(now)
+        elif status is not None:
+            with self._lock:
+                for bucket in buckets:
+                    bucket.speed_up()
+
+        if attempt >= self.max_retries:
+            return None
+        if status == 429:
+            pass
+        elif method.upper() not in IDEMPOTENT_METHODS:
+            return None
+        elif error is None and status not in RETRY_STATUSES:
+            return None
+
+        # Full jitter: clients that failed together do not retry together
+        delay = random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+        if after is not None:
+            delay = after + random.uniform(0, self.backoff)
+        with self._lock:
+            self.stats['retries'] += 1
+        return delay
+
+
+def scheduler_for(rate_limits):
+    """
+    RequestScheduler of the rate_limits argument of the clients: None or False (off, the
+    default), True (DEFAULT_RATE_LIMITS), a dict over DEFAULT_RATE_LIMITS or a shared scheduler.
+    """
+    if rate_limits is None or rate_limits is False:
+        return None
+    if isinstance(rate_limits, RequestScheduler):
+        return rate_limits
+    return RequestScheduler(None if rate_limits is True else rate_limits)
@@ -0,0 +1,227 @@
+import numpy as np
+import pandas as pd
+
+
+MINUTE_NS = 60 * 10**9
+DAY_NS = 24 * 60 * MINUTE_NS
+UNIT_NS = {'m': MINUTE_NS, 'h': 60 * MINUTE_NS, 'd': DAY_NS, 'w': 7 * DAY_NS}
+
+# Regular session of US equities, in the exchange time zone
+REGULAR_SESSION = ('09:30', '16:00')
+EXCHANGE_TZ = 'America/New_York'
+
+
+def parse_interval(interval: str) -> tuple:
+    """'15m' -> (15, 'm'). Minutes, hours, days and weeks; months are not fixed-length and unsupported."""
+    num_str = ''.join(c for c in interval if c.isdigit())
+    unit = ''.join(c for c in interval if c.isalpha())
+    if unit not in UNIT_NS:
+        raise ValueError(f"Unsupported interval: {interval}, try: m, h, d, w (e.g. '5m', '1h')")
+    num = int(num_str) if num_str else 1
+    if num < 1:
+        raise ValueError(f"Unsupported interval: {interval}")
+    return num, unit
+
+
+def interval_ns(interval: str) -> int:
+    num, unit = parse_interval(interval)
+    return num * UNIT_NS[unit]
+
+
+def _clock_ns(hhmm: str) -> int:
+    hours, minutes = hhmm.split(':')
+    return (int(hours) * 60 + int(minutes)) * MINUTE_NS
+
+
+def _local_ns(utc: np.ndarray, tz: str) -> np.ndarray:
+    """Wall-clock time in `tz` of epoch-ns stamps. UTC offsets only change on quarter hours, so
+    one stamp per run of equal quarter hours is converted and its offset repeated over the run."""
+    quarter = utc // (15 * MINUTE_NS)
+    starts = np.concatenate(([0], np.flatnonzero(np.diff(quarter)) + 1))
+    firsts = utc[starts]
+    local = pd.DatetimeIndex(firsts).tz_localize('UTC').tz_convert(tz).tz_localize(None).asi8
+    return utc + np.repeat(local - firsts, np.diff(np.append(starts, len(utc))))
+
+
+def session_mask(stamps, session: tuple = REGULAR_SESSION, tz: str = EXCHANGE_TZ) -> np.ndarray:
+    """Boolean mask of the naive UTC datetimes `stamps` that fall inside `session` in `tz` (DST aware)."""
+    utc = np.asarray(stamps, dtype='datetime64[ns]').view('int64')
+    if len(utc) == 0:
+        return np.zeros(0, dtype=bool)
+    clock = _local_ns(utc, tz) % DAY_NS
+    return (clock >= _clock_ns(session[0])) & (clock < _clock_ns(session[1]))
+
+
+def resample_candles(df: pd.DataFrame, interval: str, session: tuple = REGULAR_SESSION,
+                     tz: str = EXCHANGE_TZ, drop_incomplete: bool = False) -> pd.DataFrame:
+    """
+    EN: Aggregates one ticker's candles into a coarser interval (open first, high max, low min, close last, volume sum).
+    ES: Agrega las velas de un ticker en un intervalo mayor (open primero, high máx, low mín, close último, volumen suma).
+
+    Takes a frame of get_historical (naive UTC 'Date' column) or of CandleStore.read (epoch
+    ms 'Time' column), in either order, and returns the same columns and order. Rows are
+    bucketed in one vectorized pass: the times are converted to `tz`, intraday buckets are
+    aligned to the session open of each day (1h bars start at 9:30, 10:30, ... and the last
+    one of the day is cut at the close), daily bars cover one session date and weekly bars
+    start on Monday. Intraday labels are bucket starts in the time base of the input (UTC);
+    daily and weekly labels are the local session date at midnight.
+
+    NaN values are skipped (the open is the first valid one, the close the last one).
+    Columns other than OHLCV keep their last value, 'EventType' its first.
+
+    Args:
+        df: Candles of one ticker
+        interval: Target interval, e.g. '5m', '1h', '1d', '1w' (a multiple of the input's)
+        session: ('HH:MM', 'HH:MM') in `tz`; rows outside are dropped and intraday buckets
+            start at its open. None keeps every row and aligns to midnight
+        tz: Time zone of the session and of the day boundaries
+        drop_incomplete: Drop the newest bar if the input does not reach its end yet
+    """
+    width = interval_ns(interval)
+    if 'Date' in df.columns:
+        time_col = 'Date'
+        stamps = df['Date'].to_numpy(dtype='datetime64[ns]').view('int64')
+    elif 'Time' in df.columns:
+        time_col = 'Time'
+        stamps = df['Time'].to_numpy(dtype='int64') * 10**6
+    else:
+        raise ValueError("Candles need a 'Date' (datetime) or 'Time' (epoch ms) column")
+
+    if len(df) == 0:
+        return df.iloc[0:0].copy()
+
+    descending = len(stamps) > 1 and stamps[0] > stamps[-1]
+    order = np.argsort(stamps, kind='stable')
+    utc = stamps[order]
+
+    # Local wall-clock time of every row, and its offset from UTC
+    local = _local_ns(utc, tz)
+    offset = local - utc
+    day = local - local % DAY_NS
+    clock = local - day
+
+    keep = None
+    if session is not None:
+        open_ns, close_ns = _clock_ns(session[0]), _clock_ns(session[1])
+        keep = (clock >= open_ns) & (clock < close_ns)
+        if not keep.all():
+            order, utc, local, offset, day, clock = (a[keep] for a in (order, utc, local, offset, day, clock))
+        if len(order) == 0:
+            return df.iloc[0:0].copy()
+    else:
+        open_ns, close_ns = 0, DAY_NS
+
+    if width < DAY_NS:
+        start = day + open_ns + (clock - open_ns) // width * width
+        end = np.minimum(start + width, day + close_ns)
+        label = start - offset
+        end = end - offset
+    else:
+        days = day // DAY_NS
+        if width % (7 * DAY_NS) == 0:
+            # 1970-01-01 was a Thursday: shift by 3 days so weeks start on Monday
+            weeks = width // (7 * DAY_NS)
+            start_days = (days + 3) // (7 * weeks) * (7 * weeks) - 3
+        else:
+            step = width // DAY_NS
+            start_days = days // step * step
+        start = start_days * DAY_NS
+        label = start
+        end = start + width - DAY_NS + close_ns - offset
+
+    # Rows are sorted, so every bucket is one contiguous run
+    bounds = np.flatnonzero(np.diff(start)) + 1
+    starts = np.concatenate(([0], bounds))
+    ends = np.concatenate((bounds, [len(start)]))
+
+    src = df.iloc[order]
+    out = {}
+    for column in df.columns:
+        if column == time_col:
+            continue
+        values = src[column].to_numpy()
+        if column in ('Open', 'Close') and values.dtype.kind == 'f':
+            valid = ~np.isnan(values)
+            positions = np.arange(len(values))
+            if column == 'Open':
+                pick = np.minimum.reduceat(np.where(valid, positions, len(values)), starts)
+                ok = pick < ends
+            else:
+                pick = np.maximum.reduceat(np.where(valid, positions, -1), starts)
+                ok = pick >= starts
+            out[column] = np.where(ok, values[np.clip(pick, 0, len(values) - 1)], np.nan)
+        elif column == 'High' and values.dtype.kind == 'f':
+            out[column] = np.fmax.reduceat(values, starts)
+        elif column == 'Low' and values.dtype.kind == 'f':
+            out[column] = np.fmin.reduceat(values, starts)
+        elif column == 'Volume' and values.dtype.kind == 'f':
+            out[column] = np.add.reduceat(np.nan_to_num(values), starts)
+        elif column == 'EventType':
+            out[column] = src[column].iloc[starts].to_numpy()
+        else:
+            out[column] = src[column].iloc[ends - 1].to_numpy()
+
+    labels = label[starts]
+    if time_col == 'Date':
+        out['Date'] = labels.astype('datetime64[ns]').astype(df['Date'].dtype)
+    else:
+        out['Time'] = labels // 10**6
+
+    result = pd.DataFrame(out, columns=list(df.columns))
+    if 'EventType' in result.columns and isinstance(df['EventType'].dtype, pd.CategoricalDtype):
+        result['EventType'] = result['EventType'].astype('category')
+
+    if drop_incomplete:
+        base = np.diff(utc)
+        base = int(base[base > 0].min()) if (base > 0).any() else 0
+        if utc[-1] + base < end[starts[-1]]:
+            result = result.iloc[:-1]
+
+    if descending:
+        result = result.iloc[::-1]
+    result = result.reset_index(drop=True)
+    result.attrs = dict(df.attrs)
+    result.attrs['resampled'] = interval
+    return result
+
+
+def resample_frames(frames: dict, intervals: list, max_rows: int = None, **kwargs) -> dict:
+    """
+    EN: Resamples {ticker: frame} into every interval. Returns {interval: {ticker: frame}}.
+    ES: Reagrega {ticker: frame} en cada intervalo. Devuelve {intervalo: {ticker: frame}}.
+
+    max_rows keeps the newest bars of each result; other arguments go to resample_candles.
+    """
+    result = {}
+    for interval in intervals:
+        out = {}
+        for ticker, df in frames.items():
+            bars = resample_candles(df, interval, **kwargs)
+            if max_rows is not None and len(bars) > max_rows:
+                time_col = 'Date' if 'Date' in bars.columns else 'Time'
+                newest_first = bars[time_col].iloc[0] > bars[time_col].iloc[-1]
+                bars = bars.head(max_rows) if newest_first else bars.tail(max_rows).reset_index(drop=True)
+            out[ticker] = bars
+        result[interval] = out
+    return result
+
+
+def base_rows(base: str, intervals: list, max_rows: int, session: tuple = REGULAR_SESSION) -> int:
+    """Bars of the `base` interval needed for `max_rows` bars of every interval (within sessions)."""
+    base_ns = interval_ns(base)
+    session_ns = DAY_NS if session is None else _clock_ns(session[1]) - _clock_ns(session[0])
+    needed = max_rows
+    for interval in intervals:
+        width = interval_ns(interval)
+        if width % base_ns:
+            raise ValueError(f"Interval {interval} is not a multiple of {base}")
+        if width < DAY_NS:
+            per_session = -(-session_ns // width)
+            sessions = -(-max_rows // per_session)
+            rows = sessions * (session_ns // base_ns)
+        else:
+            # Weekends fall inside weekly buckets: 5 sessions per 7 days
+            trading_days = width // DAY_NS if width % (7 * DAY_NS) else width // (7 * DAY_NS) * 5
+            rows = max_rows * trading_days * (session_ns // base_ns)
+        needed = max(needed, rows)
+    return int(needed)
@@ -0,0 +1,122 @@
+import datetime
+import json
+import os
+import threading
+import time
+
+
+def session_expiry(data: dict, default_lifetime: float) -> float:
+    """Converts the 'session-expiration' field of a /sessions response into a time.time() deadline."""
+    expires_at = data.get('session-expiration')
+    if expires_at:
+        try:
+            dt = datetime.datetime.fromisoformat(str(expires_at).replace("Z", "+00:00"))
+            return dt.timestamp()
+        except Exception:
+            pass
+    return time.time() + default_lifetime
+
+
+class SessionCache:
+    """
+    EN: Session tokens per login with their expiry and accounts, optionally persisted to a file.
+    ES: Tokens de sesión por login con su expiración y cuentas, opcionalmente guardados en un fichero.
+
+    Each entry holds the session token, the remember token, the expiry (time.time()) and the
+    account list of the login, so a new process can build its Client without /sessions or
+    /customers/me/accounts. Passwords are never stored. The file is created with 0600
+    permissions (directory 0700), replaced atomically on every write and re-read when another
+    process changed it.
+
+    Args:
+        path: JSON file shared by every process (None keeps the entries in memory only)
+        refresh_margin: Seconds before expiry at which a session is refreshed
+        default_lifetime: Lifetime assumed when /sessions carries no 'session-expiration' (24 h)
+    """
+
+    def __init__(self, path: str = None, refresh_margin: float = 600.0, default_lifetime: float = 24 * 3600.0):
+        self.path = os.path.expanduser(path) if path else None
+        self.refresh_margin = refresh_margin
+        self.default_lifetime = default_lifetime
+        self._entries = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    # -------------------   FILE   -------------------
+
+    def _load(self):
+        if self.path is None:
+            return
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._mtime:
+            return
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                self._entries = json.load(f)
+            self._mtime = mtime
+        except (OSError, ValueError):
+            # EN: Unreadable or corrupt: start over, it is only a cache.
+            # ES: Ilegible o corrupto: se empieza de cero, solo es una caché.
+            self._entries = {}
+
+    def _save(self):
+        if self.path is None:
+            return
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, mode=0o700, exist_ok=True)
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(self._entries, f)
+        os.replace(tmp, self.path)
+        self._mtime = os.stat(self.path).st_mtime_ns
+
+    # -------------------   ENTRIES   -------------------
+
+    def get(self, login: str) -> dict:
+        """Entry of the login if its session has not expired, else None."""
+        with self._lock:
+            self._load()
+            entry = self._entries.get(login)
+        if entry is None or entry['expires_at'] <= time.time():
+            return None
+        return dict(entry)
+
+    def put(self, login: str, session_token: str, remember_token: str, expires_at: float,
+            accounts: list = None) -> dict:
+        """Stores a session of the login (accounts are kept from the previous entry if not given)."""
+        with self._lock:
+            self._load()
+            old = self._entries.get(login) or {}
+            entry = {
+                'session_token': session_token,
+                'remember_token': remember_token,
+                'expires_at': expires_at,
+                'accounts': accounts if accounts is not None else old.get('accounts'),
+                'saved_at': time.time(),
+            }
+            self._entries[login] = entry
+            self._save()
+        return dict(entry)
+
+    def drop(self, login: str):
+        """Forgets the session of the login (e.g. after the server rejected it)."""
+        with self._lock:
+            self._load()
+            if self._entries.pop(login, None) is not None:
+                self._save()
+
+    def expires_at(self, session_token: str):
+        """Expiry (time.time()) of a known session token, None if the token is unknown."""
+        with self._lock:
+            self._load()
+            for entry in self._entries.values():
+                if entry['session_token'] == session_token:
+                    return entry['expires_at']
+        return None
+
+    def needs_refresh(self, entry: dict) -> bool:
+        return entry['expires_at'] - time.time() <= self.refresh_margin
@@ -0,0 +1,181 @@
+import json
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .candles import VALUE_FIELDS, CANDLE_COLUMNS
+from .resample import resample_candles
+
+STORE_COLUMNS = ['Time'] + [CANDLE_COLUMNS[f] for f in VALUE_FIELDS]
+DAY_MS = 86_400_000
+
+
+class CandleStore:
+    """
+    EN: On-disk candle store keyed by (symbol, interval), one Arrow IPC file per key.
+    ES: Almacén de velas en disco por (símbolo, intervalo), un fichero Arrow IPC por clave.
+
+    Files are read through a memory map, so loading a cached series does not copy it into
+    memory before it is converted. Bars are stored in ascending 'Time' (epoch ms) order with
+    full OHLCV; gaps that were already refetched and could not be filled are remembered in
+    the file metadata so they are not requested again.
+
+    Requires the optional dependency `pyarrow`.
+
+    Args:
+        path: Root directory of the store (created if missing)
+    """
+
+    def __init__(self, path: str):
+        try:
+            import pyarrow
+            import pyarrow.ipc  # noqa: F401
+        except ImportError as e:
+            raise ImportError("CandleStore requires pyarrow --> pip install pyarrow") from e
+
+        self._pa = pyarrow
+        self.path = path
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+
+    # -------------------   FILES   -------------------
+
+    def _file(self, symbol: str, interval: str) -> str:
+        safe = symbol.replace('/', '_').replace('\\', '_')
+        return os.path.join(self.path, interval, f"{safe}.arrow")
+
+    def _read_table(self, symbol: str, interval: str):
+        path = self._file(symbol, interval)
+        if not os.path.exists(path):
+            return None
+        pa = self._pa
+        with pa.memory_map(path, 'r') as source:
+            return pa.ipc.open_file(source).read_all()
+
+    def _write_table(self, symbol: str, interval: str, df: pd.DataFrame, verified: list):
+        pa = self._pa
+        path = self._file(symbol, interval)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        table = pa.Table.from_pandas(df[STORE_COLUMNS], preserve_index=False)
+        table = table.replace_schema_metadata({b'verified_gaps': json.dumps(verified).encode()})
+
+        tmp = f"{path}.tmp"
+        with pa.OSFile(tmp, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp, path)
+
+    def _verified(self, table) -> list:
+        meta = table.schema.metadata or {}
+        raw = meta.get(b'verified_gaps')
+        return [tuple(g) for g in json.loads(raw)] if raw else []
+
+    # -------------------   QUERIES   -------------------
+
+    def read(self, symbol: str, interval: str, since: int = None) -> pd.DataFrame:
+        """
+        EN: Returns the stored bars (Time in epoch ms, ascending), optionally from `since` on.
+        ES: Devuelve las velas guardadas (Time en epoch ms, ascendente), opcionalmente desde `since`.
+        """
+        table = self._read_table(symbol, interval)
+        if table is None:
+            return pd.DataFrame({c: pd.Series(dtype='int64' if c == 'Time' else 'float64')
+                                 for c in STORE_COLUMNS})
+        df = table.to_pandas()
+        if since is not None:
+            df = df[df['Time'] >= since].reset_index(drop=True)
+        return df
+
+    def read_resampled(self, symbol: str, base_interval: str, interval: str, since: int = None,
+                       **kwargs) -> pd.DataFrame:
+        """
+        EN: Stored bars of `base_interval` aggregated into `interval` (see resample_candles), Time in epoch ms.
+        ES: Velas guardadas de `base_interval` agregadas en `interval` (ver resample_candles), Time en epoch ms.
+
+        Only the base series has to be stored: 5m, 15m or 1h bars come from the 1m file.
+        `since` filters the base bars, so the first bucket may be partial unless it is aligned.
+        """
+        return resample_candles(self.read(symbol, base_interval, since), interval, **kwargs)
+
+    def last_time(self, symbol: str, interval: str):
+        """Time (epoch ms) of the newest stored bar, or None if nothing is stored."""
+        table = self._read_table(symbol, interval)
+        if table is None or table.num_rows == 0:
+            return None
+        return int(self._pa.compute.max(table.column('Time')).as_py())
+
+    def symbols(self, interval: str) -> list:
+        """Symbols with stored bars for the interval."""
+        folder = os.path.join(self.path, interval)
+        if not os.path.isdir(folder):
+            return []
+        return sorted(f[:-len('.arrow')] for f in os.listdir(folder) if f.endswith('.arrow'))
+
+    def gaps(self, symbol: str, interval: str, bar_ms: int) -> list:
+        """
+        EN: Finds holes between stored bars that have not been verified yet, as (after, before) epoch ms.
+        ES: Busca huecos entre velas guardadas aún no verificados, como (después, antes) en epoch ms.
+
+        Intraday series only look for holes inside the same day (nights and weekends are not gaps);
+        daily and longer series flag holes longer than a long weekend.
+        """
+        table = self._read_table(symbol, interval)
+        if table is None or table.num_rows < 2 or not bar_ms:
+            return []
+
+        times = np.sort(table.column('Time').to_numpy())
+        prev, nxt = times[:-1], times[1:]
+        diffs = nxt - prev
+
+        if bar_ms < DAY_MS:
+            mask = (diffs > bar_ms) & ((prev // DAY_MS) == (nxt // DAY_MS))
+        else:
+            mask = diffs > max(4 * DAY_MS, 2 * bar_ms)
+
+        verified = set(self._verified(table))
+        return [(int(a), int(b)) for a, b in zip(prev[mask], nxt[mask]) if (int(a), int(b)) not in verified]
+
+    # -------------------   UPDATES   -------------------
+
+    def merge(self, symbol: str, interval: str, bars: pd.DataFrame, checked_gaps: list = None) -> int:
+        """
+        EN: Merges new bars into the store (newer values win on equal Time). Returns the number of new bars.
+        ES: Fusiona velas nuevas en el almacén (gana la más reciente si Time coincide). Devuelve las nuevas.
+
+        Args:
+            bars: Frame with 'Time' (epoch ms) and any of Open/High/Low/Close/Volume
+            checked_gaps: Gaps that were just refetched; those still open are marked as verified
+        """
+        with self._lock:
+            table = self._read_table(symbol, interval)
+            old = table.to_pandas() if table is not None else None
+            verified = self._verified(table) if table is not None else []
+
+            new = bars.copy()
+            for col in STORE_COLUMNS:
+                if col not in new.columns:
+                    new[col] = np.nan
+            new = new[STORE_COLUMNS].astype({'Time': 'int64'})
+
+            before = 0 if old is None else len(old)
+            merged = new if old is None else pd.concat([old, new], ignore_index=True)
+            merged = merged.drop_duplicates(subset='Time', keep='last').sort_values('Time').reset_index(drop=True)
+
+            if checked_gaps:
+                times = merged['Time'].to_numpy()
+                for a, b in checked_gaps:
+                    inside = times[(times > a) & (times < b)]
+                    if len(inside) == 0:
+                        verified.append([int(a), int(b)])
+
+            self._write_table(symbol, interval, merged, verified)
+            return len(merged) - before
+
+    def clear(self, symbol: str, interval: str):
+        """Removes the stored bars of one (symbol, interval)."""
+        path = self._file(symbol, interval)
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,309 @@
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+from .dxlink import _to_float, _to_time
+
+
+# One fixed-width little-endian record per quote event (56 bytes)
+TICK_DTYPE = np.dtype([
+    ('ts', '<i8'),          # receive time, epoch microseconds
+    ('event_time', '<i8'),  # DXLink event time, epoch ms
+    ('symbol', '<i4'),      # id in the symbols.txt table of the directory
+    ('flags', '<i4'),       # reserved
+    ('bid', '<f8'),
+    ('ask', '<f8'),
+    ('bid_size', '<f8'),
+    ('ask_size', '<f8'),
+])
+_RECORD = struct.Struct('<qqiidddd')
+
+MAGIC = b'TTTICK01'
+_HEADER = struct.Struct('<8sI4x')
+HEADER_SIZE = _HEADER.size
+
+_QUOTE_FIELDS = ('bidPrice', 'askPrice', 'bidSize', 'askSize')
+
+
+def _tick_files(path: str) -> list:
+    if not os.path.isdir(path):
+        return []
+    return sorted(os.path.join(path, f) for f in os.listdir(path) if f.startswith('ticks-') and f.endswith('.bin'))
+
+
+def _read_symbols(path: str) -> list:
+    table = os.path.join(path, 'symbols.txt')
+    if not os.path.exists(table):
+        return []
+    with open(table, encoding='utf-8') as f:
+        return [line.rstrip('\n') for line in f]
+
+
+class TickRecorder:
+    """
+    EN: Append-only recorder of decoded quote events as fixed-width binary records.
+    ES: Grabador append-only de eventos de cotización decodificados en registros binarios de ancho fijo.
+
+    Records (TICK_DTYPE) go to ticks-NNNNNN.bin files in `path`, a new file being started when
+    the current one reaches `max_file_bytes`. Symbols are stored as ids of symbols.txt (one
+    symbol per line, append-only). Records are packed into an in-memory buffer and written
+    when it is full or `flush_interval` seconds passed; a background thread writes them too
+    when the stream goes quiet, so no record waits longer than that.
+
+    Args:
+        path: Directory of the recording (created if missing, appended to if it exists)
+        max_file_bytes: Size at which a new file is started
+        buffer_records: Records kept in memory between writes
+        flush_interval: Maximum seconds a record waits in memory
+    """
+
+    def __init__(self, path: str, max_file_bytes: int = 256 * 1024 * 1024, buffer_records: int = 4096,
+                 flush_interval: float = 1.0):
+        self.path = path
+        self.max_file_bytes = max(int(max_file_bytes), HEADER_SIZE + _RECORD.size)
+        self.flush_interval = flush_interval
+        os.makedirs(path, exist_ok=True)
+
+        self.symbols = _read_symbols(path)
+        self._ids = {s: i for i, s in enumerate(self.symbols)}
+        self._symbols_file = open(os.path.join(path, 'symbols.txt'), 'a', encoding='utf-8')
+
+        self._buffer = bytearray(_RECORD.size * max(1, int(buffer_records)))
+        self._used = 0
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self.records = 0
+
+        files = _tick_files(path)
+        self._seq = int(os.path.basename(files[-1])[6:-4]) if files else 0
+        self._file = None
+        self._open_next()
+
+        self._closing = threading.Event()
+        self._flusher = None
+        if flush_interval > 0:
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True)
+            self._flusher.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _open_next(self):
+        if self._file is not None:
+            self._file.close()
+        self._seq += 1
+        self.current_file = os.path.join(self.path, f"ticks-{self._seq:06d}.bin")
+        self._file = open(self.current_file, 'ab')
+        self._file.write(_HEADER.pack(MAGIC, _RECORD.size))
+        self._size = HEADER_SIZE
+
+    def _symbol_id(self, symbol: str) -> int:
+        sid = self._ids.get(symbol)
+        if sid is None:
+            sid = len(self.symbols)
+            self.symbols.append(symbol)
+            self._ids[symbol] = sid
+            self._symbols_file.write(f"{symbol}\n")
+            self._symbols_file.flush()
+        return sid
+
+    def _write(self):
+        """Writes the buffered records, continuing in a new file when the current one is full."""
+        view = memoryview(self._buffer)[:self._used]
+        while len(view):
+            room = (self.max_file_bytes - self._size) // _RECORD.size * _RECORD.size
+            if room <= 0:
+                self._open_next()
+                continue
+            chunk = view[:room]
+            self._file.write(chunk)
+            self._size += len(chunk)
+            view = view[len(chunk):]
+        self._file.flush()
+        self._used = 0
+        self._last_flush = time.monotonic()
+
+    def _flush_loop(self):
+        """Writes the buffer once its oldest record has waited flush_interval, even if nothing else arrives."""
+        wait = self.flush_interval
+        while not self._closing.wait(wait):
+            with self._lock:
+                if self._file is None:
+                    return
+                # Records are written on arrival after flush_interval without writes, so the
+                # buffered ones all arrived after _last_flush
+                if self._used and time.monotonic() - self._last_flush >= self.flush_interval:
+                    self._write()
+                wait = self.flush_interval
+                if self._used:
+                    wait = max(0.001, self._last_flush + self.flush_interval - time.monotonic())
+
+    def record(self, symbol: str, bid: float, ask: float, bid_size: float = np.nan, ask_size: float = np.nan,
+               event_time: int = 0, received: float = None):
+        """Appends one quote event (received is a time.time() value, now by default)."""
+        ts = int((received if received is not None else time.time()) * 1_000_000)
+        with self._lock:
+            if self._used == len(self._buffer):
+                self._write()
+            _RECORD.pack_into(self._buffer, self._used, ts, _to_time(event_time), self._symbol_id(symbol), 0,
+                              bid, ask, bid_size, ask_size)
+            self._used += _RECORD.size
+            self.records += 1
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._write()
+
+    def add(self, fields: list, data_array: list, received: float = None) -> int:
+        """
+        EN: Appends every quote of a flat COMPACT Quote array. Returns the number of records.
+        ES: Añade cada cotización de un array COMPACT plano de Quote. Devuelve el número de registros.
+        """
+        width = len(fields)
+        if not width or not data_array:
+            return 0
+        n_rows = len(data_array) // width
+        ts = int((received if received is not None else time.time()) * 1_000_000)
+        sym_pos = fields.index('eventSymbol')
+        val_pos = [fields.index(f) if f in fields else None for f in _QUOTE_FIELDS]
+        time_pos = [fields.index(f) for f in ('time', 'bidTime', 'askTime') if f in fields]
+        pack, size = _RECORD.pack_into, _RECORD.size
+
+        with self._lock:
+            base = 0
+            for _ in range(n_rows):
+                if self._used == len(self._buffer):
+                    self._write()
+                vals = [_to_float(data_array[base + p]) if p is not None else np.nan for p in val_pos]
+                event_time = max((_to_time(data_array[base + p]) for p in time_pos), default=0)
+                pack(self._buffer, self._used, ts, event_time, self._symbol_id(data_array[base + sym_pos]), 0, *vals)
+                self._used += size
+                base += width
+            self.records += n_rows
+            if time.monotonic() - self._last_flush >= self.flush_interval:
+                self._write()
+        return n_rows
+
+    def flush(self):
+        with self._lock:
+            self._write()
+
+    def close(self):
+        """Writes what is buffered and closes the files."""
+        self._closing.set()
+        if self._flusher is not None and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        with self._lock:
+            if self._file is None:
+                return
+            self._write()
+            self._file.close()
+            self._file = None
+            self._symbols_file.close()
+
+
+class TickReplay:
+    """
+    EN: Replays a TickRecorder directory through memory-mapped files.
+    ES: Reproduce un directorio de TickRecorder a través de ficheros mapeados en memoria.
+
+    chunks() yields the records as NumPy structured arrays straight from the memory map, which
+    is the fastest way to run a vectorized backtest. run() feeds a QuoteBoard and/or callbacks
+    (with the same event dicts as RealTimeStreamer.on) as fast as possible or paced by the
+    recorded timestamps.
+
+    Args:
+        path: Directory written by TickRecorder
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.files = _tick_files(path)
+        self.symbols = _read_symbols(path)
+
+    def _map(self, file: str) -> np.ndarray:
+        with open(file, 'rb') as f:
+            magic, size = _HEADER.unpack(f.read(HEADER_SIZE))
+        if magic != MAGIC or size != TICK_DTYPE.itemsize:
+            raise Exception(f"Not a tick file: {file}")
+        n = (os.path.getsize(file) - HEADER_SIZE) // TICK_DTYPE.itemsize
+        if n == 0:
+            return np.empty(0, dtype=TICK_DTYPE)
+        return np.memmap(file, dtype=TICK_DTYPE, mode='r', offset=HEADER_SIZE, shape=(n,))
+
+    def __len__(self) -> int:
+        return sum(max(0, os.path.getsize(f) - HEADER_SIZE) // TICK_DTYPE.itemsize for f in self.files)
+
+    def chunks(self, chunk_size: int = 65536):
+        """Yields consecutive record arrays (views of the memory map, at most chunk_size long)."""
+        for file in self.files:
+            records = self._map(file)
+            for start in range(0, len(records), chunk_size):
+                yield records[start:start + chunk_size]
+
+    def to_frame(self):
+        """All records as a DataFrame with the symbol names and receive times as datetimes."""
+        import pandas as pd
+
+        parts = [np.asarray(self._map(f)) for f in self.files]
+        records = np.concatenate(parts) if parts else np.empty(0, dtype=TICK_DTYPE)
+        df = pd.DataFrame(records)
+        df['symbol'] = pd.Categorical.from_codes(df['symbol'], categories=self.symbols)
+        df['ts'] = pd.to_datetime(df['ts'], unit='us')
+        return df
+
+    def _events(self, chunk: np.ndarray):
+        symbols = self.symbols
+        for sid, event_time, bid, ask, bid_size, ask_size in zip(
+                chunk['symbol'].tolist(), chunk['event_time'].tolist(), chunk['bid'].tolist(),
+                chunk['ask'].tolist(), chunk['bid_size'].tolist(), chunk['ask_size'].tolist()):
+            yield {'eventType': 'Quote', 'eventSymbol': symbols[sid], 'bidPrice': bid, 'askPrice': ask,
+                   'bidSize': bid_size, 'askSize': ask_size, 'time': event_time}
+
+    def run(self, board=None, callbacks: list = (), speed: float = None, chunk_size: int = 65536) -> int:
+        """
+        EN: Feeds the recorded quotes to a QuoteBoard and/or callbacks. Returns the number of records.
+        ES: Alimenta un QuoteBoard y/o callbacks con las cotizaciones grabadas. Devuelve los registros.
+
+        Args:
+            board: QuoteBoard updated with every record
+            callbacks: Functions called as callback(event) for every record
+            speed: None replays as fast as possible; 1.0 at the recorded pace, 2.0 twice as fast...
+        """
+        slot_of = None
+        if board is not None:
+            slot_of = np.array([board.slot(s) for s in self.symbols], dtype=np.int64)
+
+        count = 0
+        start_wall = start_ts = None
+        for chunk in self.chunks(chunk_size):
+            if speed is None:
+                if board is not None:
+                    board.apply(slot_of[chunk['symbol']], chunk['bid'], chunk['ask'], chunk['bid_size'],
+                                chunk['ask_size'], chunk['event_time'], chunk['ts'] / 1e6)
+                if callbacks:
+                    for event in self._events(chunk):
+                        for callback in callbacks:
+                            callback(event)
+                count += len(chunk)
+                continue
+
+            ts_list = chunk['ts'].tolist()
+            for i, event in enumerate(self._events(chunk)):
+                ts = ts_list[i]
+                if start_wall is None:
+                    start_wall, start_ts = time.monotonic(), ts
+                delay = (ts - start_ts) / 1e6 / speed - (time.monotonic() - start_wall)
+                if delay > 0.001:
+                    time.sleep(delay)
+                if board is not None:
+                    board.update(event['eventSymbol'], event['bidPrice'], event['askPrice'],
+                                 event['bidSize'], event['askSize'], event['time'])
+                for callback in callbacks:
+                    callback(event)
+            count += len(chunk)
+        return count
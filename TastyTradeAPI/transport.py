@@ -0,0 +1,130 @@
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .ratelimit import endpoint_class
+
+
+class HTTPTransport:
+    """
+    EN: Pooled keep-alive HTTP transport shared by every REST call of a TastyTradeAPI instance.
+    ES: Transporte HTTP con pool de conexiones keep-alive compartido por todas las llamadas REST.
+
+    Args:
+        base_url: Root of the REST API (e.g. 'https://api.tastytrade.com')
+        auth_header: Callable turning a session token into the Authorization header value
+        pool_size: Maximum number of warm connections kept per host
+        timeout: Default (connect, read) timeout in seconds for every request
+        keep_alive: Reuse connections between requests (False forces 'Connection: close')
+        scheduler: RequestScheduler that paces and retries the requests (None sends them as they come)
+        metrics: Metrics that records the latency and outcome of every attempt
+        on_unauthorized: Callable(session_token) returning a replacement token when a request
+            gets 401 (the request is then sent once more with it), or None to return the 401
+    """
+
+    def __init__(self, base_url: str, auth_header=None, pool_size: int = 10,
+                 timeout: float = 10.0, keep_alive: bool = True, scheduler=None, metrics=None,
+                 on_unauthorized=None):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.pool_size = pool_size
+        self.scheduler = scheduler
+        self.metrics = metrics
+        self._auth_header = auth_header
+        self._on_unauthorized = on_unauthorized
+
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self._session.mount('https://', adapter)
+        self._session.mount('http://', adapter)
+        self._session.headers.update({
+            'Accept': 'application/json',
+            'Connection': 'keep-alive' if keep_alive else 'close'
+        })
+
+    def _url(self, path: str) -> str:
+        if path.startswith('http://') or path.startswith('https://'):
+            return path
+        return f"{self.base_url}{path}"
+
+    def request(self, method: str, path: str, session_token: str = None,
+                headers: dict = None, **kwargs) -> requests.Response:
+        """
+        EN: Sends a request over the pooled session, injecting the Authorization header.
+        ES: Envía una petición por la sesión con pool, añadiendo la cabecera Authorization.
+
+        With a scheduler the request waits for its rate-limit tokens and failed attempts are
+        retried as the scheduler decides; the last response (or error) is what the caller gets.
+        A 401 is sent once more with the token on_unauthorized replaces it with, if any (the
+        server rejects it before processing, so this is safe for orders too).
+        """
+        response = self._request(method, path, session_token, headers, dict(kwargs))
+        if response.status_code == 401 and session_token is not None and self._on_unauthorized is not None:
+            new_token = self._on_unauthorized(session_token)
+            if new_token is not None and new_token != session_token:
+                response.close()
+                response = self._request(method, path, new_token, headers, dict(kwargs))
+        return response
+
+    def _request(self, method: str, path: str, session_token: str, headers: dict, kwargs: dict):
+        req_headers = dict(headers) if headers else {}
+        if session_token is not None:
+            if self._auth_header is not None:
+                req_headers['Authorization'] = self._auth_header(session_token)
+            else:
+                req_headers['Authorization'] = session_token
+
+        kwargs.setdefault('timeout', self.timeout)
+        url = self._url(path)
+        scheduler = self.scheduler
+        if scheduler is None:
+            return self._send(method, path, url, req_headers, kwargs)
+
+        klass = endpoint_class(path)
+        attempt = 0
+        while True:
+            scheduler.acquire(method, klass)
+            try:
+                response = self._send(method, path, url, req_headers, kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                delay = scheduler.retry_delay(method, klass, attempt, error=e)
+                if delay is None:
+                    raise
+            else:
+                delay = scheduler.retry_delay(method, klass, attempt, response.status_code, response.headers)
+                if delay is None:
+                    return response
+                response.close()
+            time.sleep(delay)
+            attempt += 1
+
+    def _send(self, method: str, path: str, url: str, headers: dict, kwargs: dict) -> requests.Response:
+        metrics = self.metrics
+        if metrics is None or not metrics.enabled:
+            return self._session.request(method, url, headers=headers, **kwargs)
+
+        started = time.perf_counter()
+        try:
+            response = self._session.request(method, url, headers=headers, **kwargs)
+        except Exception as e:
+            metrics.request(method, path, time.perf_counter() - started, error=e)
+            raise
+        metrics.request(method, path, time.perf_counter() - started, response.status_code)
+        return response
+
+    def get(self, path: str, session_token: str = None, **kwargs) -> requests.Response:
+        return self.request('GET', path, session_token, **kwargs)
+
+    def post(self, path: str, session_token: str = None, **kwargs) -> requests.Response:
+        return self.request('POST', path, session_token, **kwargs)
+
+    def delete(self, path: str, session_token: str = None, **kwargs) -> requests.Response:
+        return self.request('DELETE', path, session_token, **kwargs)
+
+    def close(self):
+        """
+        EN: Closes every pooled connection.
+        ES: Cierra todas las conexiones del pool.
+        """
+        self._session.close()
@@ -0,0 +1,111 @@
+"""
+EN: Benchmark of the historical Candle ingest path (COMPACT FEED_DATA -> {ticker: DataFrame}).
+ES: Benchmark de la ingesta de Candle históricas (FEED_DATA COMPACT -> {ticker: DataFrame}).
+
+Compares the columnar CandleBuffer path against the previous per-row `df.loc` ingest
+and per-ticker boolean-mask split. The legacy path is quadratic, so it only runs on
+the smaller sizes unless --legacy-max-rows is raised.
+
+    python -m benchmarks.bench_historical_ingest
+    python -m benchmarks.bench_historical_ingest --tickers 100 --candles 5000
+"""
+import argparse
+import datetime
+import random
+import time
+
+import pandas as pd
+
+from TastyTradeAPI.api import TastyTradeAPI
+from TastyTradeAPI.candles import CandleBuffer
+
+FIELDS = ['eventType', 'eventSymbol', 'time', 'open', 'high', 'low', 'close', 'volume']
+BATCH = 500
+RTH_MINUTES = 390
+
+
+def make_messages(n_tickers: int, n_candles: int, interval: str = '1m') -> list:
+    """Builds the FEED_DATA payloads DXLink would send for n_tickers x n_candles bars."""
+    rnd = random.Random(7)
+    start = datetime.datetime(2024, 1, 2, 14, 30, tzinfo=datetime.timezone.utc)
+    messages = []
+    for t in range(n_tickers):
+        symbol = f"TCK{t}{{={interval}}}"
+        flat = []
+        price = 100.0
+        for i in range(n_candles):
+            day, minute = divmod(i, RTH_MINUTES)
+            ts = start + datetime.timedelta(days=day, minutes=minute)
+            price += rnd.uniform(-0.5, 0.5)
+            flat.extend(['Candle', symbol, int(ts.timestamp() * 1000),
+                         price, price + 0.3, price - 0.3, price + 0.1, float(rnd.randint(100, 10000))])
+            if (i + 1) % BATCH == 0 or i == n_candles - 1:
+                messages.append(flat)
+                flat = []
+    return messages
+
+
+def columnar(api: TastyTradeAPI, messages: list, max_rows: int) -> dict:
+    buffer = CandleBuffer(FIELDS)
+    for data in messages:
+        buffer.add(data)
+    return api._historical_frames(buffer.to_frame(), max_rows)
+
+
+def legacy(messages: list, max_rows: int) -> dict:
+    """The ingest path used before CandleBuffer: row lists, df.loc appends and one mask per ticker."""
+    num_vars = len(FIELDS)
+    rows = []
+    for data in messages:
+        for i in range(0, len(data), num_vars):
+            if i + num_vars <= len(data):
+                rows.append(data[i:i + num_vars])
+
+    df = pd.DataFrame(columns=['EventType', 'Ticker', 'Time', 'Open', 'High', 'Low', 'Close', 'Volume'])
+    for row in rows:
+        df.loc[len(df)] = row
+
+    df['Ticker'] = df['Ticker'].apply(lambda t: str(t).split('{')[0])
+    df['Time'] = df['Time'] / 1000
+    df['Date'] = pd.to_datetime(df['Time'], unit='s')
+    df = df.drop(columns=['Time'])
+
+    result = {}
+    for ticker in df['Ticker'].unique():
+        result[ticker] = df[df['Ticker'] == ticker].drop(columns=['Ticker']).head(max_rows)
+    return result
+
+
+def timed(fn, *args) -> float:
+    t0 = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tickers', type=int, nargs='*', default=[1, 10, 50, 100])
+    parser.add_argument('--candles', type=int, nargs='*', default=[500, 5000])
+    parser.add_argument('--legacy-max-rows', type=int, default=20000,
+                        help='skip the legacy path above this many rows')
+    args = parser.parse_args()
+
+    api = TastyTradeAPI()
+    print(f"{'tickers':>8} {'candles':>8} {'rows':>10} {'columnar s':>11} {'rows/s':>12} {'legacy s':>10} {'speedup':>8}")
+    for n_candles in args.candles:
+        for n_tickers in args.tickers:
+            rows = n_tickers * n_candles
+            messages = make_messages(n_tickers, n_candles)
+            t_col = timed(columnar, api, messages, n_candles)
+
+            if rows <= args.legacy_max_rows:
+                t_old = timed(legacy, messages, n_candles)
+                old, speed = f"{t_old:10.3f}", f"{t_old / t_col:7.1f}x"
+            else:
+                old, speed = f"{'-':>10}", f"{'-':>8}"
+
+            print(f"{n_tickers:8d} {n_candles:8d} {rows:10d} {t_col:11.3f} {rows / t_col:12,.0f} {old} {speed}")
+
+
+if __name__ == '__main__':
+    main()
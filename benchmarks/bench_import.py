@@ -0,0 +1,83 @@
+"""
+EN: Import-time benchmark: cold-start cost of the package modules and which heavy dependencies they load.
+ES: Benchmark del tiempo de importación: coste en frío de los módulos y qué dependencias pesadas cargan.
+
+Every measurement imports the module in a fresh interpreter (python -X importtime), so
+nothing is cached between runs. --check exits with status 1 when a REST-only module loads
+one of the deferred dependencies, a streaming module loads one other than NumPy, or a REST
+module goes over --budget-ms, which makes it usable as a CI gate against startup regressions.
+
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --check --budget-ms 400
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+# Modules a REST-only user imports, which must not load the deferred dependencies
+REST_MODULES = ['TastyTradeAPI.api', 'TastyTradeAPI.aio', 'TastyTradeAPI.sessions', 'TastyTradeAPI.transport']
+# Modules of the streaming path (quote board, callbacks, tick recording), which only need NumPy
+STREAMING_MODULES = ['TastyTradeAPI.quotes', 'TastyTradeAPI.ticks', 'TastyTradeAPI.dispatch',
+                     'TastyTradeAPI.positions']
+STREAMING_ALLOWED = ['numpy']
+# Loaded on first use (historical data, streaming, stores, asyncio client)
+DEFERRED = ['pandas', 'numpy', 'websocket', 'aiohttp', 'pyarrow']
+# For reference: what the deferred dependencies cost by themselves
+REFERENCE = ['pandas', 'websocket', 'TastyTradeAPI.candles']
+
+
+def measure(module: str) -> tuple:
+    """(cumulative import µs of the module, deferred dependencies loaded) in a fresh interpreter."""
+    code = (f"import sys, {module}\n"
+            f"print(','.join(m for m in {DEFERRED!r} if m in sys.modules))")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ, PYTHONPATH=root + os.pathsep + os.environ.get('PYTHONPATH', ''))
+    proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                          env=env, check=True)
+
+    total = None
+    for line in proc.stderr.splitlines():
+        parts = [p.strip() for p in line.split('|')]
+        if len(parts) == 3 and parts[2] == module:
+            total = int(parts[1])
+    loaded = [m for m in proc.stdout.strip().split(',') if m]
+    return total, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=7)
+    parser.add_argument('--check', action='store_true',
+                        help='fail if a REST or streaming module loads a deferred dependency it should not')
+    parser.add_argument('--budget-ms', type=float, default=None, help='fail if a REST module takes longer (median)')
+    args = parser.parse_args()
+
+    print(f"{'module':>26} {'median ms':>10} {'min ms':>8}  deferred deps loaded")
+    failures = []
+    for module in REST_MODULES + STREAMING_MODULES + REFERENCE:
+        times, loaded = [], []
+        for _ in range(args.runs):
+            total, loaded = measure(module)
+            times.append(total / 1000)
+        median = statistics.median(times)
+        print(f"{module:>26} {median:10.1f} {min(times):8.1f}  {', '.join(loaded) or '-'}")
+
+        if module in REST_MODULES:
+            if loaded:
+                failures.append(f"{module} loads {', '.join(loaded)}")
+            if args.budget_ms is not None and median > args.budget_ms:
+                failures.append(f"{module} takes {median:.1f} ms (budget {args.budget_ms} ms)")
+        elif module in STREAMING_MODULES:
+            extra = [m for m in loaded if m not in STREAMING_ALLOWED]
+            if extra:
+                failures.append(f"{module} loads {', '.join(extra)}")
+
+    if args.check and failures:
+        print("\nFAILED:\n  " + "\n  ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""
+EN: Throughput benchmarks against the local stand-in server (no TastyTrade credentials needed).
+ES: Benchmarks de rendimiento contra el servidor local sustituto (sin credenciales de TastyTrade).
+
+    quotes     Quote events parsed per second by RealTimeStreamer (websocket -> quote board)
+    candles    Historical candles ingested per second by get_historical (end to end)
+    rest       REST calls per second (sequential and with concurrent threads; async if aiohttp is installed)
+    ratelimit  Calls per second and 429s against a server that enforces a rate limit, with the
+               client limiter off, matching the server and set twice too high
+
+    python -m benchmarks.bench_throughput
+    python -m benchmarks.bench_throughput quotes --quote-messages 20000 --quotes-per-message 100
+    python -m benchmarks.bench_throughput quotes rest --metrics    # with instrumentation on
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.standin import StandInServer
+
+
+def bench_quotes(args):
+    symbols = [f"SYM{i}" for i in range(args.symbols)]
+    total = args.quote_messages * args.quotes_per_message
+    with StandInServer(quotes_per_message=args.quotes_per_message, quote_messages=args.quote_messages) as srv:
+        tt = srv.api(metrics=args.metrics)
+        client = tt.Client('user', 'pass')
+        stream = tt.RealTimeStreamer(client, symbols, api=tt)
+
+        t0 = time.perf_counter()
+        stream.start()
+        deadline = time.monotonic() + args.timeout
+        received = 0
+        while received < total and time.monotonic() < deadline:
+            time.sleep(0.005)
+            received = int(stream.board.snapshot()['seq'].sum())
+        elapsed = time.perf_counter() - t0
+        stream.stop()
+        tt.close()
+
+    print(f"{'quotes':>10} {'per msg':>8} {'symbols':>8} {'seconds':>9} {'quotes/s':>12}")
+    print(f"{received:10d} {args.quotes_per_message:8d} {args.symbols:8d} {elapsed:9.3f} {received / elapsed:12,.0f}")
+
+
+def bench_candles(args):
+    print(f"{'tickers':>8} {'candles':>8} {'rows':>10} {'seconds':>9} {'candles/s':>12}")
+    for n_tickers in args.tickers:
+        with StandInServer(candles_per_symbol=args.candles) as srv:
+            tt = srv.api(metrics=args.metrics)
+            client = tt.Client('user', 'pass')
+            tickers = [f"SYM{i}" for i in range(n_tickers)]
+
+            t0 = time.perf_counter()
+            result = tt.get_historical(client, tickers, '1m', ['open', 'high', 'low', 'close', 'volume'],
+                                       max_data=args.candles, quiet_period=0.5)
+            elapsed = time.perf_counter() - t0
+            rows = sum(len(df) for df in result.values())
+            tt.close()
+        print(f"{n_tickers:8d} {args.candles:8d} {rows:10d} {elapsed:9.3f} {rows / elapsed:12,.0f}")
+
+
+def bench_rest(args):
+    print(f"{'engine':>16} {'calls':>7} {'seconds':>9} {'calls/s':>10}")
+    with StandInServer(positions=args.positions, latency=args.latency) as srv:
+        tt = srv.api(pool_size=args.workers, balance_ttl=0, rate_limits=False, metrics=args.metrics)
+        client = tt.Client('user', 'pass')
+
+        def call(_):
+            tt.all_positions(client)
+
+        t0 = time.perf_counter()
+        for i in range(args.calls):
+            call(i)
+        elapsed = time.perf_counter() - t0
+        print(f"{'sequential':>16} {args.calls:7d} {elapsed:9.3f} {args.calls / elapsed:10,.0f}")
+
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.workers) as pool:
+            list(pool.map(call, range(args.calls)))
+        elapsed = time.perf_counter() - t0
+        print(f"{f'threads x{args.workers}':>16} {args.calls:7d} {elapsed:9.3f} {args.calls / elapsed:10,.0f}")
+        tt.close()
+
+        try:
+            from TastyTradeAPI.aio import AsyncTastyTradeAPI
+            import aiohttp  # noqa: F401
+        except ImportError:
+            return
+
+        async def run_async():
+            async with AsyncTastyTradeAPI(api_url=srv.rest_url, pool_size=args.workers, balance_ttl=0,
+                                          rate_limits=False, metrics=args.metrics) as att:
+                slots = asyncio.Semaphore(args.workers)
+
+                async def one():
+                    async with slots:
+                        await att.all_positions(client)
+
+                t0 = time.perf_counter()
+                await asyncio.gather(*(one() for _ in range(args.calls)))
+                return time.perf_counter() - t0
+
+        elapsed = asyncio.run(run_async())
+        print(f"{f'asyncio x{args.workers}':>16} {args.calls:7d} {elapsed:9.3f} {args.calls / elapsed:10,.0f}")
+
+
+def bench_ratelimit(args):
+    rate, burst = args.server_limit, max(1, int(args.server_limit / 5))
+    print(f"server limit {rate:g}/s (burst {burst}), {args.workers} threads")
+    print(f"{'client limit':>14} {'calls':>7} {'seconds':>9} {'calls/s':>10} {'of limit':>9} {'429s':>6} {'failed':>7}")
+    for label, limits in [('off', False), ('matched', {'*': (rate, burst)}),
+                          ('2x too high', {'*': (2 * rate, 2 * burst)})]:
+        with StandInServer(positions=args.positions, rate_limit=(rate, burst)) as srv:
+            if limits:
+                # Only the shared budget: the endpoint classes would otherwise add their own limits
+                limits.update({k: None for k in ('orders', 'sessions', 'market', 'accounts')})
+            tt = srv.api(pool_size=args.workers, balance_ttl=0, rate_limits=limits)
+            client = tt.Client('user', 'pass')
+            srv.stats['throttled'] = 0
+
+            def call(_):
+                try:
+                    tt._position(client)
+                    return 0
+                except Exception:
+                    return 1
+
+            t0 = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.workers) as pool:
+                failed = sum(pool.map(call, range(args.calls)))
+            elapsed = time.perf_counter() - t0
+            ok = args.calls - failed
+            tt.close()
+        print(f"{label:>14} {args.calls:7d} {elapsed:9.3f} {ok / elapsed:10,.1f} {ok / elapsed / rate:9.0%} "
+              f"{srv.stats['throttled']:6d} {failed:7d}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('suites', nargs='*', help='quotes, candles, rest and/or ratelimit (default: all)')
+    parser.add_argument('--symbols', type=int, default=500)
+    parser.add_argument('--quote-messages', type=int, default=5000)
+    parser.add_argument('--quotes-per-message', type=int, default=50)
+    parser.add_argument('--tickers', type=int, nargs='*', default=[1, 10, 50])
+    parser.add_argument('--candles', type=int, default=2000)
+    parser.add_argument('--calls', type=int, default=500)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--positions', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every REST response')
+    parser.add_argument('--server-limit', type=float, default=50.0, help='requests/s of the ratelimit suite')
+    parser.add_argument('--metrics', action='store_true', help='record client metrics (to measure their cost)')
+    parser.add_argument('--timeout', type=float, default=60.0)
+    args = parser.parse_args()
+
+    suites = {'quotes': bench_quotes, 'candles': bench_candles, 'rest': bench_rest, 'ratelimit': bench_ratelimit}
+    for name in args.suites or list(suites):
+        if name not in suites:
+            parser.error(f"unknown suite {name!r}, choose from {', '.join(suites)}")
+        print(f"\n== {name} ==")
+        suites[name](args)
+
+
+if __name__ == '__main__':
+    main()
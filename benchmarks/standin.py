@@ -0,0 +1,544 @@
+"""
+EN: Local stand-in for the TastyTrade REST API and the DXLink websocket, for offline runs and benchmarks.
+ES: Sustituto local de la API REST de TastyTrade y del websocket DXLink, para pruebas sin conexión y benchmarks.
+
+Speaks the subset of both protocols TastyTradeAPI uses: the REST endpoints of sessions,
+accounts, balances, positions, transactions, fees, orders and quote tokens, and DXLink
+SETUP / AUTH_STATE / CHANNEL_REQUEST / FEED_SETUP / FEED_CONFIG / FEED_SUBSCRIPTION /
+FEED_DATA (COMPACT) / KEEPALIVE. Only the standard library is used.
+
+    with StandInServer(quote_rate=1000, quotes_per_message=50) as srv:
+        tt = srv.api()
+        client = tt.Client('user', 'pass')
+        stream = tt.RealTimeStreamer(client, ['AAPL'], api=tt).start()
+
+    python -m benchmarks.standin --port 8000     # serve until Ctrl+C
+"""
+import argparse
+import base64
+import datetime
+import hashlib
+import json
+import random
+import socket
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+_GUID = b"258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+_UNITS = {'m': 60_000, 'h': 3_600_000, 'd': 86_400_000, 'w': 7 * 86_400_000}
+_RTH_START, _RTH_END = 14 * 60 + 30, 21 * 60
+
+
+# -------------------   WEBSOCKET FRAMES   -------------------
+
+def _recv_exact(conn, n: int) -> bytes:
+    buf = b''
+    while len(buf) < n:
+        chunk = conn.recv(n - len(buf))
+        if not chunk:
+            raise ConnectionError("socket closed")
+        buf += chunk
+    return buf
+
+
+def _read_frame(conn):
+    b1, b2 = _recv_exact(conn, 2)
+    opcode = b1 & 0x0F
+    length = b2 & 0x7F
+    if length == 126:
+        length = struct.unpack('>H', _recv_exact(conn, 2))[0]
+    elif length == 127:
+        length = struct.unpack('>Q', _recv_exact(conn, 8))[0]
+    mask = _recv_exact(conn, 4) if b2 & 0x80 else None
+    data = _recv_exact(conn, length)
+    if mask:
+        data = bytes(b ^ mask[i % 4] for i, b in enumerate(data))
+    return opcode, data
+
+
+def _frame(data, opcode: int = 1) -> bytes:
+    if isinstance(data, str):
+        data = data.encode()
+    n = len(data)
+    if n < 126:
+        header = struct.pack('>BB', 0x80 | opcode, n)
+    elif n < 65536:
+        header = struct.pack('>BBH', 0x80 | opcode, 126, n)
+    else:
+        header = struct.pack('>BBQ', 0x80 | opcode, 127, n)
+    return header + data
+
+
+class _DXLinkConnection:
+    """One client connection of the DXLink stand-in."""
+
+    def __init__(self, server, conn):
+        self.server = server
+        self.conn = conn
+        self.lock = threading.Lock()
+        self.closed = threading.Event()
+        self.fields = {}
+        self.quotes = {}
+        self.quote_thread = None
+
+    def send(self, message: dict):
+        payload = _frame(json.dumps(message))
+        with self.lock:
+            self.conn.sendall(payload)
+        self.server.stats['messages_sent'] += 1
+
+    def handshake(self):
+        request = b''
+        while b'\r\n\r\n' not in request:
+            chunk = self.conn.recv(4096)
+            if not chunk:
+                raise ConnectionError("socket closed")
+            request += chunk
+        key = [line.split(b':', 1)[1].strip() for line in request.split(b'\r\n')
+               if line.lower().startswith(b'sec-websocket-key')][0]
+        accept = base64.b64encode(hashlib.sha1(key + _GUID).digest())
+        self.conn.sendall(b'HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\n'
+                          b'Connection: Upgrade\r\nSec-WebSocket-Accept: ' + accept + b'\r\n\r\n')
+
+    def run(self):
+        try:
+            self.handshake()
+            while not self.closed.is_set():
+                opcode, data = _read_frame(self.conn)
+                if opcode == 8:
+                    with self.lock:
+                        self.conn.sendall(_frame(b'', 8))
+                    break
+                if opcode == 9:
+                    with self.lock:
+                        self.conn.sendall(_frame(data, 10))
+                    continue
+                if opcode != 1:
+                    continue
+                self.server.stats['messages_received'] += 1
+                self.handle(json.loads(data))
+        except (ConnectionError, OSError, ValueError):
+            pass
+        finally:
+            self.closed.set()
+            try:
+                self.conn.close()
+            except OSError:
+                pass
+
+    def handle(self, msg: dict):
+        msg_type, channel = msg.get('type'), msg.get('channel')
+        if msg_type == 'SETUP':
+            self.send({'type': 'SETUP', 'channel': 0, 'version': 'standin', 'keepaliveTimeout': 60,
+                       'acceptKeepaliveTimeout': 60})
+            self.send({'type': 'AUTH_STATE', 'channel': 0, 'state': 'UNAUTHORIZED'})
+        elif msg_type == 'AUTH':
+            self.send({'type': 'AUTH_STATE', 'channel': 0, 'state': 'AUTHORIZED', 'userId': 'standin'})
+        elif msg_type == 'KEEPALIVE':
+            self.send({'type': 'KEEPALIVE', 'channel': 0})
+        elif msg_type == 'CHANNEL_REQUEST':
+            self.send({'type': 'CHANNEL_OPENED', 'channel': channel, 'service': 'FEED',
+                       'parameters': msg.get('parameters', {})})
+        elif msg_type == 'CHANNEL_CANCEL':
+            self.quotes.pop(channel, None)
+            self.send({'type': 'CHANNEL_CLOSED', 'channel': channel})
+        elif msg_type == 'FEED_SETUP':
+            self.fields[channel] = msg.get('acceptEventFields', {})
+            self.send({'type': 'FEED_CONFIG', 'channel': channel, 'dataFormat': 'COMPACT',
+                       'aggregationPeriod': msg.get('acceptAggregationPeriod', 0),
+                       'eventFields': self.fields[channel]})
+        elif msg_type == 'FEED_SUBSCRIPTION':
+            self.subscription(channel, msg)
+
+    def subscription(self, channel: int, msg: dict):
+        symbols = self.quotes.setdefault(channel, [])
+        if msg.get('reset'):
+            symbols.clear()
+        for sub in msg.get('remove', []):
+            if sub.get('type') == 'Quote' and sub['symbol'] in symbols:
+                symbols.remove(sub['symbol'])
+        for sub in msg.get('add', []):
+            if sub.get('type') == 'Candle':
+                self.send_candles(channel, sub)
+            elif sub.get('type') == 'Quote' and sub['symbol'] not in symbols:
+                symbols.append(sub['symbol'])
+
+        if any(self.quotes.values()) and self.quote_thread is None:
+            self.quote_thread = threading.Thread(target=self.stream_quotes, daemon=True)
+            self.quote_thread.start()
+
+    def send_candles(self, channel: int, sub: dict):
+        fields = self.fields.get(channel, {}).get('Candle')
+        if not fields:
+            return
+        symbol = sub['symbol']
+        spec = symbol[symbol.find('{=') + 2:-1] if '{=' in symbol else '1d'
+        num = int(''.join(c for c in spec if c.isdigit()) or 1)
+        bar_ms = num * _UNITS.get(''.join(c for c in spec if c.isalpha()), _UNITS['d'])
+
+        times = self.server.candle_times(bar_ms, int(sub.get('fromTime', 0)))
+        rnd = random.Random(symbol)
+        per_message = self.server.candles_per_message
+        for start in range(0, max(len(times), 1), per_message):
+            flat = []
+            for i, t in enumerate(times[start:start + per_message], start):
+                price = 100.0 + rnd.uniform(-5, 5)
+                flags = (4 if i == 0 else 0) | (8 if i == len(times) - 1 else 0)
+                values = {'eventType': 'Candle', 'eventSymbol': symbol, 'time': t, 'eventFlags': flags,
+                          'open': price, 'high': price + 0.5, 'low': price - 0.5, 'close': price + 0.1,
+                          'volume': float(rnd.randint(100, 10000))}
+                flat.extend(values.get(f) for f in fields)
+            if not times:
+                # Empty snapshot: a REMOVE_EVENT placeholder that also ends it
+                values = {'eventType': 'Candle', 'eventSymbol': symbol, 'time': 0, 'eventFlags': 4 | 8 | 2}
+                flat = [values.get(f) for f in fields]
+            self.send({'type': 'FEED_DATA', 'channel': channel, 'data': ['Candle', flat]})
+            self.server.stats['candles_sent'] += len(flat) // len(fields)
+
+    def stream_quotes(self):
+        server = self.server
+        interval = 1.0 / server.quote_rate if server.quote_rate else 0.0
+        sent, k = 0, 0
+        next_at = time.monotonic()
+        while not self.closed.is_set() and (server.quote_messages is None or sent < server.quote_messages):
+            for channel, symbols in list(self.quotes.items()):
+                fields = self.fields.get(channel, {}).get('Quote')
+                if not symbols or not fields:
+                    continue
+                flat = []
+                now = int(time.time() * 1000)
+                for _ in range(server.quotes_per_message):
+                    symbol = symbols[k % len(symbols)]
+                    k += 1
+                    bid = 100.0 + (k % 100) * 0.01
+                    values = {'eventType': 'Quote', 'eventSymbol': symbol, 'bidPrice': bid,
+                              'askPrice': bid + 0.02, 'bidSize': 100.0, 'askSize': 200.0,
+                              'bidTime': now, 'askTime': now, 'time': now}
+                    flat.extend(values.get(f) for f in fields)
+                try:
+                    self.send({'type': 'FEED_DATA', 'channel': channel, 'data': ['Quote', flat]})
+                except OSError:
+                    return
+                server.stats['quotes_sent'] += server.quotes_per_message
+                sent += 1
+            if not any(self.quotes.values()):
+                time.sleep(0.01)
+            if interval:
+                next_at += interval
+                delay = next_at - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+
+
+# -------------------   REST   -------------------
+
+class _RESTHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    # Headers and body are written separately; without TCP_NODELAY every keep-alive
+    # response waits for the client's delayed ACK
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, body: dict = None, headers: dict = None):
+        payload = json.dumps(body or {}).encode()
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        self.server.standin.stats['rest_calls'] += 1
+
+    def _route(self, method: str):
+        url = urlparse(self.path)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        wait = self.server.standin.throttle()
+        if wait is not None:
+            self._reply(429, {'error': {'code': 'rate_limit_exceeded'}}, {'Retry-After': f"{wait:.3f}"})
+            return
+        status, reply = self.server.standin.rest(method, url.path, parse_qs(url.query), body,
+                                                  self.headers.get('Authorization'))
+        self._reply(status, reply)
+
+    def do_GET(self):
+        self._route('GET')
+
+    def do_POST(self):
+        self._route('POST')
+
+    def do_DELETE(self):
+        self._route('DELETE')
+
+
+class StandInServer:
+    """
+    EN: Local REST + DXLink server with configurable message rates and payload sizes.
+    ES: Servidor local REST + DXLink con frecuencia de mensajes y tamaño de datos configurables.
+
+    Args:
+        host: Interface to bind
+        rest_port: Port of the REST server (0 = any free port)
+        dxlink_port: Port of the DXLink websocket server (0 = any free port)
+        quote_rate: Quote FEED_DATA messages per second per connection (None = as fast as possible)
+        quotes_per_message: Quotes in each Quote FEED_DATA message
+        quote_messages: Quote messages sent per connection (None = until it closes)
+        candles_per_symbol: Bars sent in each Candle snapshot (fewer if fromTime is more recent)
+        candles_per_message: Bars per Candle FEED_DATA message
+        positions: Open positions returned by /positions
+        transactions: Transactions in the account history
+        accounts: Number of accounts of the customer
+        latency: Seconds added to every REST response
+        rate_limit: (requests per second, burst) above which REST requests get 429 with a Retry-After
+    """
+
+    def __init__(self, host: str = '127.0.0.1', rest_port: int = 0, dxlink_port: int = 0,
+                 quote_rate: float = None, quotes_per_message: int = 50, quote_messages: int = None,
+                 candles_per_symbol: int = 1000, candles_per_message: int = 500, positions: int = 20,
+                 transactions: int = 500, accounts: int = 1, latency: float = 0.0, rate_limit: tuple = None):
+        self.host = host
+        self.quote_rate = quote_rate
+        self.quotes_per_message = quotes_per_message
+        self.quote_messages = quote_messages
+        self.candles_per_symbol = candles_per_symbol
+        self.candles_per_message = candles_per_message
+        self.latency = latency
+        self.stats = {'rest_calls': 0, 'messages_sent': 0, 'messages_received': 0,
+                      'quotes_sent': 0, 'candles_sent': 0, 'connections': 0, 'logins': 0, 'throttled': 0}
+        self.rate_limit = rate_limit
+        self._allowance = float(rate_limit[1]) if rate_limit else 0.0
+        self._allowance_at = time.monotonic()
+        self._throttle_lock = threading.Lock()
+        # Session tokens rejected with 401, as after a logout or a password change
+        self.revoked = set()
+
+        self.accounts = [f"5WT{i:05d}" for i in range(max(1, accounts))]
+        self.positions = self._make_positions(positions)
+        self.transactions = self._make_transactions(transactions)
+        self.orders = []
+
+        self._rest = ThreadingHTTPServer((host, rest_port), _RESTHandler)
+        self._rest.daemon_threads = True
+        self._rest.standin = self
+        self._ws = socket.socket()
+        self._ws.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._ws.bind((host, dxlink_port))
+        self._ws.listen(128)
+        self._connections = []
+        self._threads = []
+        self._running = False
+
+    @property
+    def rest_url(self) -> str:
+        return f"http://{self.host}:{self._rest.server_address[1]}"
+
+    @property
+    def dxlink_url(self) -> str:
+        return f"ws://{self.host}:{self._ws.getsockname()[1]}"
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def start(self):
+        self._running = True
+        self._threads = [threading.Thread(target=self._rest.serve_forever, daemon=True),
+                         threading.Thread(target=self._accept, daemon=True)]
+        for thread in self._threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self._running = False
+        self._rest.shutdown()
+        self._rest.server_close()
+        try:
+            self._ws.close()
+        except OSError:
+            pass
+        for connection in self._connections:
+            connection.closed.set()
+            try:
+                connection.conn.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def api(self, **kwargs):
+        """A TastyTradeAPI pointed at this server."""
+        from TastyTradeAPI.api import TastyTradeAPI
+        return TastyTradeAPI(api_url=self.rest_url, **kwargs)
+
+    def _accept(self):
+        while self._running:
+            try:
+                conn, _ = self._ws.accept()
+            except OSError:
+                return
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.stats['connections'] += 1
+            connection = _DXLinkConnection(self, conn)
+            self._connections = [c for c in self._connections if not c.closed.is_set()] + [connection]
+            threading.Thread(target=connection.run, daemon=True).start()
+
+    # -------------------   DATA   -------------------
+
+    def candle_times(self, bar_ms: int, from_time: int) -> list:
+        """Bar times inside regular trading hours, newest first, from `from_time` up to now."""
+        now = int(time.time() * 1000) // bar_ms * bar_ms
+        times = []
+        t = now
+        while len(times) < self.candles_per_symbol and t >= from_time:
+            minute = (t // 60_000) % 1440
+            if bar_ms >= _UNITS['d'] or _RTH_START <= minute < _RTH_END:
+                times.append(t)
+            t -= bar_ms
+        return times
+
+    def _make_positions(self, n: int) -> list:
+        return [{'symbol': f"SYM{i}", 'instrument-type': 'Equity', 'quantity': str(10 + i),
+                 'quantity-direction': 'Long' if i % 2 == 0 else 'Short', 'average-open-price': '100.0',
+                 'close-price': '101.5', 'created-at': '2024-01-02T15:00:00Z',
+                 'updated-at': '2024-01-03T15:00:00Z'} for i in range(n)]
+
+    def _make_transactions(self, n: int) -> list:
+        start = datetime.datetime(2023, 1, 3, 15, 0, tzinfo=datetime.timezone.utc)
+        types = [('Trade', 'Buy to Open'), ('Trade', 'Sell to Close'), ('Money Movement', 'Dividend')]
+        items = []
+        for i in range(n):
+            t_type, sub_type = types[i % len(types)]
+            executed = start + datetime.timedelta(hours=6 * i)
+            items.append({'id': 100000 + i, 'symbol': f"SYM{i % 25}", 'transaction-type': t_type,
+                          'transaction-sub-type': sub_type, 'description': f"{sub_type} SYM{i % 25}",
+                          'quantity': '1.0', 'price': f"{100 + i % 50}.0", 'value': f"{100 + i % 50}.0",
+                          'executed-at': executed.strftime('%Y-%m-%dT%H:%M:%S.000+00:00')})
+        # Newest first, as the API sorts by default
+        return items[::-1]
+
+    def _transactions_page(self, query: dict) -> dict:
+        def arg(name, default=None):
+            return query.get(name, [default])[0]
+
+        items = self.transactions
+        symbol = arg('symbol')
+        if symbol:
+            items = [t for t in items if t['symbol'] == symbol]
+        types = query.get('types[]') or query.get('type')
+        if types:
+            items = [t for t in items if t['transaction-type'] in types]
+        start, end = arg('start-date'), arg('end-date')
+        if start:
+            items = [t for t in items if t['executed-at'][:10] >= start[:10]]
+        if end:
+            items = [t for t in items if t['executed-at'][:10] <= end[:10]]
+        if arg('sort') == 'Asc':
+            items = items[::-1]
+
+        per_page = max(1, int(arg('per-page', 250)))
+        page = int(arg('page-offset', 0))
+        total_pages = (len(items) + per_page - 1) // per_page
+        return {'data': {'items': items[page * per_page:(page + 1) * per_page]},
+                'pagination': {'per-page': per_page, 'page-offset': page, 'item-offset': page * per_page,
+                               'total-items': len(items), 'total-pages': total_pages,
+                               'current-item-count': len(items[page * per_page:(page + 1) * per_page])}}
+
+    def revoke(self, session_token: str):
+        """Rejects every later request authorized with the token (401)."""
+        self.revoked.add(session_token)
+
+    def throttle(self):
+        """None if a REST request is within rate_limit, else the seconds until it would be."""
+        if not self.rate_limit:
+            return None
+        rate, burst = self.rate_limit
+        with self._throttle_lock:
+            now = time.monotonic()
+            self._allowance = min(float(burst), self._allowance + (now - self._allowance_at) * rate)
+            self._allowance_at = now
+            if self._allowance >= 1.0:
+                self._allowance -= 1.0
+                return None
+            self.stats['throttled'] += 1
+            return (1.0 - self._allowance) / rate
+
+    def rest(self, method: str, path: str, query: dict, body: bytes, auth: str):
+        """Returns (status, json body) for one REST request."""
+        if self.latency:
+            time.sleep(self.latency)
+        parts = [p for p in path.split('/') if p]
+
+        if method == 'POST' and parts == ['sessions']:
+            self.stats['logins'] += 1
+            expires = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=24)
+            return 201, {'data': {'session-token': f"standin-{self._rest.server_address[1]}-{self.stats['logins']}",
+                                  'remember-token': f"standin-remember-{self.stats['logins']}",
+                                  'session-expiration': expires.isoformat()}}
+        if not auth or auth in self.revoked:
+            return 401, {'error': {'code': 'unauthorized'}}
+
+        if parts == ['customers', 'me']:
+            return 200, {'data': {'first-name': 'Stand', 'last-name': 'In', 'email': 'standin@example.com',
+                                  'citizenship-country': 'USA',
+                                  'customer-suitability': {'liquid-net-worth': '100000'}}}
+        if parts == ['customers', 'me', 'accounts']:
+            return 200, {'data': {'items': [{'account': {'account-number': a}} for a in self.accounts]}}
+        if parts == ['api-quote-tokens']:
+            expires = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=24)
+            return 200, {'data': {'token': 'standin-quote-token', 'dxlink-url': self.dxlink_url,
+                                  'level': 'api', 'expires-at': expires.isoformat()}}
+
+        if len(parts) >= 3 and parts[0] == 'accounts':
+            if parts[1] not in self.accounts:
+                return 404, {'error': {'code': 'record_not_found'}}
+            rest = parts[2:]
+            if rest == ['balances']:
+                return 200, {'data': {'account-number': parts[1], 'cash-balance': '10000.0',
+                                      'equity-buying-power': '20000.0', 'derivative-buying-power': '10000.0',
+                                      'net-liquidating-value': '15000.0'}}
+            if rest == ['positions']:
+                return 200, {'data': {'items': self.positions}}
+            if rest == ['transactions']:
+                return 200, self._transactions_page(query)
+            if rest == ['transactions', 'total-fees']:
+                return 200, {'data': {'total-fees': '12.34', 'total-fees-effect': 'Debit'}}
+            if rest[0] == 'orders' and method == 'POST':
+                order = json.loads(body or b'{}')
+                if rest == ['orders']:
+                    self.orders.append(order)
+                received = datetime.datetime.now(datetime.timezone.utc).isoformat()
+                return 201, {'data': {
+                    'order': {'id': len(self.orders), 'status': 'Received' if rest == ['orders'] else 'Dry Run',
+                              'size': order.get('legs', [{}])[0].get('quantity', 0), 'received-at': received},
+                    'fee-calculation': {'total-fees': '1.0', 'commission': '0.5'},
+                    'buying-power-effect': {'new-buying-power': '19000.0'}}}
+
+        return 404, {'error': {'code': 'not_found', 'message': path}}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000, help='REST port (DXLink uses port + 1)')
+    parser.add_argument('--quote-rate', type=float, default=10.0, help='Quote messages per second')
+    parser.add_argument('--quotes-per-message', type=int, default=10)
+    args = parser.parse_args()
+
+    with StandInServer(args.host, args.port, args.port + 1, quote_rate=args.quote_rate,
+                       quotes_per_message=args.quotes_per_message) as srv:
+        print(f"REST   {srv.rest_url}\nDXLink {srv.dxlink_url}")
+        try:
+            while True:
+                time.sleep(1)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+import math
+
+from TastyTradeAPI.candles import SNAPSHOT_BEGIN, SNAPSHOT_END, CandleBuffer, CompletionTracker
+
+
+FIELDS = ['eventType', 'eventSymbol', 'time', 'eventFlags', 'close']
+
+
+def test_malformed_time_and_flags_keep_the_batch():
+    buffer = CandleBuffer(FIELDS)
+    tracker = CompletionTracker(['AAPL{=1m}'])
+    data = [
+        'Candle', 'AAPL{=1m}', 1_700_000_120_000, SNAPSHOT_BEGIN, 3.0,
+        'Candle', 'AAPL{=1m}', 'NaN', 'NaN', 2.0,
+        'Candle', 'AAPL{=1m}', None, None, 'NaN',
+        'Candle', 'AAPL{=1m}', 1_700_000_000_000, SNAPSHOT_END, 1.0,
+    ]
+
+    assert buffer.add(data, tracker) == 4
+    assert list(buffer.times) == [1_700_000_120_000, 0, 0, 1_700_000_000_000]
+    assert list(buffer.flags) == [SNAPSHOT_BEGIN, 0, 0, SNAPSHOT_END]
+
+    # The SNAPSHOT_END of the batch still completes the symbol
+    status = tracker.report()['AAPL{=1m}']
+    assert status['complete'] and status['reason'] == 'snapshot'
+
+    df = buffer.to_frame()
+    assert len(df) == 4
+    assert math.isnan(df['Close'].iloc[2])
@@ -0,0 +1,21 @@
+import asyncio
+
+from TastyTradeAPI.quote_tokens import QuoteTokenManager
+
+
+def test_concurrent_aget_fetches_once():
+    tokens = QuoteTokenManager()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return {'dxlink-url': 'wss://example', 'token': f"quote-{len(calls)}"}
+
+    async def main():
+        return await asyncio.gather(*(tokens.aget('session', fetch) for _ in range(5)))
+
+    entries = asyncio.run(main())
+    assert len(calls) == 1
+    assert {e['token'] for e in entries} == {'quote-1'}
+    tokens.invalidate()
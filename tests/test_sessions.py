@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+
+from benchmarks.standin import StandInServer
+from TastyTradeAPI.aio import AsyncTastyTradeAPI
+
+
+def test_revoked_cached_session_logs_in_again(tmp_path):
+    cache = tmp_path / 'sessions.json'
+    with StandInServer() as srv:
+        first = srv.api(session_cache=str(cache))
+        first.Client('u', 'p')
+        first.close()
+
+        tt = srv.api(session_cache=str(cache))
+        client = tt.Client('u', 'p')
+        old = client['session_token']
+        logins = srv.stats['logins']
+        srv.revoke(old)
+
+        assert tt.all_positions(client) is not None
+        assert srv.stats['logins'] == logins + 1
+        assert client['session_token'] != old
+        assert tt._sessions.get('u')['session_token'] == client['session_token']
+
+        # Only the cached token is retried: the new session, once revoked, fails
+        srv.revoke(client['session_token'])
+        with pytest.raises(Exception):
+            tt.all_positions(client)
+        assert srv.stats['logins'] == logins + 1
+        tt.close()
+
+
+def test_revoked_cached_session_logs_in_again_async(tmp_path):
+    cache = tmp_path / 'sessions.json'
+    with StandInServer() as srv:
+        async def main():
+            async with AsyncTastyTradeAPI(api_url=srv.rest_url, session_cache=str(cache)) as first:
+                await first.Client('u', 'p')
+
+            async with AsyncTastyTradeAPI(api_url=srv.rest_url, session_cache=str(cache)) as tt:
+                client = await tt.Client('u', 'p')
+                old = client['session_token']
+                logins = srv.stats['logins']
+                srv.revoke(old)
+
+                # Concurrent requests rejected together share a single new login
+                await asyncio.gather(tt.all_positions(client), tt.all_positions(client))
+                assert srv.stats['logins'] == logins + 1
+                assert client['session_token'] != old
+
+        asyncio.run(main())